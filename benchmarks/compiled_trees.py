@@ -0,0 +1,74 @@
+"""
+Compare the prediction latency of the compiled NumPy tree traversal with scikit-learn's
+RandomForestClassifier.
+
+Reports the single-row, micro-batch and batch prediction latency of each (the exact
+equality of their outputs is checked by tests/test_compiled_trees.py). The compiled path wins
+while scikit-learn's per-call overhead dominates; `MAX_COMPILED_ROWS` is the size up to
+which StrokePredictionModel uses it.
+
+Usage:
+    python -m benchmarks.compiled_trees [--rows 20000] [--trees 100] [--repeat 200]
+"""
+import argparse
+import time
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+from src.compiled_trees import CompiledForest
+
+
+def make_data(rows, features=11, seed=0):
+    """
+    Build a synthetic, standardized feature matrix with a noisy binary target.
+    """
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame(rng.normal(size=(rows, features)), columns=[f"feature_{i}" for i in range(features)])
+    y = (X.iloc[:, :3].sum(axis=1) + rng.normal(scale=2.0, size=rows) > 0).astype(int)
+    return X, y
+
+
+def timed(fn, repeat):
+    """
+    Return the median wall time of `repeat` calls in milliseconds.
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return float(np.median(times)) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20000, help="Training rows.")
+    parser.add_argument("--trees", type=int, default=100, help="Number of trees.")
+    parser.add_argument("--small-batch", type=int, default=64, help="Rows per micro-batch prediction.")
+    parser.add_argument("--batch", type=int, default=10000, help="Rows per batch prediction.")
+    parser.add_argument("--repeat", type=int, default=200, help="Repetitions of the single-row measurement.")
+    args = parser.parse_args()
+
+    X, y = make_data(args.rows)
+    forest = RandomForestClassifier(n_estimators=args.trees, random_state=42).fit(X, y)
+    compiled = CompiledForest.from_estimator(forest)
+    X_batch, _ = make_data(args.batch, seed=1)
+    print(f"{args.trees} trees, max depth {compiled.max_depth}.")
+
+    row = X_batch.iloc[[0]]
+    small_batch = X_batch.iloc[:args.small_batch]
+    results = {
+        "single row": (timed(lambda: forest.predict_proba(row), args.repeat),
+                       timed(lambda: compiled.predict_proba(row), args.repeat)),
+        f"batch of {args.small_batch}": (timed(lambda: forest.predict_proba(small_batch), args.repeat),
+                                         timed(lambda: compiled.predict_proba(small_batch), args.repeat)),
+        f"batch of {args.batch}": (timed(lambda: forest.predict_proba(X_batch), 5),
+                                   timed(lambda: compiled.predict_proba(X_batch), 5)),
+    }
+    print(f"{'':>18} {'sklearn (ms)':>14} {'compiled (ms)':>14} {'speedup':>8}")
+    for name, (reference, fast) in results.items():
+        print(f"{name:>18} {reference:>14.3f} {fast:>14.3f} {reference / fast:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
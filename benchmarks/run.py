@@ -0,0 +1,310 @@
+"""
+Benchmark the ingest, preprocessing, training, inference and graph stages on synthetic data.
+
+Each stage is timed over several repetitions and reported with its best, p50 and p99
+latency, throughput and peak resident memory. Results are written as JSON and can be
+compared against a stored baseline; the exit status is 1 when a stage regressed by more
+than both the threshold and the run-to-run spread of its timings.
+
+Usage:
+    python -m benchmarks.run --sizes 10k,100k --output results.json
+    python -m benchmarks.run --sizes 10k --baseline baseline.json --threshold 0.2
+    python -m benchmarks.run --sizes 1m,10m --models HistGradientBoosting,SGD --skip graphs
+"""
+import argparse
+import functools
+import json
+import logging
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+import numpy as np
+import sklearn
+from benchmarks.synthetic import write_csv
+from src.config import SELECTED_COLUMNS
+from src.data_analysis import GraphGenerator
+from src.data_processing import DataProcessor, PreprocessingPipeline
+from src.model_training import MODEL_TYPES, StrokePredictionModel
+from src.utils import load_csv
+
+# Largest number of training rows per model type; slower models are trained on a sample
+MODEL_ROW_LIMITS = {"SVM": 20000, "GradientBoosting": 200000, "RandomForest": 1000000}
+
+# Stages that can be skipped with --skip
+STAGES = ["ingest", "preprocess_legacy", "preprocess", "train", "predict_single", "predict_batch", "graphs"]
+
+# Metrics compared against the baseline, with the metric measuring their run-to-run spread.
+# The best time of the repetitions is the least sensitive to noise from other processes.
+COMPARED_METRICS = {"min_ms": "spread_ms", "peak_rss_mb": None}
+
+
+class PeakMemory:
+    """
+    Track the peak resident set size of this process while a block runs.
+
+    On Linux the RSS is sampled from /proc every few milliseconds, which gives a per-stage
+    peak. Elsewhere the process-wide peak from `getrusage` is reported.
+    """
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    @staticmethod
+    def current():
+        """
+        Returns:
+            int: Current resident set size in bytes, or None if it cannot be read.
+        """
+        try:
+            with open("/proc/self/statm") as f:
+                return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        except (OSError, ValueError, IndexError):
+            return None
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, self.current() or 0)
+
+    def __enter__(self):
+        self.peak = self.current() or 0
+        if self.current() is not None:
+            self._thread = threading.Thread(target=self._sample, daemon=True)
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self.peak = max(self.peak, self.current() or 0)
+        else:
+            scale = 1 if sys.platform == "darwin" else 1024  # ru_maxrss is in bytes on macOS, KiB elsewhere
+            self.peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+
+def measure(stage, fn, rows, repeat, model_type=None, min_time=0.0):
+    """
+    Time `fn` over at least `repeat` calls and summarize the latencies.
+
+    Short stages are called again until `min_time` seconds were spent (up to 100 times
+    `repeat`), so their best time and spread rest on enough samples to be stable.
+
+    Args:
+        stage (str): Stage name.
+        fn (callable): Function running the stage once.
+        rows (int): Rows processed by one call, used for the throughput.
+        repeat (int): Minimum number of timed calls.
+        model_type (str): Model type of the stage, if any.
+        min_time (float): Minimum total seconds of timed calls.
+
+    Returns:
+        dict: Result record of the stage.
+    """
+    times = []
+    with PeakMemory() as memory:
+        while len(times) < repeat or (sum(times) < min_time and len(times) < repeat * 100):
+            start = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - start)
+    repeat = len(times)
+    times = np.array(times) * 1000
+    p50 = float(np.percentile(times, 50))
+    result = {
+        "stage": stage,
+        "model_type": model_type,
+        "rows": rows,
+        "repeat": repeat,
+        "min_ms": round(float(times.min()), 3),
+        "p50_ms": round(p50, 3),
+        # Interquartile range of the repetitions, the noise level used by `compare`
+        "spread_ms": round(float(np.percentile(times, 75) - np.percentile(times, 25)), 3),
+        "p99_ms": round(float(np.percentile(times, 99)), 3),
+        "mean_ms": round(float(times.mean()), 3),
+        "throughput_rows_per_s": round(rows / (p50 / 1000), 1) if p50 > 0 else None,
+        "peak_rss_mb": round(memory.peak / 1024 ** 2, 1),
+    }
+    print(f"{stage:>18} {model_type or '':>20} {rows:>10} {result['min_ms']:>12.2f} {result['p50_ms']:>12.2f} "
+          f"{result['p99_ms']:>12.2f} "
+          f"{result['throughput_rows_per_s'] or 0:>14.0f} {result['peak_rss_mb']:>10.1f}", flush=True)
+    return result
+
+
+def parse_size(text):
+    """
+    Parse a row count such as '10k' or '1m'.
+    """
+    text = text.strip().lower()
+    multiplier = {"k": 1000, "m": 1000000}.get(text[-1], 1)
+    return int(float(text.rstrip("km")) * multiplier)
+
+
+def benchmark_size(rows, args, static_folder):
+    """
+    Run every selected stage on a synthetic dataset of `rows` rows.
+
+    Returns:
+        list: Result records.
+    """
+    path = os.path.join(args.data_dir, f"synthetic_{rows}.csv")
+    if not os.path.exists(path):
+        print(f"Generating {path}...", flush=True)
+        write_csv(rows, path)
+
+    measure_stage = functools.partial(measure, min_time=args.min_time)
+    results = []
+    if "ingest" not in args.skip:
+        results.append(measure_stage("ingest", lambda: load_csv(path), rows, args.repeat))
+    raw = load_csv(path)
+    data = raw[SELECTED_COLUMNS + ["Diagnosis"]]
+
+    if "preprocess_legacy" not in args.skip:
+        results.append(measure_stage("preprocess_legacy", lambda: DataProcessor(data).process("Diagnosis"), rows,
+                                     args.repeat))
+    if "preprocess" not in args.skip:
+        results.append(measure_stage("preprocess", lambda: PreprocessingPipeline("Diagnosis").fit_transform(data),
+                                     rows, args.repeat))
+
+    for model_type in args.models:
+        limit = min(MODEL_ROW_LIMITS.get(model_type, rows), args.max_train_rows, rows)
+        sample = data.sample(n=limit, random_state=0) if limit < rows else data
+        preprocessor = PreprocessingPipeline(
+            "Diagnosis", scale_categorical=model_type != "HistGradientBoosting"
+        ).fit(sample)
+        model = StrokePredictionModel(preprocessor.transform(sample), preprocessor=preprocessor)
+        if "train" not in args.skip:
+            results.append(measure_stage("train", lambda: model.train_model(model_type), limit, args.train_repeat,
+                                         model_type))
+        else:
+            model.train_model(model_type)
+
+        if "predict_single" not in args.skip:
+            row = raw[SELECTED_COLUMNS].iloc[[0]]
+            results.append(measure_stage("predict_single", lambda: model.predict_proba(model.preprocess(row)), 1,
+                                         args.latency_repeat, model_type))
+        if "predict_batch" not in args.skip:
+            batch = raw[SELECTED_COLUMNS].iloc[:min(args.batch_rows, rows)]
+            results.append(measure_stage("predict_batch", lambda: model.predict_proba(model.preprocess(batch)),
+                                         len(batch), args.repeat, model_type))
+
+    if "graphs" not in args.skip:
+        generator = GraphGenerator(raw, static_folder, max_workers=args.graph_workers)
+        results.append(measure_stage("graphs", generator.generate_all_graphs, rows, args.repeat))
+    return results
+
+
+def result_key(result):
+    return f"{result['stage']}|{result['model_type'] or ''}|{result['rows']}"
+
+
+def compare(results, baseline, threshold):
+    """
+    Compare results with a baseline and print the regressions.
+
+    A metric regressed when it grew by more than `threshold` and, for timings, the increase
+    also exceeds the larger spread of the two runs, so noisy short stages do not fail the
+    gate. Baselines without a best time are compared on their p50.
+
+    Args:
+        results (list): Current result records.
+        baseline (list): Baseline result records.
+        threshold (float): Allowed relative increase (0.2 = 20%).
+
+    Returns:
+        list: Descriptions of the regressions.
+    """
+    baseline = {result_key(result): result for result in baseline}
+    regressions = []
+    for result in results:
+        reference = baseline.get(result_key(result))
+        if reference is None:
+            continue
+        for metric, spread in COMPARED_METRICS.items():
+            if metric not in reference:
+                metric = "p50_ms" if metric == "min_ms" else metric
+            before, after = reference.get(metric), result.get(metric)
+            noise = max(reference.get(spread) or 0, result.get(spread) or 0) if spread else 0
+            if before and after and after > before * (1 + threshold) and after - before > noise:
+                regressions.append(
+                    f"{result_key(result)} {metric}: {before} -> {after} (+{(after / before - 1) * 100:.0f}%)"
+                )
+    return regressions
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="10k,100k", help="Comma-separated row counts, e.g. 10k,100k,1m,10m.")
+    parser.add_argument("--models", default="RandomForest,HistGradientBoosting,LogisticRegression,SGD",
+                        help=f"Comma-separated model types, from: {', '.join(MODEL_TYPES)}.")
+    parser.add_argument("--skip", default="", help=f"Comma-separated stages to skip, from: {', '.join(STAGES)}.")
+    parser.add_argument("--repeat", type=int, default=9, help="Timed calls of the ingest, preprocessing, batch "
+                                                              "prediction and graph stages.")
+    parser.add_argument("--train-repeat", type=int, default=1, help="Timed calls of each training stage.")
+    parser.add_argument("--min-time", type=float, default=1.0, help="Seconds each stage is timed for at least, "
+                                                                    "repeating short stages beyond --repeat.")
+    parser.add_argument("--latency-repeat", type=int, default=200, help="Timed single-row predictions.")
+    parser.add_argument("--batch-rows", type=int, default=10000, help="Rows per batch prediction.")
+    parser.add_argument("--max-train-rows", type=int, default=1000000, help="Training sample size cap.")
+    parser.add_argument("--graph-workers", type=int, default=1, help="Processes rendering graphs.")
+    parser.add_argument("--data-dir", default="benchmarks/data", help="Folder of the generated datasets.")
+    parser.add_argument("--output", default="benchmark_results.json", help="Path of the JSON results.")
+    parser.add_argument("--baseline", help="JSON results to compare against.")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed relative slowdown (0.2 = 20%%).")
+    args = parser.parse_args()
+    args.models = [model for model in args.models.split(",") if model]
+    args.skip = {stage for stage in args.skip.split(",") if stage}
+    unknown = [model for model in args.models if model not in MODEL_TYPES] + sorted(args.skip - set(STAGES))
+    if unknown:
+        parser.error(f"Unknown model types or stages: {unknown}")
+
+    logging.getLogger().setLevel(logging.WARNING)  # Keep the application logs out of the report
+    print(f"{'stage':>18} {'model':>20} {'rows':>10} {'best (ms)':>12} {'p50 (ms)':>12} {'p99 (ms)':>12} "
+          f"{'rows/s':>14} {'RSS (MB)':>10}")
+    results = []
+    with tempfile.TemporaryDirectory() as static_folder:
+        for size in args.sizes.split(","):
+            results.extend(benchmark_size(parse_size(size), args, static_folder))
+
+    report = {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "sklearn": sklearn.__version__,
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f)["results"], args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s) above {args.threshold:.0%} and the measured spread:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print(f"No regression above {args.threshold:.0%}.")
+
+
+if __name__ == "__main__":
+    main()
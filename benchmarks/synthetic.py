@@ -0,0 +1,120 @@
+"""
+Generate synthetic stroke datasets with the same columns, vocabularies and value ranges
+as the CSV files in app/uploads, at any number of rows.
+
+Usage:
+    python -m benchmarks.synthetic 1000000 data/synthetic_1m.csv
+"""
+import argparse
+import os
+import numpy as np
+import pandas as pd
+
+# Category vocabularies of the sample datasets
+VOCABULARIES = {
+    "Gender": ["Male", "Female"],
+    "Marital Status": ["Divorced", "Married", "Single"],
+    "Work Type": ["Government Job", "Never Worked", "Private", "Self-employed"],
+    "Residence Type": ["Rural", "Urban"],
+    "Smoking Status": ["Non-smoker", "Formerly Smoked", "Currently Smokes"],
+    "Alcohol Intake": ["Never", "Rarely", "Social Drinker", "Frequent Drinker"],
+    "Physical Activity": ["Low", "Moderate", "High"],
+    "Family History of Stroke": ["Yes", "No"],
+    "Dietary Habits": ["Non-Vegetarian", "Pescatarian", "Paleo", "Vegan", "Keto", "Vegetarian", "Gluten-Free"],
+}
+SYMPTOMS = [
+    "Blurred Vision", "Confusion", "Difficulty Speaking", "Dizziness", "Headache", "Loss of Balance",
+    "Numbness", "Seizures", "Severe Fatigue", "Weakness",
+]
+FIRST_NAMES = ["Aaina", "Kaira", "Ivana", "Rohan", "Advik", "Zara", "Vihaan", "Anika", "Kabir", "Mira"]
+LAST_NAMES = ["Arora", "Subramaniam", "Baral", "Acharya", "Sharma", "Iyer", "Kapoor", "Das", "Menon", "Rao"]
+
+# Order of the columns in the sample datasets
+COLUMNS = [
+    "Patient ID", "Patient Name", "Age", "Gender", "Hypertension", "Heart Disease", "Marital Status",
+    "Work Type", "Residence Type", "Average Glucose Level", "Body Mass Index (BMI)", "Smoking Status",
+    "Alcohol Intake", "Physical Activity", "Stroke History", "Family History of Stroke", "Dietary Habits",
+    "Stress Levels", "Blood Pressure Levels", "Cholesterol Levels", "Symptoms", "Diagnosis",
+]
+
+
+def generate_frame(rows, seed=0, start_id=1):
+    """
+    Generate a synthetic dataset in memory.
+
+    The diagnosis depends weakly on age, glucose, hypertension and heart disease, so the
+    models have some signal to learn.
+
+    Args:
+        rows (int): Number of rows.
+        seed (int): Random seed.
+        start_id (int): First patient id.
+
+    Returns:
+        pd.DataFrame: A frame with the columns of the sample datasets.
+    """
+    rng = np.random.default_rng(seed)
+    age = rng.integers(18, 91, rows)
+    glucose = rng.uniform(60, 200, rows).round(2)
+    hypertension = rng.integers(0, 2, rows)
+    heart_disease = rng.integers(0, 2, rows)
+    risk = (age - 54) / 36 + (glucose - 130) / 70 + 0.5 * hypertension + 0.5 * heart_disease
+    stroke = rng.random(rows) < 1 / (1 + np.exp(-risk))
+
+    data = {
+        "Patient ID": np.arange(start_id, start_id + rows),
+        "Patient Name": (pd.Series(rng.choice(FIRST_NAMES, rows)) + " " + rng.choice(LAST_NAMES, rows)).to_numpy(),
+        "Age": age,
+        "Hypertension": hypertension,
+        "Heart Disease": heart_disease,
+        "Average Glucose Level": glucose,
+        "Body Mass Index (BMI)": rng.uniform(15, 40, rows).round(2),
+        "Stroke History": rng.integers(0, 2, rows),
+        "Stress Levels": rng.uniform(0, 10, rows).round(2),
+        "Blood Pressure Levels": [f"{s}/{d}" for s, d in zip(rng.integers(90, 180, rows), rng.integers(60, 120, rows))],
+        "Cholesterol Levels": [f"HDL: {h}, LDL: {l}" for h, l in zip(rng.integers(30, 80, rows), rng.integers(70, 200, rows))],
+        "Diagnosis": np.where(stroke, "Stroke", "No Stroke"),
+    }
+    for col, vocabulary in VOCABULARIES.items():
+        data[col] = rng.choice(vocabulary, rows)
+
+    # A few symptom combinations, with about 17% of the rows left empty as in the samples
+    combinations = [", ".join(rng.choice(SYMPTOMS, rng.integers(1, 6), replace=False)) for _ in range(500)]
+    symptoms = pd.Series(rng.choice(combinations, rows))
+    data["Symptoms"] = symptoms.where(rng.random(rows) >= 0.17).to_numpy()
+    return pd.DataFrame(data)[COLUMNS]
+
+
+def write_csv(rows, path, seed=0, chunk_size=500000):
+    """
+    Write a synthetic dataset to a CSV file chunk by chunk, so any size fits in memory.
+
+    Args:
+        rows (int): Number of rows.
+        path (str): Output CSV path.
+        seed (int): Random seed.
+        chunk_size (int): Rows generated per chunk.
+
+    Returns:
+        str: The output path.
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    for index, start in enumerate(range(0, rows, chunk_size)):
+        chunk = generate_frame(min(chunk_size, rows - start), seed=seed + index, start_id=start + 1)
+        chunk.to_csv(tmp_path, mode="w" if index == 0 else "a", header=index == 0, index=False)
+    os.replace(tmp_path, path)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("rows", type=int, help="Number of rows.")
+    parser.add_argument("path", help="Output CSV path.")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed.")
+    args = parser.parse_args()
+    write_csv(args.rows, args.path, seed=args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+# Gunicorn configuration for serving wsgi:app.
+# Every setting can be overridden through the environment variables read below.
+import multiprocessing
+import os
+
+# Address the server listens on
+bind = os.environ.get("BIND", "0.0.0.0:8000")
+
+# One preforked worker process per core, each with a few threads so concurrent single-row
+# requests reach the worker's micro-batcher together
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+worker_class = "gthread"
+threads = int(os.environ.get("GUNICORN_THREADS", 4))
+
+# Create the app (and load the model) once in the master before forking, so the workers share
+# the memory-mapped model arrays instead of each loading their own copy
+preload_app = True
+
+# Batch predictions stream large responses; keep slow clients from being cut off
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 120))
+graceful_timeout = 30
+
+# Recycle workers periodically to bound memory growth
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", 10000))
+max_requests_jitter = max_requests // 10
+
+accesslog = "-"
+
+
+def post_fork(server, worker):
+    # Processes spawned by the master are not usable by its workers, so each worker starts its
+    # own graph rendering pool before serving the first upload
+    from src.data_analysis import warm_pool
+    warm_pool(server.app.wsgi().config['GRAPH_WORKERS'])
@@ -1,92 +1,754 @@
+import ast
+import copy
+import io
+import itertools
+import json
 import logging
 import os
-import pandas as pd
-from flask import Flask, render_template, request, redirect, jsonify
-from src.data_analysis import GraphGenerator
-from src.utils import setup_directories, load_csv, setup_logging
-from src.data_processing import DataProcessor
-from src.model_training import StrokePredictionModel
+import random
+import shutil
+import time
+from pandas.errors import ParserError
+from flask import (
+    Blueprint, Flask, Request, Response, current_app, g, render_template, request, redirect, jsonify, send_file,
+    stream_with_context
+)
+from src.data_analysis import GraphGenerator, SummaryCube, warm_pool
+from src.evaluation import CHARTS
+from src.utils import setup_directories, load_csv, load_csv_chunks, concat_frames, setup_logging, write_parquet, \
+    PYARROW_AVAILABLE
+from src.data_processing import PreprocessingPipeline
+from src.model_training import StrokePredictionModel, MODEL_TYPES, NATIVE_CATEGORICAL_MODEL_TYPES
+from src.model_comparison import compare_models
+from src.model_registry import ModelRegistry
+from src.batch_prediction import iter_csv_chunks, iter_json_chunks, score_chunks, score_records, stream_csv, stream_json
+from src.micro_batching import MicroBatcher
+from src.prediction_cache import PredictionCache
+from src.training_jobs import TrainingJobManager
+from src.dataset_cache import DatasetCache, code_version
+from src.dataset_store import DatasetStore
+from src.profiling import PROFILER_BUSY, ProfileStore, start_profiler, stop_profiler
+from src.upload_stream import StreamingUpload, UploadRejected
 from src.config import SELECTED_COLUMNS
+from src import metrics
 
 # Logging configuration
 setup_logging()
 logger = logging.getLogger(__name__)
 
-# Flask application configuration
-app = Flask(__name__, static_folder='app/static', template_folder='app/templates')
-app.config['UPLOAD_FOLDER'] = 'app/uploads'  # Directory for uploaded files
-app.config['STATIC_FOLDER'] = 'app/static'  # Directory for static content (e.g., graphs)
-app.config['MODEL_PATH'] = 'models/model.joblib'  # Path for saving the trained model
+# Default application configuration. Every key can be overridden through `create_app(config)`
+# or FLASK_-prefixed environment variables (e.g. FLASK_MODEL_PATH).
+DEFAULT_CONFIG = {
+    'UPLOAD_FOLDER': 'app/uploads',  # Directory for uploaded files
+    'STATIC_FOLDER': 'app/static',  # Directory for static content (e.g., graphs)
+    'MODEL_PATH': 'models/model.joblib',  # Path for saving the trained model
+    'MODEL_COMPRESS': 0,  # joblib compression level of the artifact (0 keeps it memory-mappable)
+    'MODEL_PRELOAD': True,  # Load the model when the app is created (shared by forked workers)
+    'UPLOAD_PARQUET': True,  # Keep a Parquet copy of each upload for faster re-reads (needs pyarrow)
+    'UPLOAD_CHUNK_SIZE': 50000,  # Rows parsed per chunk while a CSV upload is received
+    'CACHE_FOLDER': 'app/cache',  # Content-addressed store of uploads and derived results, shared by workers
+    'CACHE_MEMORY_BYTES': 512 * 1024 ** 2,  # In-memory budget of the upload cache (per process)
+    'CACHE_DISK_BYTES': 2 * 1024 ** 3,  # On-disk budget of the upload cache
+    'JOBS_FOLDER': 'app/jobs',  # Training job states, shared by workers
+    'GRAPH_PROFILE': 'web',  # Graph output profile: 'web' (fast) or 'report' (high resolution)
+    'GRAPH_WORKERS': min(6, os.cpu_count() or 1),  # Processes rendering EDA graphs concurrently
+    'GRAPH_POOL_WARMUP': True,  # Start the graph processes when the app is created, not on the first upload
+    'GRAPH_MIN_AGE': 300.0,  # Seconds before an unreferenced graph may be cleaned up
+    'MODEL_CHECK_INTERVAL': 1.0,  # Seconds between checks of the model file for a newer version
+    'TRAINING_N_JOBS': -1,  # Worker processes for hyperparameter search (-1 = all cores)
+    'TRAINING_CHUNK_SIZE': 100000,  # Rows per chunk when training in streaming mode
+    'TRAINING_WORK_FOLDER': None,  # Folder for memory-mapped training arrays (None = system temp)
+    'MAX_CONCURRENT_TRAINING_JOBS': 1,  # Training jobs running at the same time in each worker
+    'WARM_START_ESTIMATORS': 20,  # Trees (or boosting iterations) added when continuing training on new rows
+    'COMPARISON_FOLDS': 5,  # Cross-validation folds shared by the model types compared at /compare
+    'COMPARISON_WORKERS': os.cpu_count() or 1,  # Processes fitting the folds of a comparison concurrently
+    'BATCH_CHUNK_SIZE': 10000,  # Rows scored per vectorized batch in /predict/batch
+    'MICRO_BATCH_ENABLED': True,  # Merge concurrent /api/v1/predict requests into one model call
+    'MICRO_BATCH_WINDOW_MS': 2.0,  # Time to wait for more requests before scoring a batch
+    'MICRO_BATCH_MAX_SIZE': 256,  # Maximum rows merged into one model call
+    'PREDICTION_TIMEOUT': 10.0,  # Seconds a request waits for its micro-batched result
+    'PREDICTION_CACHE_SIZE': 10000,  # Prediction results cached per worker by encoded features (0 = disabled)
+    'PREDICTION_CACHE_TTL': 300.0,  # Seconds a cached prediction result stays valid (None = until evicted, 0 = disabled)
+    'METRICS_FOLDER': 'app/metrics',  # Per-worker metric snapshots merged by /metrics (None = this process only)
+    'METRICS_WRITE_INTERVAL': 1.0,  # Minimum seconds between two snapshot writes of a worker
+    'LOG_FORMAT': 'text',  # Log output: 'text' or 'json' (one JSON object per line)
+    'LOG_STAGE_TIMINGS': False,  # Log the duration of every timed pipeline stage
+    'PROFILE_ENABLED': False,  # Allow cProfile profiling of requests (by header or sampling)
+    'PROFILE_HEADER': 'X-Profile',  # Requests sending this header are profiled
+    'PROFILE_SAMPLE_RATE': 0.0,  # Fraction of all requests profiled at random
+    'PROFILE_FOLDER': 'app/profiles',  # Stored profiles, listed at /admin/profiles
+    'PROFILE_MAX_BYTES': 200 * 1024 ** 2,  # Oldest profiles are deleted beyond this total size
+    'ADMIN_TOKEN': None,  # Bearer token required by the /admin endpoints (None = no token)
+}
 
-# Global variable to store uploaded and processed data
-uploaded_data = None
+REQUESTS = metrics.REGISTRY.counter(
+    "stroke_http_requests_total", "HTTP requests handled, by route, method and status.", ["endpoint", "method", "status"]
+)
+REQUEST_DURATION = metrics.REGISTRY.histogram(
+    "stroke_http_request_duration_seconds", "Time to produce the HTTP response, by route.", ["endpoint"]
+)
+
+# Routes of the application, registered by `create_app`
+bp = Blueprint('main', __name__)
+
+
+class UploadRequest(Request):
+    """
+    Request that parses CSV files posted to /upload while they are received.
+
+    Werkzeug writes each uploaded file to the stream returned by `_get_file_stream`; for
+    /upload that is a `StreamingUpload`, which validates the header, hashes the bytes and
+    parses the rows in a background thread during the transfer instead of afterwards.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.streaming_uploads = []
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        if self.endpoint == 'main.upload_file' and (filename or '').endswith('.csv'):
+            upload = StreamingUpload(
+                current_app.config['UPLOAD_FOLDER'], chunk_size=current_app.config['UPLOAD_CHUNK_SIZE']
+            )
+            self.streaming_uploads.append(upload)
+            return upload
+        return super()._get_file_stream(total_content_length, content_type, filename, content_length)
+
+    def close(self):
+        # Uploads cut short (e.g. the client disconnected) never reach request.files to be closed there
+        for upload in self.streaming_uploads:
+            upload.close()
+        super().close()
+
+
+class AppServices:
+    """
+    Services shared by the requests of one application.
+
+    Nothing here holds request data: uploads, preprocessing results and job states live in
+    folders shared by every worker process, and the model is reloaded from its artifact.
+
+    Attributes:
+        model_registry (ModelRegistry): Keeps the served model in memory.
+        dataset_cache (DatasetCache): On-disk store of uploaded datasets, keyed by dataset id.
+        dataset_store (DatasetStore): Uploaded CSV files with their row counts and append lineage.
+        training_jobs (TrainingJobManager): Runs training jobs and shares their state.
+        micro_batcher (MicroBatcher): Merges concurrent single-row API requests.
+        prediction_cache (PredictionCache): Recent prediction results of the current model.
+        profile_store (ProfileStore): Size-capped folder of request profiles.
+    """
+    def __init__(self, config):
+        """
+        Create the services from the application configuration.
+
+        Args:
+            config (dict): The application configuration.
+        """
+        self.model_registry = ModelRegistry(config['MODEL_PATH'], check_interval=config['MODEL_CHECK_INTERVAL'])
+        self.dataset_cache = DatasetCache(
+            config['CACHE_FOLDER'],
+            memory_budget=config['CACHE_MEMORY_BYTES'],
+            disk_budget=config['CACHE_DISK_BYTES'],
+            version=code_version(SELECTED_COLUMNS, config['GRAPH_PROFILE']),
+        )
+        self.dataset_store = DatasetStore(config['UPLOAD_FOLDER'])
+        self.training_jobs = TrainingJobManager(
+            max_workers=config['MAX_CONCURRENT_TRAINING_JOBS'], state_folder=config['JOBS_FOLDER']
+        )
+        self.prediction_cache = PredictionCache(
+            max_entries=config['PREDICTION_CACHE_SIZE'], ttl=config['PREDICTION_CACHE_TTL']
+        )
+        # Single records reach the batcher after a cache miss in `cached_prediction`
+        self.micro_batcher = MicroBatcher(
+            lambda records: self.predict_records(records, lookup=False),
+            window_ms=config['MICRO_BATCH_WINDOW_MS'],
+            max_batch_size=config['MICRO_BATCH_MAX_SIZE'],
+        )
+        self.profile_store = ProfileStore(config['PROFILE_FOLDER'], max_bytes=config['PROFILE_MAX_BYTES'])
+
+    def predict_records(self, records, lookup=True):
+        """
+        Score raw records in one call with the current model, tagging results with its version.
+
+        Results are cached by the encoded feature vector of each record. With `lookup`, cached
+        results of the current model version are reused and only the other records are scored.
+        """
+        loaded = self.model_registry.get()
+        cache, preprocessor = self.prediction_cache, loaded.model.preprocessor
+        if not cache.enabled or preprocessor is None:
+            return self._score(loaded, records)
+        keys = [preprocessor.encode_record(record) for record in records]
+        results = cache.get_many(loaded.version, keys) if lookup else [None] * len(records)
+        missing = [i for i, result in enumerate(results) if result is None]
+        if missing:
+            for i, result in zip(missing, self._score(loaded, [records[i] for i in missing])):
+                results[i] = result
+            cache.put_many(loaded.version, [(keys[i], results[i]) for i in missing])
+        return [dict(result) for result in results]  # Callers never modify the cached dicts
+
+    def cached_prediction(self, record):
+        """
+        Return the cached result of a record for the current model, or None on a miss.
+        """
+        loaded = self.model_registry.get()
+        if not self.prediction_cache.enabled or loaded.model.preprocessor is None:
+            return None
+        result = self.prediction_cache.get_many(loaded.version, [loaded.model.preprocessor.encode_record(record)])[0]
+        return dict(result) if result is not None else None
+
+    @staticmethod
+    def _score(loaded, records):
+        results = score_records(loaded.model, records)
+        for result in results:
+            result["model_version"] = loaded.version
+        return results
+
+
+def services():
+    """
+    Return the services of the application handling the current request.
+    """
+    return current_app.extensions['stroke_prediction']
+
+
+def create_app(config=None):
+    """
+    Create and configure the Flask application.
+
+    Args:
+        config (dict): Configuration values overriding `DEFAULT_CONFIG`.
+
+    Returns:
+        Flask: The configured application.
+    """
+    app = Flask(__name__, static_folder='app/static', template_folder='app/templates')
+    app.request_class = UploadRequest
+    app.config.update(DEFAULT_CONFIG)
+    app.config.from_prefixed_env()
+    app.config.update(config or {})
+
+    setup_logging(json_format=app.config['LOG_FORMAT'] == 'json')
+    if app.config['UPLOAD_PARQUET'] and not PYARROW_AVAILABLE:
+        logger.warning("UPLOAD_PARQUET is enabled but pyarrow is not installed: uploads are re-read from CSV. "
+                       "Install the 'parquet' extra (pip install pyarrow) or set FLASK_UPLOAD_PARQUET=false.")
+    metrics.configure(log_timings=app.config['LOG_STAGE_TIMINGS'])
+    if app.config['METRICS_FOLDER']:
+        metrics.remove_stale_snapshots(app.config['METRICS_FOLDER'])
+
+    setup_directories(app.config['UPLOAD_FOLDER'], app.config['STATIC_FOLDER'])
+    app.extensions['stroke_prediction'] = AppServices(app.config)
+    app.register_blueprint(bp)
+    if app.config['GRAPH_POOL_WARMUP']:
+        warm_pool(app.config['GRAPH_WORKERS'])
+
+    if app.config['MODEL_PRELOAD']:
+        # Loaded before workers fork, so they share the memory-mapped model arrays
+        app.extensions['stroke_prediction'].model_registry.reload()
+        if app.config['METRICS_FOLDER']:
+            metrics.REGISTRY.write_snapshot(app.config['METRICS_FOLDER'])  # Forked workers start from zero
+    return app
+
+
+def dataset_file_path(dataset_id):
+    """
+    Path of the uploaded CSV file of a dataset.
+    """
+    return services().dataset_store.csv_path(dataset_id)
+
+@bp.before_app_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+
+
+@bp.before_app_request
+def start_request_profiler():
+    """
+    Profile the request if profiling is enabled and it sends the profile header or is sampled.
+
+    A /train request only records the opt-in: its training job is profiled instead, since
+    the request itself just queues the job. Only one profile runs at a time per process.
+    """
+    config = current_app.config
+    if config['PROFILE_ENABLED'] and (
+        config['PROFILE_HEADER'] in request.headers or random.random() < config['PROFILE_SAMPLE_RATE']
+    ):
+        g.profile_requested = True
+        if request.endpoint != 'main.train_model':
+            g.profiler = start_profiler()
+            if g.profiler is None:
+                logger.warning(f"Request {request.path} {PROFILER_BUSY}.")
+
+
+@bp.after_app_request
+def save_request_profile(response):
+    """
+    Store the profile of a profiled request and return its name in the X-Profile-Id header,
+    or the reason it was not profiled in the X-Profile-Status header.
+
+    Streamed responses are profiled up to their first byte.
+    """
+    if 'profiler' in g and g.profiler is None:
+        response.headers['X-Profile-Status'] = PROFILER_BUSY
+    profiler = g.pop('profiler', None)
+    if profiler is not None:
+        name = services().profile_store.save(profiler, {
+            "method": request.method,
+            "path": request.path,
+            "endpoint": request.url_rule.rule if request.url_rule else None,
+            "status": response.status_code,
+            "duration_ms": round((time.perf_counter() - g.request_start) * 1000, 3) if 'request_start' in g else None,
+        })
+        response.headers['X-Profile-Id'] = name
+    return response
+
+
+@bp.teardown_app_request
+def stop_request_profiler(exc):
+    """
+    Stop a profile that `save_request_profile` did not store, e.g. when an unhandled exception
+    skipped the after-request hooks, so the profiler lock of the process is always released.
+    """
+    profiler = g.pop('profiler', None)
+    if profiler is not None:
+        stop_profiler(profiler)
+
+
+@bp.after_app_request
+def record_request_metrics(response):
+    """
+    Count the request and record its duration (up to the first byte for streamed responses).
+    """
+    endpoint = request.url_rule.rule if request.url_rule else "unmatched"
+    REQUESTS.inc(endpoint=endpoint, method=request.method, status=response.status_code)
+    if 'request_start' in g:
+        REQUEST_DURATION.observe(time.perf_counter() - g.request_start, endpoint=endpoint)
+    folder = current_app.config['METRICS_FOLDER']
+    if folder:
+        try:
+            metrics.REGISTRY.write_snapshot(folder, min_interval=current_app.config['METRICS_WRITE_INTERVAL'])
+        except OSError as e:
+            logger.warning(f"Could not write metrics snapshot: {e}")
+    return response
 
 # Route for the home page
-@app.route('/')
+@bp.route('/')
 def index():
     """
     Render the home page, allowing users to upload CSV files.
     """
     return render_template('index.html')
 
-@app.route('/upload', methods=['POST'])
+@bp.route('/upload', methods=['POST'])
 def upload_file():
     """
     Handle file uploads, process the data, and generate graphs.
 
-    - Checks if a valid CSV file is uploaded.
+    - Checks if a valid CSV file is uploaded. CSV files are parsed, and their preprocessing
+      statistics accumulated, while the upload is received (see `UploadRequest`), so a file
+      without the required columns is rejected within its first kilobytes.
     - Loads and preprocesses the data.
     - Generates exploratory data analysis graphs.
+    - With an `append_to` dataset id, the file holds new rows (e.g. a daily delta) that are
+      merged into that stored dataset, creating a new dataset id.
     """
-    global uploaded_data
+    config, dataset_cache, store = current_app.config, services().dataset_cache, services().dataset_store
 
-    if 'file' not in request.files:
+    try:
+        files = request.files  # Receiving the body parses CSV uploads as they arrive
+    except UploadRejected as e:
+        return e.description, 400
+    for _, other in files.items(multi=True):
+        if other is not files.get('file') and isinstance(other.stream, StreamingUpload):
+            other.stream.abort()  # Only the 'file' field is used
+
+    if 'file' not in files:
         logger.warning("No file provided in the request.")
         return redirect(request.url)
 
-    file = request.files['file']
+    file = files['file']
     if file.filename == '':
         logger.warning("Uploaded file is empty.")
         return redirect(request.url)
 
+    append_to = request.form.get("append_to", "")
+    if append_to and not store.exists(append_to):
+        logger.warning(f"Unknown dataset to append to: {append_to}")
+        if isinstance(file.stream, StreamingUpload):
+            file.stream.abort()
+        return "Unknown dataset to append to. Please upload it again.", 400
+
     if file and file.filename.endswith('.csv'):
-        file_path = os.path.join(app.config['UPLOAD_FOLDER'], file.filename)
-        file.save(file_path)
-        logger.info(f"File saved at: {file_path}")
+        with metrics.timed("upload_save"):
+            upload = file.stream
+            if not isinstance(upload, StreamingUpload):  # Not received through `UploadRequest`
+                upload = StreamingUpload(config['UPLOAD_FOLDER'], chunk_size=config['UPLOAD_CHUNK_SIZE'])
+                try:
+                    shutil.copyfileobj(file.stream, upload)
+                except UploadRejected as e:
+                    return e.description, 400
+            try:
+                upload = upload.finish()
+            except UploadRejected as e:
+                return e.description, 400
+        # Files are stored under their content-derived dataset id, so workers never overwrite each other
+        if append_to:
+            dataset_id = store.id_for_file(upload.path, parent=append_to)
+            try:
+                raw_data = append_dataset(append_to, upload.path, dataset_id, delta=upload.data)
+            except ValueError as e:
+                logger.error(f"Invalid dataset: {e}")
+                return str(e), 400
+            finally:
+                if os.path.exists(upload.path):
+                    os.remove(upload.path)
+        else:
+            dataset_id = store.id_for_digest(upload.digest)
+            file_path = store.save(upload.path, dataset_id)
+            logger.info(f"File {file.filename} saved at: {file_path}")
+
+            # Keep the frame and preprocessing statistics of an identical earlier upload if still cached
+            raw_data = dataset_cache.get(dataset_id, "frame")
+            if raw_data is None:
+                raw_data = upload.data
+                dataset_cache.put(dataset_id, "frame", raw_data)
+                if config['UPLOAD_PARQUET']:
+                    write_parquet(raw_data, os.path.splitext(file_path)[0] + '.parquet')
+                logger.info("CSV file successfully loaded.")
+            else:
+                logger.info(f"Reusing cached dataset: {dataset_id}")
+            for name, preprocessor in upload.pipelines.items():
+                if dataset_cache.get(dataset_id, name) is None:
+                    dataset_cache.put(dataset_id, name, preprocessor)
+            store.record(dataset_id, len(raw_data))
 
-        # Load and preprocess the data
-        raw_data = load_csv(file_path)
-        logger.info("CSV file successfully loaded. Starting preprocessing...")
-        processor = DataProcessor(raw_data[SELECTED_COLUMNS + ["Diagnosis"]])
-        uploaded_data = processor.process(target_column="Diagnosis")
-        logger.info("Data preprocessing completed successfully.")
+        # Generate graphs unless every graph of an identical upload is still available
+        summary = dataset_summary(dataset_id, raw_data)
+        graphs = dataset_cache.get(dataset_id, "graphs")
+        if not graphs or not all(
+            graph and os.path.exists(os.path.join(config['STATIC_FOLDER'], graph)) for graph in graphs
+        ):
+            graph_generator = GraphGenerator(
+                raw_data,
+                config['STATIC_FOLDER'],
+                profile=config['GRAPH_PROFILE'],
+                max_workers=config['GRAPH_WORKERS'],
+                summary=summary,
+            )
+            graphs = graph_generator.generate_all_graphs(
+                keep=dataset_cache.referenced_graphs(), min_age=config['GRAPH_MIN_AGE']
+            )
+            dataset_cache.put(dataset_id, "graphs", graphs)
 
-        # Generate graphs (optional: use raw_data or processed data)
-        graph_generator = GraphGenerator(raw_data, app.config['STATIC_FOLDER'])
-        graphs = graph_generator.generate_all_graphs()
+        if wants_json():
+            return jsonify({"dataset_id": dataset_id, "rows": len(raw_data), "appended_to": append_to or None,
+                            "graphs": graphs})
 
         # Render the home page with graphs and a data preview
         return render_template(
             'index.html',
             data=raw_data.head().to_html(classes="table table-striped"),
             graphs=graphs,
+            dataset_id=dataset_id,
             success=True
         )
 
     return "Please upload a valid CSV file."
 
-@app.route('/train', methods=['POST'])
-def train_model():
+def dataset_summary(dataset_id, raw_data=None):
     """
-    Train a machine learning model using the uploaded data.
+    Summary cube of a dataset, built once and cached with the dataset.
 
-    - Retrieves parameters and model type from the form.
-    - Trains the model and saves it to disk.
+    Args:
+        dataset_id (str): The dataset id.
+        raw_data (pd.DataFrame): The parsed dataset, if already loaded.
+
+    Returns:
+        SummaryCube: Per-bin counts of the plotted fields.
+    """
+    dataset_cache = services().dataset_cache
+    summary = dataset_cache.get(dataset_id, "summary")
+    if summary is None:
+        if raw_data is None:
+            raw_data = dataset_cache.get(dataset_id, "frame")
+        if raw_data is None:  # Evicted from the cache; parse the uploaded file again
+            raw_data = load_csv(dataset_file_path(dataset_id))
+        summary = SummaryCube.from_frame(raw_data)
+        dataset_cache.put(dataset_id, "summary", summary)
+    return summary
+
+def append_dataset(base_id, delta_path, dataset_id, delta=None):
+    """
+    Merge the rows of an uploaded delta file into a stored dataset.
+
+    The new dataset holds every row of `base_id` followed by the delta rows. The cached frame
+    and the accumulated preprocessing statistics of the base dataset are extended with the
+    delta only, so neither the stored rows nor the statistics are recomputed from scratch.
+
+    Args:
+        base_id (str): Dataset the rows are appended to.
+        delta_path (str): Uploaded CSV file with the new rows.
+        dataset_id (str): Id of the resulting dataset.
+        delta (pd.DataFrame): The delta rows already parsed, as by `load_csv(delta_path)`.
+
+    Returns:
+        pd.DataFrame: The merged dataset.
+
+    Raises:
+        ValueError: If the delta file lacks required columns or has unknown target values.
+    """
+    dataset_cache, store = services().dataset_cache, services().dataset_store
+    raw_data = dataset_cache.get(dataset_id, "frame")
+    if raw_data is not None and store.exists(dataset_id):
+        logger.info(f"Reusing cached dataset: {dataset_id}")
+        return raw_data
+
+    if delta is None:
+        delta = load_csv(delta_path)
+    base = dataset_cache.get(base_id, "frame")
+    if base is None:  # Evicted from the cache; parse the stored file again
+        base = load_csv(store.csv_path(base_id))
+    raw_data = concat_frames([base, delta])
+
+    # Continue the base dataset's preprocessing statistics with the delta rows
+    pipelines = {}
+    for name in ("pipeline", "pipeline_native"):
+        preprocessor = dataset_cache.get(base_id, name)
+        if preprocessor is not None:
+            preprocessor = copy.deepcopy(preprocessor)  # The cached object may also belong to a served model
+            preprocessor.partial_fit(delta[SELECTED_COLUMNS + ["Diagnosis"]])
+            pipelines[name] = preprocessor.finalize()
+
+    store.append(base_id, delta_path, dataset_id, parent_rows=len(base), rows=len(raw_data))
+    dataset_cache.put(dataset_id, "frame", raw_data)
+    for name, preprocessor in pipelines.items():
+        dataset_cache.put(dataset_id, name, preprocessor)
+    return raw_data
+
+def run_training_job(job, app, dataset_id, model_type, params, search, search_options, streaming=False,
+                     epochs=1, profile=False, warm_start=False):
+    """
+    Train a model in the background and publish it when training succeeds.
+
+    - Fits the preprocessing pipeline (or reuses the cached one for this dataset) and trains
+      the model, reporting progress to the job. In streaming mode the uploaded file is read
+      in chunks instead, so the dataset never has to fit in memory. With `warm_start`, the
+      served model continues training on the rows appended since its training dataset.
     - Generates prediction-related graphs.
+    - Saves the model and swaps it into the registry only once everything succeeded.
+    - When profiling was requested for the /train request, the job is profiled (work done
+      in the worker processes of a parallel hyperparameter search is not captured). If
+      another profile is running, the result says so in `profile_status`.
+    """
+    with app.app_context():
+        profiler = start_profiler() if profile else None
+        if profiler is None:
+            result = _train_and_publish(job, dataset_id, model_type, params, search, search_options, streaming,
+                                        epochs, warm_start)
+            if profile:
+                logger.warning(f"Training job {job.job_id} {PROFILER_BUSY}.")
+                result["profile_status"] = PROFILER_BUSY
+            return result
+        start, result = time.perf_counter(), None
+        try:
+            result = _train_and_publish(job, dataset_id, model_type, params, search, search_options, streaming,
+                                        epochs, warm_start)
+        finally:
+            name = services().profile_store.save(profiler, {
+                "method": "JOB",
+                "path": f"/train/{job.job_id}",
+                "endpoint": "/train/<job_id>",
+                "status": "succeeded" if result is not None else "failed",
+                "duration_ms": round((time.perf_counter() - start) * 1000, 3),
+            })
+        result["profile_id"] = name
+        return result
+
+
+def _train_and_publish(job, dataset_id, model_type, params, search, search_options, streaming, epochs,
+                       warm_start=False):
+    """
+    Body of `run_training_job`, running inside the application context.
+    """
+    config, dataset_cache = current_app.config, services().dataset_cache
+    if warm_start:
+        # A private in-memory copy: the served model's arrays are read-only memory maps
+        model = StrokePredictionModel()
+        model.load_model(config['MODEL_PATH'], mmap_mode=None)
+        model_type = model.manifest.get("estimator", model_type) if model.manifest else model_type
+        new_rows = new_rows_since_model(model, dataset_id)
+        model.train_incremental(
+            new_rows,
+            n_estimators=config['WARM_START_ESTIMATORS'],
+            epochs=epochs,
+            progress_callback=job.update_progress,
+        )
+    elif streaming:
+        file_path = dataset_file_path(dataset_id)
+        model = StrokePredictionModel()
+        model.train_streaming(
+            lambda: load_csv_chunks(file_path, config['TRAINING_CHUNK_SIZE'], SELECTED_COLUMNS + ["Diagnosis"]),
+            model_type=model_type,
+            epochs=epochs,
+            work_folder=config['TRAINING_WORK_FOLDER'],
+            progress_callback=job.update_progress,
+        )
+    else:
+        job.update_progress(phase="preprocessing")
+        # Estimators with native categorical support get the unscaled category codes
+        scale_categorical = model_type not in NATIVE_CATEGORICAL_MODEL_TYPES
+        cache_name = "preprocessed" if scale_categorical else "preprocessed_native"
+        cached = dataset_cache.get(dataset_id, cache_name)
+        if cached is None:
+            data = training_frame(dataset_id)
+            preprocessor = dataset_pipeline(dataset_id, data, scale_categorical)
+            processed_data = preprocessor.transform(data)
+            dataset_cache.put(dataset_id, cache_name, (preprocessor, processed_data))
+        else:
+            preprocessor, processed_data = cached
+        model = StrokePredictionModel(processed_data, preprocessor=preprocessor)
+        model.train_model(
+            model_type=model_type,
+            params=params,
+            search=search,
+            n_jobs=config['TRAINING_N_JOBS'],
+            search_options=search_options,
+            progress_callback=job.update_progress,
+        )
+
+    job.update_progress(phase="generating_graphs")
+    prediction_graphs = model.generate_prediction_graphs(config['STATIC_FOLDER'])
+
+    # Last chance to cancel: the model is published atomically after this point
+    job.update_progress(phase="publishing")
+    model.save_model(config['MODEL_PATH'], data_hash=dataset_id, compress=config['MODEL_COMPRESS'])
+    loaded = services().model_registry.publish(model)
+    logger.info(f"Model {model_type} trained and saved successfully.")
+    return {
+        "model_type": model_type,
+        "model_version": loaded.version,
+        "metrics": model.metrics,
+        "prediction_graphs": prediction_graphs,
+    }
+
+def training_frame(dataset_id):
+    """
+    Raw training rows of an uploaded dataset: the selected columns and 'Diagnosis'.
+    """
+    raw_data = services().dataset_cache.get(dataset_id, "frame")
+    if raw_data is None:  # Evicted from the cache; parse the uploaded file again
+        raw_data = load_csv(dataset_file_path(dataset_id))
+    return raw_data[SELECTED_COLUMNS + ["Diagnosis"]]
+
+def dataset_pipeline(dataset_id, data, scale_categorical=True):
+    """
+    Preprocessing pipeline fitted on a dataset, from the cache or fitted on `data` and cached.
+
+    The cached statistics were accumulated while the dataset was uploaded, and are continued
+    when rows are appended to it.
+    """
+    dataset_cache = services().dataset_cache
+    pipeline_name = "pipeline" if scale_categorical else "pipeline_native"
+    preprocessor = dataset_cache.get(dataset_id, pipeline_name)
+    if preprocessor is None:
+        preprocessor = PreprocessingPipeline(target_column="Diagnosis", scale_categorical=scale_categorical)
+        preprocessor.fit(data)
+        dataset_cache.put(dataset_id, pipeline_name, preprocessor)
+    return preprocessor
+
+def run_comparison_job(job, app, dataset_id, model_types, folds):
+    """
+    Cross-validate several model types on the same folds of a dataset in the background.
+
+    Nothing is published: the job result is the leaderboard, used to choose the model
+    type to train with /train.
+    """
+    with app.app_context():
+        config = current_app.config
+        job.update_progress(phase="loading")
+        return compare_models(
+            training_frame(dataset_id),
+            model_types=model_types,
+            n_splits=folds,
+            max_workers=config['COMPARISON_WORKERS'],
+            work_folder=config['TRAINING_WORK_FOLDER'],
+            progress_callback=job.update_progress,
+        )
+
+def new_rows_since_model(model, dataset_id):
+    """
+    Raw rows of a dataset appended after the dataset a model was trained on.
+
+    Args:
+        model (StrokePredictionModel): A loaded model whose manifest records its training dataset.
+        dataset_id (str): The model's training dataset or a dataset appended to it.
+
+    Returns:
+        pd.DataFrame: The new rows, with the selected columns and 'Diagnosis'.
+
+    Raises:
+        ValueError: If the dataset does not extend the model's training dataset or has no new rows.
+    """
+    store = services().dataset_store
+    trained_on = (model.manifest or {}).get("training_data_hash")
+    offset = store.rows_before(dataset_id, trained_on)
+    if offset is None:
+        raise ValueError("The current model was not trained on this dataset or one it was appended to.")
+    info = store.info(dataset_id)
+    if info is not None and info["rows"] <= offset:
+        raise ValueError("No new rows since the current model was trained.")
+
+    columns = SELECTED_COLUMNS + ["Diagnosis"]
+    raw_data = services().dataset_cache.get(dataset_id, "frame")
+    if raw_data is not None:
+        return raw_data.iloc[offset:][columns].reset_index(drop=True)
+    # Only the tail of the stored file is kept while reading it
+    chunks, start = [], 0
+    for chunk in load_csv_chunks(store.csv_path(dataset_id), current_app.config['TRAINING_CHUNK_SIZE'], columns):
+        if start + len(chunk) > offset:
+            chunks.append(chunk.iloc[max(offset - start, 0):])
+        start += len(chunk)
+    return concat_frames(chunks)
+
+def parse_params(text):
+    """
+    Parse the hyperparameter grid of a training request without evaluating code.
+
+    Args:
+        text (str): A JSON object, or a Python dict literal as accepted by earlier versions.
+
+    Returns:
+        dict: The hyperparameter grid.
+
+    Raises:
+        ValueError: If the text is not a JSON object or dict literal.
+    """
+    try:
+        params = json.loads(text)
+    except ValueError:
+        try:
+            params = ast.literal_eval(text)
+        except (ValueError, SyntaxError, TypeError, MemoryError, RecursionError):
+            raise ValueError("Invalid 'params': expected a JSON object such as {\"n_estimators\": [100, 200]}.")
+    if not isinstance(params, dict):
+        raise ValueError("Invalid 'params': expected a JSON object mapping parameter names to values.")
+    return params
+
+def wants_json():
+    """
+    Whether the client prefers a JSON response over the HTML page.
+    """
+    best = request.accept_mimetypes.best_match(['application/json', 'text/html'])
+    return request.is_json or best == 'application/json'
+
+@bp.route('/train', methods=['POST'])
+def train_model():
     """
-    global uploaded_data
+    Submit a background job training a model on the uploaded data.
 
-    if uploaded_data is None:
+    - Retrieves parameters and model type from the form.
+    - Returns the job id immediately; progress is available at /train/<job_id>.
+    """
+    dataset_id = request.form.get("dataset_id", "")
+    if not services().dataset_store.exists(dataset_id):
         logger.warning("No data uploaded for training.")
         return "No data uploaded. Please upload a CSV file first.", 400
 
@@ -95,35 +757,115 @@ def train_model():
         model_type = request.form.get("model_type", "RandomForest")
         params = request.form.get("params")
         if params:
-            params = eval(params)  # Evaluate string as Python expression
+            params = parse_params(params)
+        search = request.form.get("search", "grid")
+        search_options = request.form.get("search_options")
+        search_options = json.loads(search_options) if search_options else None
+        streaming = request.form.get("streaming") in ("1", "true", "on")
+        epochs = int(request.form.get("epochs") or 1)
+        warm_start = request.form.get("warm_start") in ("1", "true", "on")
+    except Exception as e:
+        logger.error(f"Invalid training parameters: {e}")
+        return str(e), 400
 
-        # Train the model
-        model = StrokePredictionModel(uploaded_data[SELECTED_COLUMNS + ["Diagnosis"]])
-        X_test, y_test = model.train_model(model_type=model_type, params=params)
-        
-        # Save the trained model
-        model.save_model(app.config['MODEL_PATH'])
-        logger.info(f"Model {model_type} trained and saved successfully.")
+    if warm_start:
+        # Checked before queueing so the client gets the error right away
+        try:
+            current = services().model_registry.get()
+            if not current.model.supports_incremental:
+                raise ValueError(f"The current model ({(current.model.manifest or {}).get('estimator')}) "
+                                 "cannot be trained incrementally.")
+            store = services().dataset_store
+            offset = store.rows_before(dataset_id, (current.model.manifest or {}).get("training_data_hash"))
+            if offset is None:
+                raise ValueError("The current model was not trained on this dataset or one it was appended to.")
+            if offset >= store.info(dataset_id)["rows"]:
+                raise ValueError("No new rows since the current model was trained.")
+        except FileNotFoundError:
+            return "No trained model to continue training. Train one first.", 400
+        except ValueError as e:
+            logger.warning(f"Warm start rejected: {e}")
+            return str(e), 400
 
-        # Generate prediction-related graphs
-        prediction_graphs = model.generate_prediction_graphs(X_test, y_test, app.config['STATIC_FOLDER'])
+    job = services().training_jobs.submit(
+        run_training_job,
+        description={"model_type": model_type, "search": search if params else None, "streaming": streaming,
+                     "warm_start": warm_start},
+        app=current_app._get_current_object(),
+        dataset_id=dataset_id,
+        model_type=model_type,
+        params=params,
+        search=search,
+        search_options=search_options,
+        streaming=streaming,
+        epochs=epochs,
+        profile=g.get('profile_requested', False),
+        warm_start=warm_start,
+    )
+    if wants_json():
+        return jsonify({"job_id": job.job_id, "status_url": f"/train/{job.job_id}"}), 202
+    return render_template("index.html", training_job=job.to_dict(), model_type=model_type), 202
 
-        return render_template(
-            "index.html",
-            prediction_graphs=prediction_graphs,
-            model_type=model_type,
-        )
-    except Exception as e:
-        logger.error(f"Error during model training: {e}")
-        return str(e), 500
+@bp.route('/compare', methods=['POST'])
+def compare_model_types():
+    """
+    Queue a cross-validated comparison of model types on an uploaded dataset.
 
-@app.route('/predict', methods=['POST'])
+    Every model type in `model_types` (all of them by default) is fitted on the same
+    `folds` stratified folds in a process pool. The leaderboard (mean accuracy and ROC AUC,
+    fit and predict timings) is the result of the job, polled at /train/<job_id>.
+    """
+    dataset_id = request.form.get("dataset_id", "")
+    if not services().dataset_store.exists(dataset_id):
+        return jsonify({"error": "No data uploaded. Please upload a CSV file first."}), 400
+    model_types = request.form.getlist("model_types") or None
+    try:
+        folds = int(request.form.get("folds") or current_app.config['COMPARISON_FOLDS'])
+        if folds < 2:
+            raise ValueError("At least 2 folds are needed.")
+        unknown = [model_type for model_type in model_types or [] if model_type not in MODEL_TYPES]
+        if unknown:
+            raise ValueError(f"Unsupported model types: {unknown}. Choose from: {', '.join(MODEL_TYPES)}.")
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    job = services().training_jobs.submit(
+        run_comparison_job,
+        description={"comparison": True, "model_types": model_types or list(MODEL_TYPES), "folds": folds},
+        app=current_app._get_current_object(),
+        dataset_id=dataset_id,
+        model_types=model_types,
+        folds=folds,
+    )
+    return jsonify({"job_id": job.job_id, "status_url": f"/train/{job.job_id}"}), 202
+
+@bp.route('/train/<job_id>', methods=['GET'])
+def training_status(job_id):
+    """
+    Return the status, progress, elapsed time and final metrics of a training job.
+    """
+    state = services().training_jobs.status(job_id)
+    if state is None:
+        return jsonify({"error": "Unknown training job."}), 404
+    return jsonify(state)
+
+@bp.route('/train/<job_id>/cancel', methods=['POST'])
+def cancel_training(job_id):
+    """
+    Request cancellation of a queued or running training job.
+    """
+    state = services().training_jobs.cancel(job_id)
+    if state is None:
+        return jsonify({"error": "Unknown training job."}), 404
+    return jsonify(state)
+
+@bp.route('/predict', methods=['POST'])
 def predict():
     """
     Make predictions based on user input.
 
-    - Processes user-provided input.
-    - Loads the trained model and predicts the probability of stroke.
+    - Uses the model (and its fitted preprocessing pipeline) held by the model registry.
+    - Transforms user-provided input (no refitting) and predicts the probability of stroke.
     """
     try:
         input_data = request.form.to_dict()
@@ -140,29 +882,212 @@ def predict():
             except ValueError:
                 pass
 
-        input_df = pd.DataFrame([input_data])
-        input_df = input_df[SELECTED_COLUMNS]
-        if input_df.empty:
-            return jsonify({"error": "Invalid input data."}), 400
-
-        # Preprocess the input data
-        processor = DataProcessor(input_df)
-        processed_data = processor.process(target_column=None)
+        missing = [col for col in SELECTED_COLUMNS if col not in input_data]
+        if missing:
+            return jsonify({"error": f"Missing required fields: {missing}"}), 400
 
-        # Load the trained model
-        model = StrokePredictionModel(None)
-        model.load_model(app.config['MODEL_PATH'])
-
-        # Make prediction
-        prediction = model.predict(processed_data)
-        result = "High stroke probability" if prediction[0] == 1 else "Low stroke probability"
+        # Scored with the in-memory model and its preprocessing pipeline, unless the same
+        # encoded profile was already scored by this model version
+        prediction = services().predict_records([input_data])[0]["prediction"]
+        result = "High stroke probability" if prediction == 1 else "Low stroke probability"
         return render_template("index.html", prediction_result=result)
     except Exception as e:
         logger.error(f"Error during prediction: {e}")
         return str(e), 500
 
-# Main application configuration
+@bp.route('/predict/batch', methods=['POST'])
+def predict_batch():
+    """
+    Score a CSV file or JSON array of patient records in chunks and stream the results.
+
+    - Accepts an uploaded file (`file` field, .csv or .json) or a raw CSV/JSON request body.
+    - Each chunk is transformed and scored with a single `predict_proba` call.
+    - Results are streamed back as CSV (default) or JSON (`?format=json`).
+    """
+    output_format = request.args.get('format', 'csv')
+    if output_format not in ('csv', 'json'):
+        return jsonify({"error": "Unsupported format. Choose 'csv' or 'json'."}), 400
+
+    chunk_size = current_app.config['BATCH_CHUNK_SIZE']
+    if 'file' in request.files:
+        upload = request.files['file']
+        stream, is_json = upload.stream, upload.filename.lower().endswith('.json')
+        # Detach the stream: Flask closes request files before a streamed response is consumed
+        upload.stream = io.BytesIO()
+    else:
+        stream, is_json = request.stream, request.mimetype == 'application/json'
+    chunks = iter_json_chunks(stream, chunk_size) if is_json else iter_csv_chunks(stream, chunk_size)
+
+    def close_input():
+        chunks.close()  # Release the parser before closing the stream it reads from
+        stream.close()
+
+    try:
+        loaded = services().model_registry.get()  # One model version for the whole file
+        results = score_chunks(loaded.model, chunks)
+        first = next(results, None)  # Validate the input before the response starts streaming
+    except FileNotFoundError:
+        close_input()
+        return jsonify({"error": "No trained model available."}), 404
+    except (ValueError, ParserError) as e:
+        close_input()
+        logger.warning(f"Invalid batch prediction input: {e}")
+        return jsonify({"error": str(e)}), 400
+
+    results = itertools.chain([first], results) if first is not None else iter(())
+    if output_format == 'json':
+        body, mimetype = stream_json(results), 'application/json'
+    else:
+        body, mimetype = stream_csv(results), 'text/csv'
+
+    def generate():
+        try:
+            yield from body
+        finally:
+            close_input()
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype=mimetype,
+        headers={"X-Model-Version": loaded.version},
+    )
+
+@bp.route('/api/v1/predict', methods=['POST'])
+def api_predict():
+    """
+    Predict stroke risk from JSON input without rendering a page.
+
+    - A single record (JSON object) is scored through the micro-batcher when enabled.
+    - A list of records is scored directly as one batch.
+    """
+    payload = request.get_json(silent=True)
+    records = payload if isinstance(payload, list) else [payload]
+    if not records or not all(isinstance(record, dict) for record in records):
+        return jsonify({"error": "Expected a JSON object or a list of JSON objects."}), 400
+    missing = sorted({col for record in records for col in SELECTED_COLUMNS if col not in record})
+    if missing:
+        return jsonify({"error": f"Missing required fields: {missing}"}), 400
+
+    try:
+        if isinstance(payload, dict) and current_app.config['MICRO_BATCH_ENABLED']:
+            cached = services().cached_prediction(payload)
+            if cached is not None:
+                return jsonify(cached)
+            return jsonify(services().micro_batcher.predict(payload, timeout=current_app.config['PREDICTION_TIMEOUT']))
+        results = services().predict_records(records)
+        return jsonify(results if isinstance(payload, list) else results[0])
+    except FileNotFoundError:
+        return jsonify({"error": "No trained model available."}), 404
+    except Exception as e:
+        logger.error(f"Error during API prediction: {e}")
+        return jsonify({"error": str(e)}), 500
+
+@bp.route('/predict/cache', methods=['GET'])
+def prediction_cache_stats():
+    """
+    Return the hit and miss counters and the size of this worker's prediction cache.
+    """
+    return jsonify(services().prediction_cache.stats())
+
+@bp.route('/stats/<dataset_id>', methods=['GET'])
+def dataset_stats(dataset_id):
+    """
+    Return the summary cube of an uploaded dataset: per-bin counts of the plotted fields by
+    Diagnosis and Stroke History, for dashboards.
+    """
+    if not services().dataset_store.exists(dataset_id):
+        return jsonify({"error": "Unknown dataset."}), 404
+    return jsonify({"dataset_id": dataset_id, **dataset_summary(dataset_id).to_dict()})
+
+@bp.route('/model', methods=['GET'])
+def model_info():
+    """
+    Return the version, load time and manifest of the model currently served.
+    """
+    try:
+        return jsonify(services().model_registry.get().info())
+    except FileNotFoundError:
+        return jsonify({"error": "No trained model available."}), 404
+
+@bp.route('/model/report', methods=['GET'])
+def model_report():
+    """
+    Return the test-set evaluation of the model currently served: metrics, confusion matrix,
+    ROC and precision-recall curve points and calibration bins, as saved with the artifact.
+    """
+    try:
+        loaded = services().model_registry.get()
+    except FileNotFoundError:
+        return jsonify({"error": "No trained model available."}), 404
+    if loaded.model.evaluation is None:
+        return jsonify({"error": "The current model has no saved evaluation."}), 404
+    return jsonify({"model_version": loaded.version, **loaded.model.evaluation.to_dict()})
+
+@bp.route('/model/report/<chart>.svg', methods=['GET'])
+def model_report_chart(chart):
+    """
+    Draw one chart of the served model's evaluation as SVG, without running the model.
+    """
+    try:
+        evaluation = services().model_registry.get().model.evaluation
+    except FileNotFoundError:
+        evaluation = None
+    if evaluation is None or chart not in CHARTS:
+        return jsonify({"error": "Chart not found."}), 404
+    return Response(evaluation.render_svg(chart), mimetype='image/svg+xml')
+
+@bp.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    """
+    Export request counters, model loads and stage durations in the Prometheus text format.
+
+    The values of every worker process sharing `METRICS_FOLDER` are added together.
+    """
+    text = metrics.REGISTRY.render(current_app.config['METRICS_FOLDER'])
+    return Response(text, mimetype='text/plain; version=0.0.4')
+
+def admin_denied():
+    """
+    Return an error response unless profiling is enabled and the request carries the admin token.
+    """
+    config = current_app.config
+    if not config['PROFILE_ENABLED']:
+        return jsonify({"error": "Profiling is disabled."}), 404
+    if config['ADMIN_TOKEN'] and request.headers.get('Authorization') != f"Bearer {config['ADMIN_TOKEN']}":
+        return jsonify({"error": "Unauthorized."}), 401
+    return None
+
+@bp.route('/admin/profiles', methods=['GET'])
+def list_profiles():
+    """
+    List the stored request profiles, newest first.
+    """
+    return admin_denied() or jsonify({"profiles": services().profile_store.list()})
+
+@bp.route('/admin/profiles/<name>', methods=['GET'])
+def get_profile(name):
+    """
+    Download a stored profile, or with `?format=text` show its top functions
+    (`sort` and `limit` query parameters as in pstats).
+    """
+    denied = admin_denied()
+    if denied:
+        return denied
+    profile_store = services().profile_store
+    path = profile_store.path(name)
+    if path is None:
+        return jsonify({"error": "Profile not found."}), 404
+    if request.args.get('format') != 'text':
+        return send_file(os.path.abspath(path), mimetype='application/octet-stream', as_attachment=True,
+                         download_name=f"{name}.prof")
+    try:
+        report = profile_store.report(
+            name, sort=request.args.get('sort', 'cumulative'), limit=int(request.args.get('limit', 40))
+        )
+    except (KeyError, ValueError) as e:
+        return jsonify({"error": f"Invalid report options: {e}"}), 400
+    return Response(report, mimetype='text/plain')
+
+# Development server; use wsgi.py with gunicorn (see gunicorn.conf.py) in production
 if __name__ == '__main__':
-    # Ensure necessary directories exist before starting the application
-    setup_directories(app.config['UPLOAD_FOLDER'], app.config['STATIC_FOLDER'])
-    app.run(debug=True)
+    create_app().run(debug=True)
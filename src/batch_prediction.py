@@ -0,0 +1,200 @@
+import io
+import json
+from logging import getLogger
+import pandas as pd
+from src.config import SELECTED_COLUMNS
+from src.utils import dataset_dtypes
+
+# Initialize a logger for this module
+logger = getLogger(__name__)
+
+# Optional identifier column copied from the input to the output rows
+ID_COLUMN = "Patient ID"
+
+# Largest number of records scored through the record-level preprocessing path; beyond it
+# the vectorized DataFrame path is faster
+MAX_RECORD_PATH_ROWS = 64
+
+
+def iter_csv_chunks(stream, chunk_size):
+    """
+    Read a CSV stream in chunks of rows.
+
+    Only the model inputs and the optional id column are parsed, with the compact
+    dataset dtypes; every other column is skipped.
+
+    Args:
+        stream: Binary or text file-like object containing CSV data.
+        chunk_size (int): Maximum number of rows per chunk.
+
+    Yields:
+        pd.DataFrame: Consecutive chunks of the CSV file.
+    """
+    columns = SELECTED_COLUMNS + [ID_COLUMN]
+    yield from pd.read_csv(
+        stream,
+        chunksize=chunk_size,
+        usecols=lambda col: col in columns,
+        dtype=dataset_dtypes(SELECTED_COLUMNS),
+    )
+
+
+def iter_json_chunks(stream, chunk_size, read_size=64 * 1024):
+    """
+    Incrementally parse a JSON array of records and yield it in chunks of rows.
+
+    Only one read buffer and one chunk of records are held in memory at a time.
+
+    Args:
+        stream: Binary or text file-like object containing a JSON array of objects.
+        chunk_size (int): Maximum number of records per chunk.
+        read_size (int): Number of characters read from the stream at a time.
+
+    Yields:
+        pd.DataFrame: Consecutive chunks of records.
+
+    Raises:
+        ValueError: If the input is not a JSON array of objects.
+    """
+    if not isinstance(stream, io.TextIOBase):
+        stream = io.TextIOWrapper(stream, encoding="utf-8")
+    decoder = json.JSONDecoder()
+    buffer, position, eof = "", 0, False
+    started = False
+    records = []
+
+    while True:
+        # Skip whitespace and separators between values
+        while position < len(buffer) and buffer[position] in " \t\r\n,":
+            position += 1
+        if position >= len(buffer) and not eof:
+            data = stream.read(read_size)
+            eof = not data
+            buffer, position = buffer[position:] + data, 0
+            continue
+        if position >= len(buffer):
+            raise ValueError("Unexpected end of JSON input.")
+
+        if not started:
+            if buffer[position] != "[":
+                raise ValueError("Expected a JSON array of records.")
+            started, position = True, position + 1
+            continue
+        if buffer[position] == "]":
+            break
+
+        try:
+            record, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            if eof:
+                raise ValueError("Malformed JSON record in input.")
+            data = stream.read(read_size)  # The record is incomplete; read more before decoding again
+            eof = not data
+            buffer, position = buffer[position:] + data, 0
+            continue
+        if not isinstance(record, dict):
+            raise ValueError("Expected a JSON array of records.")
+        records.append(record)
+        position = end
+        if len(records) >= chunk_size:
+            yield pd.DataFrame.from_records(records)
+            records = []
+
+    if records:
+        yield pd.DataFrame.from_records(records)
+
+
+def score_chunks(model, chunks):
+    """
+    Score chunks of raw patient rows with one vectorized `predict_proba` call per chunk.
+
+    Args:
+        model (StrokePredictionModel): Trained model with a fitted preprocessing pipeline.
+        chunks (iterable): Iterable of DataFrames containing the `SELECTED_COLUMNS` fields.
+
+    Yields:
+        pd.DataFrame: Per-row results with the row number, the optional patient id,
+        the predicted class and the stroke probability.
+
+    Raises:
+        ValueError: If a chunk is missing any of the `SELECTED_COLUMNS`.
+    """
+    row_offset = 0
+    for chunk in chunks:
+        missing = [col for col in SELECTED_COLUMNS if col not in chunk.columns]
+        if missing:
+            raise ValueError(f"Missing required columns: {missing}")
+
+        features = model.preprocess(chunk[SELECTED_COLUMNS])
+        probabilities = model.predict_proba(features)[:, 1]
+
+        result = pd.DataFrame({"row": range(row_offset, row_offset + len(chunk))})
+        if ID_COLUMN in chunk.columns:
+            result[ID_COLUMN] = chunk[ID_COLUMN].to_numpy()
+        result["prediction"] = (probabilities > 0.5).astype(int)
+        result["stroke_probability"] = probabilities.round(6)
+        row_offset += len(chunk)
+        yield result
+    logger.info(f"Batch prediction completed for {row_offset} rows.")
+
+
+def score_records(model, records):
+    """
+    Score a list of raw records with a single vectorized `predict_proba` call.
+
+    Single requests and micro-batches (up to `MAX_RECORD_PATH_ROWS` records) are encoded
+    record by record with `preprocess_records`, skipping the DataFrame construction that
+    dominates their latency; larger lists go through the vectorized `preprocess`.
+
+    Args:
+        model (StrokePredictionModel): Trained model with a fitted preprocessing pipeline.
+        records (list): Dicts containing the `SELECTED_COLUMNS` fields.
+
+    Returns:
+        list: One dict per record with the predicted class and the stroke probability.
+    """
+    if len(records) <= MAX_RECORD_PATH_ROWS:
+        features = model.preprocess_records(records)
+    else:
+        features = model.preprocess(pd.DataFrame.from_records(records, columns=SELECTED_COLUMNS))
+    probabilities = model.predict_proba(features)[:, 1]
+    return [
+        {"prediction": int(probability > 0.5), "stroke_probability": round(float(probability), 6)}
+        for probability in probabilities
+    ]
+
+
+def stream_csv(results):
+    """
+    Serialize scored chunks as CSV text, writing the header only once.
+
+    Args:
+        results (iterable): Iterable of result DataFrames from `score_chunks`.
+
+    Yields:
+        str: CSV text for each chunk.
+    """
+    header = True
+    for result in results:
+        yield result.to_csv(index=False, header=header)
+        header = False
+
+
+def stream_json(results):
+    """
+    Serialize scored chunks as one JSON array, emitted incrementally.
+
+    Args:
+        results (iterable): Iterable of result DataFrames from `score_chunks`.
+
+    Yields:
+        str: Fragments of the JSON array.
+    """
+    yield "["
+    separator = ""
+    for result in results:
+        records = result.to_dict(orient="records")
+        if records:
+            yield separator + ",".join(json.dumps(record, default=str) for record in records)
+            separator = ","
+    yield "]"
@@ -0,0 +1,187 @@
+from logging import getLogger
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier, ExtraTreesClassifier
+from sklearn.tree import DecisionTreeClassifier
+
+# Initialize a logger for this module
+logger = getLogger(__name__)
+
+# Estimators whose fitted trees can be flattened into a CompiledForest
+SUPPORTED_ESTIMATORS = (RandomForestClassifier, ExtraTreesClassifier, DecisionTreeClassifier)
+
+# Largest batch predicted through the compiled arrays. Beyond this size the per-call overhead
+# of scikit-learn is amortized and its compiled traversal is faster than NumPy indexing.
+MAX_COMPILED_ROWS = 128
+
+
+class CompiledForest:
+    """
+    Flattened, NumPy-only representation of a fitted tree ensemble classifier.
+
+    The nodes of all trees are concatenated into flat arrays (split feature, threshold,
+    children, missing-value direction and normalized leaf values), and predictions walk
+    every tree for every row at once with vectorized indexing, one tree level per step.
+    The arithmetic mirrors scikit-learn (float32 inputs, per-tree probabilities summed in
+    tree order and divided by the number of trees), so the outputs are identical.
+
+    Attributes:
+        classes_ (np.ndarray): Class labels, in the order of the probability columns.
+        feature_names (list): Feature names seen during fit, or None.
+        roots (np.ndarray): Index of the root node of each tree.
+        feature (np.ndarray): Split feature of each node.
+        threshold (np.ndarray): Split threshold of each node.
+        left (np.ndarray): Left child of each node (-1 for leaves).
+        right (np.ndarray): Right child of each node (-1 for leaves).
+        missing_left (np.ndarray): Whether missing values go to the left child.
+        value (np.ndarray): Normalized class probabilities of each node.
+        max_depth (int): Depth of the deepest tree.
+    """
+    def __init__(self, classes, feature_names, roots, feature, threshold, left, right, missing_left, value,
+                 max_depth):
+        self.classes_ = classes
+        self.feature_names = feature_names
+        self.roots = roots
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.missing_left = missing_left
+        self.value = value
+        self.max_depth = max_depth
+
+    @classmethod
+    def from_estimator(cls, estimator):
+        """
+        Flatten a fitted random forest, extra-trees or decision tree classifier.
+
+        Args:
+            estimator: A fitted estimator from `SUPPORTED_ESTIMATORS`.
+
+        Returns:
+            CompiledForest: The compiled ensemble.
+
+        Raises:
+            ValueError: If the estimator is not a supported single-output tree classifier.
+        """
+        if not isinstance(estimator, SUPPORTED_ESTIMATORS):
+            raise ValueError(f"Cannot compile estimator of type {type(estimator).__name__}.")
+        if getattr(estimator, "n_outputs_", 1) != 1:
+            raise ValueError("Only single-output classifiers can be compiled.")
+        trees = [tree.tree_ for tree in estimator.estimators_] if hasattr(estimator, "estimators_") \
+            else [estimator.tree_]
+
+        roots, offset = [], 0
+        feature, threshold, left, right, missing_left, value = [], [], [], [], [], []
+        for tree in trees:
+            is_leaf = tree.children_left == -1
+            roots.append(offset)
+            feature.append(np.where(is_leaf, 0, tree.feature))
+            threshold.append(tree.threshold)
+            left.append(np.where(is_leaf, -1, tree.children_left + offset))
+            right.append(np.where(is_leaf, -1, tree.children_right + offset))
+            missing = getattr(tree, "missing_go_to_left", None)
+            missing_left.append(np.zeros(tree.node_count, dtype=bool) if missing is None else missing.astype(bool))
+            # Normalize exactly like DecisionTreeClassifier.predict_proba
+            proba = tree.value[:, 0, :].copy()
+            normalizer = proba.sum(axis=1)[:, np.newaxis]
+            normalizer[normalizer == 0.0] = 1.0
+            value.append(proba / normalizer)
+            offset += tree.node_count
+
+        feature_names = getattr(estimator, "feature_names_in_", None)
+        return cls(
+            classes=np.asarray(estimator.classes_),
+            feature_names=list(feature_names) if feature_names is not None else None,
+            roots=np.asarray(roots, dtype=np.intp),
+            feature=np.concatenate(feature).astype(np.intp),
+            threshold=np.concatenate(threshold).astype(np.float64),
+            left=np.concatenate(left).astype(np.intp),
+            right=np.concatenate(right).astype(np.intp),
+            missing_left=np.concatenate(missing_left),
+            value=np.concatenate(value).astype(np.float64),
+            max_depth=max(tree.max_depth for tree in trees),
+        )
+
+    def _as_array(self, X):
+        """
+        Convert the input to a float32 array with the columns in training order.
+        """
+        if hasattr(X, "columns") and self.feature_names is not None:
+            X = X[self.feature_names]
+        return np.asarray(X, dtype=np.float32)
+
+    def apply(self, X):
+        """
+        Find the leaf reached by every row in every tree.
+
+        Args:
+            X (array-like): Features of shape (n_samples, n_features).
+
+        Returns:
+            np.ndarray: Leaf node indices of shape (n_samples, n_trees).
+        """
+        X = self._as_array(X)
+        n_trees = len(self.roots)
+        nodes = np.tile(self.roots, len(X))
+        rows = np.repeat(np.arange(len(X)), n_trees)
+        has_missing = np.isnan(X).any()
+        # Only (row, tree) pairs that have not reached a leaf are advanced at each level
+        active = np.flatnonzero(self.left[nodes] != -1)
+        while len(active):
+            current = nodes[active]
+            values = X[rows[active], self.feature[current]]
+            go_left = values <= self.threshold[current]
+            if has_missing:
+                go_left = np.where(np.isnan(values), self.missing_left[current], go_left)
+            current = np.where(go_left, self.left[current], self.right[current])
+            nodes[active] = current
+            active = active[self.left[current] != -1]
+        return nodes.reshape(len(X), n_trees)
+
+    def predict_proba(self, X):
+        """
+        Predict class probabilities as the mean of the per-tree leaf probabilities.
+
+        Args:
+            X (array-like): Features of shape (n_samples, n_features).
+
+        Returns:
+            np.ndarray: Array of shape (n_samples, n_classes).
+        """
+        leaves = self.apply(X)
+        # Reducing over the (non-innermost) tree axis adds the trees in order, like scikit-learn
+        proba = self.value[leaves].sum(axis=1)
+        proba /= leaves.shape[1]
+        return proba
+
+    def predict(self, X):
+        """
+        Predict the most probable class of each row.
+
+        Args:
+            X (array-like): Features of shape (n_samples, n_features).
+
+        Returns:
+            np.ndarray: Predicted class labels.
+        """
+        return self.classes_.take(np.argmax(self.predict_proba(X), axis=1))
+
+
+def compile_estimator(estimator):
+    """
+    Compile a fitted estimator (or the best estimator of a fitted search) if it is supported.
+
+    Args:
+        estimator: A fitted estimator or hyperparameter search.
+
+    Returns:
+        CompiledForest: The compiled ensemble, or None if the estimator is not a supported tree ensemble.
+    """
+    estimator = getattr(estimator, "best_estimator_", estimator)
+    if not isinstance(estimator, SUPPORTED_ESTIMATORS):
+        return None
+    try:
+        return CompiledForest.from_estimator(estimator)
+    except ValueError as e:
+        logger.warning(f"Tree ensemble not compiled: {e}")
+        return None
@@ -8,9 +8,51 @@ SELECTED_COLUMNS = [
     "Average Glucose Level",   # Average blood glucose level (numeric)
     "Smoking Status",          # Smoking behavior/status (categorical)
     "Heart Disease",           # Presence of heart disease (binary: 0=No, 1=Yes)
-    "Alcohol Intake",          # Alcohol consumption level (numeric or categorical)
-    "Physical Activity",       # Level of physical activity (categorical or numeric)
+    "Alcohol Intake",          # Alcohol consumption level (ordinal)
+    "Physical Activity",       # Level of physical activity (ordinal)
     "Stress Levels",           # Stress levels on a defined scale (numeric)
-    "Family History of Stroke",# Binary indicator for family history of stroke (0=No, 1=Yes)
-    "Dietary Habits",          # Dietary behavior or pattern (categorical or descriptive)
+    "Family History of Stroke",# Family history of stroke (categorical: No/Yes)
+    "Dietary Habits",          # Dietary pattern (categorical)
 ]
+
+# Columns read from uploaded datasets in addition to the model inputs:
+# the diagnosis used as training target and the stroke history shown in the graphs.
+DATASET_COLUMNS = SELECTED_COLUMNS + ["Diagnosis", "Stroke History"]
+
+# Compact dtypes used when parsing datasets. Columns that are not listed keep the dtype
+# inferred by pandas. Binary flags use the nullable Int8 type so that missing values
+# do not force a float column.
+COLUMN_DTYPES = {
+    "Age": "float32",
+    "Gender": "category",
+    "Hypertension": "Int8",
+    "Average Glucose Level": "float32",
+    "Smoking Status": "category",
+    "Heart Disease": "Int8",
+    "Alcohol Intake": "category",
+    "Physical Activity": "category",
+    "Stress Levels": "float32",
+    "Family History of Stroke": "category",
+    "Dietary Habits": "category",
+    "Diagnosis": "category",
+    "Stroke History": "Int8",
+}
+
+# Fixed vocabularies of the categorical columns. A value is encoded as its position in the
+# list, so it maps to the same code at training and prediction time whatever values a given
+# upload contains. Ordinal columns are listed from lowest to highest level.
+CATEGORY_VOCABULARIES = {
+    "Gender": ["Female", "Male"],
+    "Smoking Status": ["Non-smoker", "Formerly Smoked", "Currently Smokes"],
+    "Alcohol Intake": ["Never", "Rarely", "Social Drinker", "Frequent Drinker"],
+    "Physical Activity": ["Low", "Moderate", "High"],
+    "Family History of Stroke": ["No", "Yes"],
+    "Dietary Habits": ["Gluten-Free", "Keto", "Non-Vegetarian", "Paleo", "Pescatarian", "Vegan", "Vegetarian"],
+    "Diagnosis": ["No Stroke", "Stroke"],
+}
+
+# Categorical columns whose codes follow a meaningful order
+ORDINAL_COLUMNS = ["Smoking Status", "Alcohol Intake", "Physical Activity"]
+
+# Reserved code of values missing from a column's vocabulary
+UNKNOWN_CODE = -1
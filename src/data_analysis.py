@@ -1,7 +1,13 @@
 import logging
 from src.utils import setup_logging
+from src.metrics import timed
+import multiprocessing
 import os
+import time
 import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
@@ -10,6 +16,345 @@ import seaborn as sns
 setup_logging()
 logger = logging.getLogger(__name__)  # Creates a logger instance for this module
 
+# Output profiles: resolution and figure size scale for each use of the graphs
+GRAPH_PROFILES = {
+    "web": {"dpi": 100, "scale": 0.75},     # Fast rendering for the upload page
+    "report": {"dpi": 300, "scale": 1.0},   # High resolution for reports
+}
+
+# Order in which graphs are generated and displayed
+GRAPH_NAMES = [
+    "age_distribution",
+    "hypertension_diagnosis",
+    "glucose_levels",
+    "stress_levels_heatmap",
+    "alcohol_intake",
+    "physical_activity_heatmap",
+]
+
+# Plotted fields of the summary cube and their binning: a number of equal-width bins over
+# the observed range, a list of fixed right-closed bin edges, or None for the distinct values
+SUMMARY_FIELDS = {
+    "Age": 20,
+    "Hypertension": None,
+    "Average Glucose Level": 30,
+    "Stress Levels": [0, 2, 4, 6, 8, 10],
+    "Alcohol Intake": None,
+    "Physical Activity": None,
+}
+
+# Fields whose per-bin sums are kept too (the age histogram is weighted by age)
+SUMMED_FIELDS = {"Age"}
+
+# Process pool shared by all GraphGenerator instances (pyplot is not thread-safe)
+_pool = None
+_pool_workers = None
+_pool_pid = None
+
+
+def _get_pool(max_workers):
+    """
+    Return the shared process pool, creating it on first use.
+
+    Workers are started with 'spawn' so they never inherit the state of a threaded server.
+
+    Args:
+        max_workers (int): Number of worker processes.
+
+    Returns:
+        ProcessPoolExecutor: The shared pool.
+    """
+    global _pool, _pool_workers, _pool_pid
+    if _pool is None or _pool_workers != max_workers or _pool_pid != os.getpid():
+        if _pool is not None and _pool_pid == os.getpid():
+            _pool.shutdown(wait=False)
+        _pool = ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"))
+        _pool_workers = max_workers
+        _pool_pid = os.getpid()  # A pool inherited through fork belongs to the parent process
+    return _pool
+
+
+def use_pool(max_workers, graphs=len(GRAPH_NAMES)):
+    """
+    Whether rendering `graphs` figures in the process pool pays off.
+
+    A single core gains nothing from extra processes, and when fewer graphs than workers are
+    drawn the pool's overhead outweighs the little parallelism left.
+
+    Args:
+        max_workers (int): Configured number of worker processes.
+        graphs (int): Number of graphs to render.
+
+    Returns:
+        bool: False when the graphs should be rendered serially in this process.
+    """
+    return bool(max_workers) and max_workers > 1 and (os.cpu_count() or 1) > 1 and graphs >= max_workers
+
+
+def _warm_up():
+    # Importing this module in the worker already loaded matplotlib and seaborn
+    return os.getpid()
+
+
+def warm_pool(max_workers):
+    """
+    Start the worker processes of the shared pool ahead of the first upload.
+
+    Spawned workers import matplotlib and seaborn, which takes seconds; doing it when a server
+    process starts keeps that cost out of the first upload's latency. The call does not wait
+    for the workers to be ready.
+
+    Args:
+        max_workers (int): Number of worker processes.
+
+    Returns:
+        bool: Whether a pool was started (False when graphs are rendered serially).
+    """
+    if not use_pool(max_workers):
+        return False
+    pool = _get_pool(max_workers)
+    for _ in range(max_workers):  # Every submission to a pool without idle workers spawns one
+        pool.submit(_warm_up)
+    logger.info(f"Started {max_workers} graph rendering processes.")
+    return True
+
+
+def _plot_age_distribution(payload):
+    sns.histplot(
+        x=payload["centers"], bins=list(payload["edges"]), kde=True, weights=payload["all_weights"],
+        alpha=0.5, label='All Patients'
+    )
+    sns.histplot(
+        x=payload["centers"], bins=list(payload["edges"]), kde=True, weights=payload["stroke_weights"],
+        alpha=0.8, label='Stroke Patients', color=sns.color_palette('rocket')[0],
+    )
+    plt.title('Age Distribution: All vs Stroke Patients', fontsize=14)
+    plt.xlabel('Age', fontsize=12)
+    plt.legend(title="Legend")
+
+
+def _plot_hypertension_diagnosis(payload):
+    sns.barplot(x='Hypertension', y='Count', hue='Diagnosis', data=payload["counts"], palette='rocket')
+    plt.title('Hypertension and Stroke Diagnosis', fontsize=14)
+    plt.xlabel('Hypertension (0=No, 1=Yes)', fontsize=12)
+    plt.ylabel('Count', fontsize=12)
+
+
+def _plot_glucose_levels(payload):
+    sns.histplot(
+        x='Average Glucose Level', weights='Count', hue='Diagnosis', data=payload["counts"],
+        bins=list(payload["edges"]), element="step", palette="rocket", alpha=0.4,
+    )
+    plt.title('Impact of Glucose Levels on Stroke Diagnosis', fontsize=18, weight='bold')
+    plt.xlabel('Average Glucose Level', fontsize=14)
+    plt.ylabel('Count', fontsize=14)
+    plt.grid(axis="y", linestyle="--", alpha=0.7)
+
+
+def _plot_stress_levels_heatmap(payload):
+    sns.heatmap(payload["counts"], cmap="rocket", fmt="d", cbar_kws={'label': 'Count'})
+    plt.title("Heatmap: Grouped Stress Levels by Stroke Diagnosis", fontsize=18, weight='bold')
+    plt.xlabel("Grouped Stress Levels", fontsize=14)
+    plt.ylabel("Stroke Diagnosis", fontsize=14)
+
+
+def _plot_alcohol_intake(payload):
+    sns.barplot(
+        x="Alcohol Intake", y="Count", hue="Stroke History", data=payload["counts"],
+        palette="rocket", edgecolor="black",
+    )
+    plt.title("Alcohol Intake vs Stroke History", fontsize=18, weight='bold')
+    plt.xlabel("Alcohol Intake", fontsize=14)
+    plt.ylabel("Count", fontsize=14)
+
+
+def _plot_physical_activity_heatmap(payload):
+    sns.heatmap(
+        payload["counts"], cmap="rocket", annot=True, fmt="d", linewidths=0.5,
+        cbar_kws={'label': 'Number of Patients'}
+    )
+    plt.title("Physical Activity vs Stroke History: Heatmap Analysis (Balanced)", fontsize=18, weight='bold')
+    plt.xlabel("Stroke History", fontsize=14)
+    plt.ylabel("Physical Activity", fontsize=14)
+
+
+# Plotting function and base figure size for each graph
+_PLOTTERS = {
+    "age_distribution": (_plot_age_distribution, (8, 5)),
+    "hypertension_diagnosis": (_plot_hypertension_diagnosis, (8, 5)),
+    "glucose_levels": (_plot_glucose_levels, (12, 8)),
+    "stress_levels_heatmap": (_plot_stress_levels_heatmap, (10, 6)),
+    "alcohol_intake": (_plot_alcohol_intake, (12, 8)),
+    "physical_activity_heatmap": (_plot_physical_activity_heatmap, (12, 8)),
+}
+
+
+def render_graph(name, payload, graph_path, profile):
+    """
+    Draw one graph from its pre-aggregated payload and save it as a PNG file.
+
+    This is a module-level function so it can run in a worker process.
+
+    Args:
+        name (str): Graph name, one of `GRAPH_NAMES`.
+        payload (dict): Aggregated data produced by `GraphGenerator`.
+        graph_path (str): Output file path.
+        profile (dict): Output profile with 'dpi' and 'scale'.
+
+    Returns:
+        str: The filename of the saved graph if successful, otherwise None.
+    """
+    plot, (width, height) = _PLOTTERS[name]
+    try:
+        plt.figure(figsize=(width * profile["scale"], height * profile["scale"]))
+        plot(payload)
+        plt.tight_layout()
+        plt.savefig(graph_path, dpi=profile["dpi"])
+        logger.info(f"Graph saved at: {graph_path}")
+        return os.path.basename(graph_path)
+    except Exception as e:
+        logger.error(f"Error saving graph {name}: {e}")
+        return None
+    finally:
+        plt.close()
+
+
+def _axis_codes(column):
+    """
+    Encode a column as integer codes and their labels; missing values get the code len(labels).
+    """
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        labels = column.cat.categories.tolist()
+        codes = column.cat.codes.to_numpy().astype(np.int64)
+    else:
+        codes, uniques = pd.factorize(column, sort=True)
+        labels = pd.Index(uniques).tolist()
+        codes = codes.astype(np.int64)
+    codes[codes < 0] = len(labels)
+    return codes, labels
+
+
+class SummaryCube:
+    """
+    Compact per-bin counts of every plotted field, by Diagnosis and Stroke History.
+
+    The cube is built in one pass over the dataset and holds O(bins) numbers, so graphs and
+    dashboards are drawn from it without touching the rows again. For each field in
+    `SUMMARY_FIELDS`, `counts` has the shape (bins, len(diagnosis) + 1, len(stroke_history) + 1);
+    the last index of the two label axes counts the rows where that column is missing.
+
+    Attributes:
+        rows (int): Number of rows summarized.
+        diagnosis (list): Diagnosis labels, in code order.
+        stroke_history (list): Stroke History values, in code order.
+        totals (np.ndarray): Rows per Diagnosis and Stroke History code, missing labels last.
+        fields (dict): Per field, its bin `edges` (binned fields) or `values` (distinct values),
+            `counts`, and for `SUMMED_FIELDS` the per-cell `sums` of the field and its `range`.
+    """
+    def __init__(self, rows, diagnosis, stroke_history, totals, fields):
+        self.rows = rows
+        self.diagnosis = diagnosis
+        self.stroke_history = stroke_history
+        self.totals = totals
+        self.fields = fields
+
+    @classmethod
+    @timed("summary")
+    def from_frame(cls, data: pd.DataFrame):
+        """
+        Aggregate a dataset into a summary cube.
+
+        Args:
+            data (pd.DataFrame): Dataset with the `SUMMARY_FIELDS`, 'Diagnosis' and 'Stroke History' columns.
+
+        Returns:
+            SummaryCube: The cube.
+        """
+        diagnosis_codes, diagnosis = _axis_codes(data["Diagnosis"])
+        history_codes, stroke_history = _axis_codes(data["Stroke History"])
+        n_diagnosis, n_history = len(diagnosis) + 1, len(stroke_history) + 1
+        totals = np.bincount(diagnosis_codes * n_history + history_codes,
+                             minlength=n_diagnosis * n_history).reshape(n_diagnosis, n_history)
+        fields = {}
+        for field, binning in SUMMARY_FIELDS.items():
+            summary = {}
+            if binning is None:
+                codes, summary["values"] = _axis_codes(data[field])
+                n_bins = len(summary["values"])
+                values = None
+            else:
+                values = data[field].to_numpy(dtype=float, na_value=np.nan)
+                observed = values[~np.isnan(values)]
+                if isinstance(binning, int):
+                    # Same edges and bin assignment as np.histogram(values, bins=binning)
+                    edges = np.histogram_bin_edges(observed, bins=binning)
+                    codes = np.searchsorted(edges, values, side="right") - 1
+                    codes[values == edges[-1]] = binning - 1
+                    summary["range"] = [float(observed.min()), float(observed.max())] if observed.size else None
+                else:
+                    # Right-closed bins with the lowest edge included, as in pd.cut(include_lowest=True)
+                    edges = np.asarray(binning, dtype=float)
+                    codes = np.searchsorted(edges, values, side="left") - 1
+                    codes[values == edges[0]] = 0
+                n_bins = len(edges) - 1
+                codes[np.isnan(values) | (codes >= n_bins)] = -1
+                summary["edges"] = edges
+            valid = (codes >= 0) & (codes < n_bins)
+            cells = (codes[valid] * n_diagnosis + diagnosis_codes[valid]) * n_history + history_codes[valid]
+            shape = (n_bins, n_diagnosis, n_history)
+            summary["counts"] = np.bincount(cells, minlength=np.prod(shape)).reshape(shape)
+            if field in SUMMED_FIELDS and values is not None:
+                summary["sums"] = np.bincount(cells, weights=values[valid], minlength=np.prod(shape)).reshape(shape)
+            fields[field] = summary
+        return cls(len(data), diagnosis, stroke_history, totals, fields)
+
+    def labels(self, field):
+        """
+        Labels of the bins of a field: its distinct values, or 'low-high' ranges of its edges.
+        """
+        summary = self.fields[field]
+        if "values" in summary:
+            return summary["values"]
+        edges = summary["edges"]
+        return [f"{low:g}-{high:g}" for low, high in zip(edges[:-1], edges[1:])]
+
+    def table(self, field, by):
+        """
+        Counts of a field's bins by 'Diagnosis' or 'Stroke History', without missing labels.
+
+        Args:
+            field (str): A field of `SUMMARY_FIELDS`.
+            by (str): 'Diagnosis' or 'Stroke History'.
+
+        Returns:
+            pd.DataFrame: One row per bin and one column per label.
+        """
+        counts = self.fields[field]["counts"]
+        if by == "Diagnosis":
+            counts, columns = counts.sum(axis=2)[:, :-1], self.diagnosis
+        else:
+            counts, columns = counts.sum(axis=1)[:, :-1], self.stroke_history
+        return pd.DataFrame(counts, index=pd.Index(self.labels(field), name=field), columns=pd.Index(columns, name=by))
+
+    def to_dict(self):
+        """
+        Returns:
+            dict: JSON-serializable description of the cube.
+        """
+        return {
+            "rows": self.rows,
+            "diagnosis": self.diagnosis,
+            "stroke_history": self.stroke_history,
+            "totals": self.totals.tolist(),
+            "fields": {
+                field: {
+                    key: value.tolist() if isinstance(value, np.ndarray) else value
+                    for key, value in summary.items()
+                }
+                for field, summary in self.fields.items()
+            },
+        }
+
 
 class GraphGenerator:
     """
@@ -17,54 +362,142 @@ class GraphGenerator:
 
     Attributes:
         data (pd.DataFrame): The dataset used for generating graphs.
+        summary (SummaryCube): Aggregates of the dataset every graph is drawn from.
         static_folder (str): Directory where generated graphs are stored.
+        profile (dict): Output resolution and figure size scale.
+        max_workers (int): Number of worker processes used to render graphs.
     """
-    def __init__(self, data: pd.DataFrame, static_folder):
+    def __init__(self, data: pd.DataFrame, static_folder, profile="web", max_workers=None, summary=None):
         """
         Initialize the GraphGenerator with dataset and output directory.
 
         Args:
             data (pd.DataFrame): Input data for visualizations.
             static_folder (str): Path to the directory for saving generated graphs.
+            profile (str): Output profile name from `GRAPH_PROFILES` ('web' or 'report').
+            max_workers (int): Worker processes used to render graphs concurrently
+                (None or 1, or a single core, renders them one after another in this process).
+            summary (SummaryCube): Precomputed aggregates of `data` (e.g. cached with the
+                dataset); built from `data` when not given, in which case `data` may be None.
         """
+        if profile not in GRAPH_PROFILES:
+            raise ValueError(f"Unsupported graph profile. Choose one of: {', '.join(GRAPH_PROFILES)}.")
         self.data = data
+        self.summary = summary if summary is not None else SummaryCube.from_frame(data)
         self.static_folder = static_folder
+        self.profile = GRAPH_PROFILES[profile]
+        self.max_workers = max_workers
 
-    def cleanup_graphs(self):
+    def cleanup_graphs(self, keep=None, min_age=0.0):
         """
         Remove previously generated graphs from the static directory.
 
         This ensures that old graphs are deleted before new ones are generated, 
         avoiding clutter in the output directory.
+
+        Args:
+            keep (set): Graph filenames that are still referenced (e.g. by cached uploads)
+                and must not be removed.
+            min_age (float): Only remove graphs older than this many seconds, so graphs that
+                another worker process is still rendering or serving are left alone.
         """
         logger.info("Cleaning up old graphs...")
+        keep = keep or set()
+        cutoff = time.time() - min_age
         for file in os.listdir(self.static_folder):
             try:
-                if file.startswith("graph_") and file.endswith(".png"):
+                if file.startswith("graph_") and file.endswith(".png") and file not in keep \
+                        and os.path.getmtime(os.path.join(self.static_folder, file)) <= cutoff:
                     os.remove(os.path.join(self.static_folder, file))
                     logger.info(f"Removed old graph: {file}")
             except Exception as e:
                 logger.error(f"Error while cleaning graph {file}: {e}")
 
-    def save_graph(self):
+    def _new_graph_path(self):
         """
-        Save the current matplotlib figure as a PNG file in the static directory.
+        Build a unique output path in the static directory.
 
         Returns:
-            str: The filename of the saved graph if successful, otherwise None.
+            str: Path of the new graph file.
         """
         os.makedirs(self.static_folder, exist_ok=True)
-        graph_filename = f'graph_{uuid.uuid4().hex}.png'
-        graph_path = os.path.join(self.static_folder, graph_filename)
-
-        try:
-            plt.savefig(graph_path, dpi=300)  # Saves the plot with high resolution
-            plt.close()
-            logger.info(f"Graph saved at: {graph_path}")
-            return graph_filename
-        except Exception as e:
-            logger.error(f"Error saving graph: {e}")
-            return None
+        return os.path.join(self.static_folder, f'graph_{uuid.uuid4().hex}.png')
+
+    def aggregate_age_distribution(self):
+        """
+        Weighted age histogram for all patients and for stroke patients.
+
+        Each patient is weighted by its age relative to the oldest patient, so a bin's weight
+        is the sum of its ages divided by the maximum age.
+        """
+        age = self.summary.fields["Age"]
+        edges, sums = age["edges"], age["sums"]
+        oldest = age["range"][1] if age["range"] else 1.0
+        history = self.summary.stroke_history
+        stroke_weights = sums[:, :, history.index(1)].sum(axis=1) if 1 in history else np.zeros(len(edges) - 1)
+        return {
+            "edges": edges,
+            "centers": (edges[:-1] + edges[1:]) / 2,
+            "all_weights": sums.sum(axis=(1, 2)) / oldest,
+            "stroke_weights": stroke_weights / oldest,
+        }
+
+    @staticmethod
+    def _long_counts(table):
+        """
+        Turn a count table into (field, label, Count) rows, keeping the observed combinations.
+        """
+        counts = table.stack().rename('Count').reset_index()
+        return counts[counts['Count'] > 0].reset_index(drop=True)
+
+    def aggregate_hypertension_diagnosis(self):
+        """
+        Count patients by hypertension and diagnosis.
+        """
+        return {"counts": self._long_counts(self.summary.table('Hypertension', 'Diagnosis'))}
+
+    def aggregate_glucose_levels(self):
+        """
+        Glucose histogram per diagnosis.
+        """
+        edges = self.summary.fields['Average Glucose Level']["edges"]
+        table = self.summary.table('Average Glucose Level', 'Diagnosis')
+        diagnoses = [label for label, rows in zip(self.summary.diagnosis, self.summary.totals.sum(axis=1)) if rows]
+        centers = (edges[:-1] + edges[1:]) / 2
+        frames = [
+            pd.DataFrame({'Average Glucose Level': centers, 'Count': table[diagnosis].to_numpy(), 'Diagnosis': diagnosis})
+            for diagnosis in diagnoses
+        ]
+        return {"edges": edges, "counts": pd.concat(frames, ignore_index=True)}
+
+    def aggregate_stress_levels_heatmap(self):
+        """
+        Count patients by grouped stress levels and diagnosis.
+        """
+        counts = self.summary.table('Stress Levels', 'Diagnosis').T
+        counts = counts[counts.sum(axis=1) > 0]
+        counts.columns.name = 'Stress Levels Grouped'
+        return {"counts": counts}
+
+    def aggregate_alcohol_intake(self):
+        """
+        Count patients by alcohol intake and stroke history.
+        """
+        return {"counts": self._long_counts(self.summary.table('Alcohol Intake', 'Stroke History'))}
+
+    def aggregate_physical_activity_heatmap(self):
+        """
+        Count patients by physical activity and stroke history.
+        """
+        counts = self.summary.table('Physical Activity', 'Stroke History')
+        return {"counts": counts.loc[counts.sum(axis=1) > 0, counts.sum(axis=0) > 0]}
+
+    def _render(self, name):
+        """
+        Aggregate and render a single graph in this process.
+        """
+        payload = getattr(self, f"aggregate_{name}")()
+        return render_graph(name, payload, self._new_graph_path(), self.profile)
 
     def graph_age_distribution(self):
         """
@@ -73,157 +506,68 @@ class GraphGenerator:
         The histogram distinguishes between patients with and without stroke history.
         """
         logger.info("Generating age distribution graph.")
-        self.data['Age Weight'] = self.data['Age'] / self.data['Age'].max()
-        plt.figure(figsize=(8, 5))
-        sns.histplot(
-            x=self.data['Age'], bins=20, kde=True, weights=self.data['Age Weight'],
-            alpha=0.5, label='All Patients'
-        )
-        sns.histplot(
-            x=self.data[self.data['Stroke History'] == 1]['Age'], 
-            bins=20, 
-            kde=True,
-            weights=self.data[self.data['Stroke History'] == 1]['Age Weight'],
-            alpha=0.8, 
-            label='Stroke Patients', 
-            palette='rocket',
-        )
-        plt.title('Age Distribution: All vs Stroke Patients', fontsize=14)
-        plt.xlabel('Age', fontsize=12)
-        plt.legend(title="Legend")
-        plt.tight_layout()
-        return self.save_graph()
+        return self._render("age_distribution")
 
     def graph_hypertension_diagnosis(self):
         """
         Generate and save a bar chart comparing hypertension presence and stroke diagnosis.
         """
         logger.info("Generating hypertension vs diagnosis graph.")
-        plt.figure(figsize=(8, 5))
-        sns.countplot(
-            x='Hypertension', 
-            hue='Diagnosis', 
-            data=self.data,
-            palette='rocket',
-        )
-        plt.title('Hypertension and Stroke Diagnosis', fontsize=14)
-        plt.xlabel('Hypertension (0=No, 1=Yes)', fontsize=12)
-        plt.ylabel('Count', fontsize=12)
-        plt.tight_layout()
-        return self.save_graph()
+        return self._render("hypertension_diagnosis")
 
     def graph_glucose_levels(self):
         """
-        Generate and save a strip plot showing glucose levels by stroke diagnosis.
+        Generate and save a binned histogram of glucose levels by stroke diagnosis.
         """
         logger.info("Generating glucose levels graph.")
-        plt.figure(figsize=(12, 8))
-        sns.stripplot(
-            x='Diagnosis',
-            y='Average Glucose Level',
-            data=self.data,
-            hue='Diagnosis',
-            jitter=True,
-            size=8,
-            alpha=0.7,
-            edgecolor="black",
-            linewidth=0.6,
-            palette="rocket",
-        )
-        plt.title('Impact of Glucose Levels on Stroke Diagnosis', fontsize=18, weight='bold')
-        plt.xlabel('Stroke Diagnosis', fontsize=14)
-        plt.ylabel('Average Glucose Level', fontsize=14)
-        plt.grid(axis="y", linestyle="--", alpha=0.7)
-        plt.tight_layout()
-        return self.save_graph()
+        return self._render("glucose_levels")
 
     def graph_stress_levels_heatmap(self):
         """
         Generate and save a heatmap showing stress levels grouped by stroke diagnosis.
         """
         logger.info("Generating stress levels heatmap.")
-        bins = [0, 2, 4, 6, 8, 10]
-        labels = ['0-2', '2-4', '4-6', '6-8', '8-10']
-        self.data['Stress Levels Grouped'] = pd.cut(
-            self.data['Stress Levels'], bins=bins, labels=labels, include_lowest=True
-        )
-        heatmap_data = self.data.pivot_table(
-            index='Diagnosis',
-            columns='Stress Levels Grouped',
-            aggfunc='size',
-            fill_value=0,
-            observed=False,
-        )
-        plt.figure(figsize=(10, 6))
-        sns.heatmap(
-            heatmap_data,
-            cmap="rocket",
-            fmt="d",
-            cbar_kws={'label': 'Count'}
-        )
-        plt.title("Heatmap: Grouped Stress Levels by Stroke Diagnosis", fontsize=18, weight='bold')
-        plt.xlabel("Grouped Stress Levels", fontsize=14)
-        plt.ylabel("Stroke Diagnosis", fontsize=14)
-        plt.tight_layout()
-        return self.save_graph()
+        return self._render("stress_levels_heatmap")
 
     def graph_alcohol_intake(self):
         """
-        Generate and save a histogram comparing alcohol intake with stroke history.
+        Generate and save a bar chart comparing alcohol intake with stroke history.
         """
         logger.info("Generating alcohol intake vs stroke history graph.")
-        plt.figure(figsize=(12, 8))
-        sns.histplot(
-            data=self.data,
-            x="Alcohol Intake",
-            hue="Stroke History",
-            multiple="dodge",
-            palette="rocket",
-            shrink=0.8,
-            kde=True,
-            edgecolor="black"
-        )
-        plt.title("Alcohol Intake vs Stroke History", fontsize=18, weight='bold')
-        plt.xlabel("Alcohol Intake", fontsize=14)
-        plt.ylabel("Count/Density", fontsize=14)
-        plt.tight_layout()
-        return self.save_graph()
+        return self._render("alcohol_intake")
 
     def graph_physical_activity_heatmap(self):
         """
         Generate and save a heatmap showing physical activity levels by stroke history.
         """
         logger.info("Generating physical activity vs stroke history heatmap.")
-        heatmap_data_balanced = self.data.groupby(['Physical Activity', 'Stroke History']).size().unstack(fill_value=0)
-        plt.figure(figsize=(12, 8))
-        sns.heatmap(
-            heatmap_data_balanced,
-            cmap="rocket",
-            annot=True,
-            fmt="d",
-            linewidths=0.5,
-            cbar_kws={'label': 'Number of Patients'}
-        )
-        plt.title("Physical Activity vs Stroke History: Heatmap Analysis (Balanced)", fontsize=18, weight='bold')
-        plt.xlabel("Stroke History", fontsize=14)
-        plt.ylabel("Physical Activity", fontsize=14)
-        plt.tight_layout()
-        return self.save_graph()
+        return self._render("physical_activity_heatmap")
 
-    def generate_all_graphs(self):
+    @timed("graphs")
+    def generate_all_graphs(self, keep=None, min_age=0.0):
         """
         Generate all graphs and return a list of filenames for the saved graphs.
 
-        This method orchestrates the generation of multiple graphs for analysis.
+        The payloads are read from the summary cube, and the figures are drawn concurrently in a
+        process pool when `use_pool` allows it for `max_workers`.
+
+        Args:
+            keep (set): Existing graph filenames that cleanup must not remove.
+            min_age (float): Minimum age in seconds of the graphs removed by cleanup.
         """
         logger.info("Starting the generation of all graphs.")
-        self.cleanup_graphs()
-        graphs = [
-            self.graph_age_distribution(),
-            self.graph_hypertension_diagnosis(),
-            self.graph_glucose_levels(),
-            self.graph_stress_levels_heatmap(),
-            self.graph_alcohol_intake(),
-            self.graph_physical_activity_heatmap()
+        self.cleanup_graphs(keep, min_age)
+        tasks = [
+            (name, getattr(self, f"aggregate_{name}")(), self._new_graph_path())
+            for name in GRAPH_NAMES
         ]
-        return graphs
+        if use_pool(self.max_workers, len(tasks)):
+            try:
+                pool = _get_pool(self.max_workers)
+                futures = [pool.submit(render_graph, name, payload, path, self.profile) for name, payload, path in tasks]
+                return [future.result() for future in futures]
+            except BrokenProcessPool as e:
+                global _pool
+                _pool = None
+                logger.error(f"Graph worker pool failed, rendering serially: {e}")
+        return [render_graph(name, payload, path, self.profile) for name, payload, path in tasks]
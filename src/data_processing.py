@@ -1,76 +1,516 @@
+import numpy as np
 import pandas as pd
-from sklearn.preprocessing import StandardScaler, LabelEncoder
+from pandas.api.types import is_numeric_dtype
 from logging import getLogger
+from src.config import CATEGORY_VOCABULARIES, ORDINAL_COLUMNS, UNKNOWN_CODE
+from src.metrics import timed
 
 logger = getLogger(__name__)
 
+
+def category_codes(column: pd.Series, vocabulary: list, unknown_code=UNKNOWN_CODE) -> np.ndarray:
+    """
+    Encode a column as positions in a fixed vocabulary with an O(n) lookup.
+
+    Categorical columns are looked up once per category and then mapped through their
+    integer codes; other columns are hashed once per row. Values are compared as strings.
+
+    Args:
+        column (pd.Series): Values to encode.
+        vocabulary (list): Known values, in code order.
+        unknown_code (int): Code of missing values and values outside the vocabulary.
+
+    Returns:
+        np.ndarray: int8 codes (int32 for vocabularies of more than 127 values).
+    """
+    dtype = np.int8 if len(vocabulary) <= np.iinfo(np.int8).max else np.int32
+    index = pd.Index(vocabulary, dtype=object)
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        # The extra last entry maps the -1 code of missing values
+        lookup = np.append(index.get_indexer(column.cat.categories.astype(str)), -1)
+        lookup[lookup < 0] = unknown_code
+        return lookup.astype(dtype)[column.cat.codes.to_numpy()]
+    codes = index.get_indexer(column.astype(str).to_numpy(dtype=object))
+    codes[(codes < 0) | column.isna().to_numpy()] = unknown_code
+    return codes.astype(dtype)
+
+def _is_missing(value) -> bool:
+    """
+    Whether a raw record value counts as missing, as `pd.isna` does for a column.
+    """
+    return value is None or value is pd.NA or (isinstance(value, float) and value != value)
+
+def _to_number(value, fill: float) -> float:
+    """
+    Read a raw numeric field as `pd.to_numeric(errors="coerce")` would, imputing invalid values.
+    """
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return fill
+    return fill if number != number else number
+
 class DataProcessor:
     def __init__(self, data: pd.DataFrame):
         """
         Initializes the DataProcessor with the provided DataFrame.
-        :param data: DataFrame to be processed.
+        :param data: DataFrame to be processed. It is never modified, so no copy is made.
         """
-        self.data = data.copy()  # Creates a copy to avoid altering the original DataFrame
+        self.data = data
 
-    def handle_missing_values(self):
+    @staticmethod
+    def _category_codes(column: pd.Series) -> np.ndarray:
+        """
+        Encodes a categorical column into integer codes.
+        Columns with a vocabulary in `CATEGORY_VOCABULARIES` use it, so codes do not depend on the
+        values present in the data; values outside it get `UNKNOWN_CODE`. Other columns are coded by
+        their sorted distinct values (as LabelEncoder).
+        :param column: The column to encode.
+        :return: Integer codes (missing values get a negative code).
+        """
+        if column.name in CATEGORY_VOCABULARIES:
+            return category_codes(column, CATEGORY_VOCABULARIES[column.name])
+        codes, _ = pd.factorize(column, sort=True)
+        return codes.astype(np.int8) if codes.max(initial=0) <= np.iinfo(np.int8).max else codes
+
+    @timed("preprocess")
+    def process(self, target_column):
         """
-        Handles missing values in the DataFrame.
-        - Numeric columns: Missing values are replaced with the column mean.
-        - Categorical columns: Missing values are replaced with the column mode.
+        Executes the complete data preprocessing pipeline in a single pass over one NumPy block:
+        - Handles missing values: mean for numeric columns, mode for categorical columns.
+        - Encodes categorical variables into their vocabulary codes.
+        - Scales the features to mean 0 and standard deviation 1 (the target is not scaled).
+        Every feature is written once into a float64 block that is imputed and scaled in place,
+        so the peak memory stays close to the size of the result.
+        :param target_column: The name of the target column to exclude from scaling.
+        :return: The processed DataFrame.
         """
-        logger.info("Handling missing values...")
-        
-        # Handle missing values in numeric columns by replacing with the mean
-        numeric_columns = self.data.select_dtypes(include=["float64", "int64"]).columns
-        for col in numeric_columns:
-            if self.data[col].isnull().any():  # Check if there are missing values
-                self.data[col].fillna(self.data[col].mean(), inplace=True)
-                logger.info(f"Filled missing values with the mean in numeric column: {col}")
+        logger.info("Starting data preprocessing pipeline...")
+        features = [col for col in self.data.columns if col != target_column]
+        numeric = np.array(
+            [is_numeric_dtype(self.data[col]) and col not in CATEGORY_VOCABULARIES for col in features], dtype=bool
+        )
+        block = np.empty((len(self.data), len(features)), dtype=np.float64)
+
+        # Numeric columns are copied as one group, categorical columns are coded one by one
+        numeric_columns = [col for col, is_numeric in zip(features, numeric) if is_numeric]
+        if numeric_columns:
+            block[:, numeric] = self.data[numeric_columns].to_numpy(dtype=np.float64, na_value=np.nan)
+        for position in np.flatnonzero(~numeric):
+            column = self.data[features[position]]
+            codes = self._category_codes(column)
+            missing = column.isna().to_numpy()
+            if missing.any():
+                # Mode imputation; argmax picks the smallest code on ties, like `Series.mode()[0]`
+                known = codes[~missing & (codes >= 0)]
+                codes[missing] = np.bincount(known).argmax() if len(known) else 0
+                logger.info(f"Filled missing values with the mode in categorical column: {features[position]}")
+            block[:, position] = codes
+
+        # Masked mean imputation of the numeric group (columns without any value are filled with 0)
+        missing = np.isnan(block)
+        for position in np.flatnonzero(missing.any(axis=0)):
+            column_missing = missing[:, position]
+            observed = block[~column_missing, position]
+            block[column_missing, position] = observed.mean() if len(observed) else 0.0
+            logger.info(f"Filled missing values with the mean in numeric column: {features[position]}")
+        del missing
+
+        # In-place standardization, with constant columns left unscaled as in StandardScaler
+        block -= block.mean(axis=0) if len(block) else 0.0
+        scale = np.sqrt(np.einsum("ij,ij->j", block, block) / max(len(block), 1))
+        scale[scale == 0] = 1.0
+        block /= scale
+
+        result = pd.DataFrame(block, columns=features, index=self.data.index, copy=False)
+        if target_column in self.data.columns:
+            target = self.data[target_column]
+            if is_numeric_dtype(target) and target_column not in CATEGORY_VOCABULARIES:
+                target = target.fillna(target.mean())
+            else:
+                codes = self._category_codes(target)
+                codes[codes < 0] = np.bincount(codes[codes >= 0]).argmax() if (codes >= 0).any() else 0
+                target = codes
+            result.insert(self.data.columns.get_loc(target_column), target_column, target)
+        self.data = result
+        logger.info("Data preprocessing completed.")
+        return self.data  # Return the fully processed DataFrame
+
+
+class PreprocessingPipeline:
+    """
+    Fit/transform preprocessing pipeline learned once on the training data.
 
-        # Handle missing values in categorical columns by replacing with the mode
-        categorical_columns = self.data.select_dtypes(include=["object", "category"]).columns
-        for col in categorical_columns:
-            if self.data[col].isnull().any():  # Check if there are missing values
-                self.data[col].fillna(self.data[col].mode()[0], inplace=True)
-                logger.info(f"Filled missing values with the mode in categorical column: {col}")
+    The pipeline learns the imputation values (mean for numeric columns, mode for
+    categorical columns), the category vocabularies and the scaling statistics in
+    `fit` (or chunk by chunk with `partial_fit` and `finalize`), and afterwards
+    `transform` applies them without refitting anything. It is saved together with
+    the trained model so predictions use the exact same encoding.
 
-    def encode_categorical_variables(self):
+    Columns listed in `CATEGORY_VOCABULARIES` use that fixed vocabulary (in its ordinal
+    order where relevant); other categorical columns use the sorted values seen during
+    fit. Values outside the vocabulary get `unknown_code`, and the output is a float32
+    block.
+
+    Attributes:
+        target_column (str): Name of the target column, excluded from the features.
+        scale_categorical (bool): Whether category codes are scaled like numeric features.
+        feature_columns (list): Ordered feature columns seen during fit.
+        numeric_columns (list): Feature columns treated as numeric.
+        categorical_columns (list): Feature columns treated as categorical.
+        fill_values (dict): Imputation value for each feature column.
+        ordinal_columns (list): Categorical feature columns whose codes are ordered.
+        vocabularies (dict): Category vocabulary, in code order, for each categorical column.
+        target_vocabulary (list): Vocabulary of the target column, if categorical.
+        unknown_code (int): Code of categories outside the vocabulary.
+        mean_ (np.ndarray): Per-feature mean of the encoded features.
+        scale_ (np.ndarray): Per-feature standard deviation of the encoded features.
+        n_rows_ (int): Number of rows accumulated by `partial_fit`.
+    """
+    def __init__(self, target_column=None, scale_categorical=True):
         """
-        Encodes categorical variables into numeric values using Label Encoding.
+        Initialize an unfitted pipeline.
+
+        Args:
+            target_column (str): The name of the target column to exclude from the features.
+            scale_categorical (bool): Scale the category codes like numeric features. Disable it
+                for estimators with native categorical support, which expect the raw codes.
         """
-        logger.info("Encoding categorical variables...")
-        label_encoder = LabelEncoder()
-        for column in self.data.select_dtypes(include=["object", "category"]).columns:
-            # Transforms categorical data into numeric format
-            self.data[column] = label_encoder.fit_transform(self.data[column])
-            logger.info(f"Encoded categorical variable: {column}")
+        self.target_column = target_column
+        self.scale_categorical = scale_categorical
+        self.feature_columns = []
+        self.numeric_columns = []
+        self.categorical_columns = []
+        self.ordinal_columns = []
+        self.fill_values = {}
+        self.vocabularies = {}
+        self.target_vocabulary = None
+        self.unknown_code = UNKNOWN_CODE
+        self.mean_ = None
+        self.scale_ = None
+        self.reset()
+
+    @property
+    def is_fitted(self):
+        """bool: Whether `fit` has been called."""
+        return self.mean_ is not None
 
-    def scale_features(self, target_column):
+    @timed("preprocess_fit")
+    def fit(self, data: pd.DataFrame):
         """
-        Normalizes numeric features to have mean 0 and standard deviation 1.
-        :param target_column: The name of the target column to exclude from scaling.
+        Learn imputation values, category vocabularies and scaling statistics.
+
+        Args:
+            data (pd.DataFrame): Training data, optionally including the target column.
+
+        Returns:
+            PreprocessingPipeline: The fitted pipeline (self).
         """
-        logger.info("Normalizing numeric features...")
-        scaler = StandardScaler()
-        # Select numeric columns, excluding the target column
-        numeric_columns = self.data.select_dtypes(include=["float64", "int64"]).columns
-        numeric_columns = numeric_columns.drop(target_column, errors="ignore")  # Exclude target column if it exists
-        # Apply scaling to the selected numeric columns
-        self.data[numeric_columns] = scaler.fit_transform(self.data[numeric_columns])
-        logger.info("Normalization completed for numeric features.")
+        logger.info("Fitting preprocessing pipeline...")
+        self.reset()
+        self.partial_fit(data)
+        return self.finalize()
 
-    def process(self, target_column):
+    def reset(self):
         """
-        Executes the complete data preprocessing pipeline:
-        - Handles missing values.
-        - Encodes categorical variables.
-        - Scales numeric features.
-        :param target_column: The name of the target column to exclude from scaling.
-        :return: The processed DataFrame.
+        Forget the statistics accumulated by `partial_fit`.
         """
-        logger.info("Starting data preprocessing pipeline...")
-        self.handle_missing_values()  # Step 1: Handle missing values
-        self.encode_categorical_variables()  # Step 2: Encode categorical variables
-        self.scale_features(target_column)  # Step 3: Normalize numeric features
-        logger.info("Data preprocessing completed.")
-        return self.data  # Return the fully processed DataFrame
+        self.feature_columns = []
+        self.n_rows_ = 0
+        self._numeric_stats = {}
+        self._category_counts = {}
+        self._target_categories = None
+
+    def partial_fit(self, chunk: pd.DataFrame):
+        """
+        Accumulate the statistics of one chunk of training data.
+
+        Running counts, means and sums of squared deviations are kept for numeric columns
+        and value counts for categorical columns, so a dataset can be fitted one chunk at
+        a time without holding it in memory. Call `finalize` after the last chunk.
+
+        Args:
+            chunk (pd.DataFrame): A chunk of training data, optionally including the target column.
+
+        Returns:
+            PreprocessingPipeline: The pipeline (self).
+
+        Raises:
+            ValueError: If the chunk lacks feature columns seen in earlier chunks, or its target
+                has values outside a fixed target vocabulary.
+        """
+        features = chunk.drop(columns=[self.target_column], errors="ignore")
+        if not getattr(self, "n_rows_", 0):
+            self.reset()
+            self.feature_columns = list(features.columns)
+            self.numeric_columns = [
+                col for col in self.feature_columns
+                if is_numeric_dtype(features[col]) and col not in CATEGORY_VOCABULARIES
+            ]
+            self.categorical_columns = [col for col in self.feature_columns if col not in self.numeric_columns]
+            self.ordinal_columns = [col for col in self.categorical_columns if col in ORDINAL_COLUMNS]
+            self._numeric_stats = {col: (0, 0.0, 0.0) for col in self.numeric_columns}
+            self._category_counts = {col: {} for col in self.categorical_columns}
+        missing = [col for col in self.feature_columns if col not in features.columns]
+        if missing:
+            raise ValueError(f"Missing required columns: {missing}")
+
+        if self.numeric_columns:
+            # Count, mean and squared deviations of every numeric column from one NumPy block
+            block = self._numeric_block(features)
+            observed = ~np.isnan(block)
+            chunk_counts = observed.sum(axis=0)
+            np.copyto(block, 0.0, where=~observed)
+            chunk_means = block.sum(axis=0) / np.maximum(chunk_counts, 1)
+            block -= chunk_means
+            np.copyto(block, 0.0, where=~observed)
+            chunk_m2s = np.einsum("ij,ij->j", block, block)
+            del block, observed
+            for col, n, chunk_mean, chunk_m2 in zip(self.numeric_columns, chunk_counts, chunk_means, chunk_m2s):
+                if not n:
+                    continue
+                # Merge the chunk's count, mean and squared deviations into the running totals
+                count, mean, m2 = self._numeric_stats[col]
+                total = count + n
+                delta = chunk_mean - mean
+                self._numeric_stats[col] = (
+                    int(total),
+                    float(mean + delta * n / total),
+                    float(m2 + chunk_m2 + delta ** 2 * count * n / total),
+                )
+        for col in self.categorical_columns:
+            counts = self._category_counts[col]
+            # Counting the raw values first only converts the distinct values to strings
+            for value, count in features[col].value_counts().items():
+                if count:
+                    counts[str(value)] = counts.get(str(value), 0) + int(count)
+
+        target = chunk[self.target_column] if self.target_column in chunk.columns else None
+        if target is not None and (not is_numeric_dtype(target) or self.target_column in CATEGORY_VOCABULARIES):
+            labels = {str(value) for value, count in target.value_counts().items() if count}
+            unknown = labels - set(CATEGORY_VOCABULARIES.get(self.target_column, labels))
+            if unknown:
+                raise ValueError(f"Unknown values in target column {self.target_column}: {sorted(unknown)}")
+            self._target_categories = (self._target_categories or set()) | labels
+        self.n_rows_ += len(chunk)
+        return self
+
+    def finalize(self):
+        """
+        Derive imputation values, vocabularies and scaling statistics from the accumulated chunks.
+
+        Scaling statistics describe the encoded features after imputation: missing numeric
+        values are filled with the mean (adding no deviation), missing categories with the
+        mode code and categories outside a fixed vocabulary count as `unknown_code`.
+
+        Returns:
+            PreprocessingPipeline: The fitted pipeline (self).
+        """
+        n_rows = max(self.n_rows_, 1)
+        self.fill_values = {}
+        self.vocabularies = {}
+        mean = np.zeros(len(self.feature_columns))
+        variance = np.zeros(len(self.feature_columns))
+        for position, col in enumerate(self.feature_columns):
+            if col in self._numeric_stats:
+                count, column_mean, m2 = self._numeric_stats[col]
+                self.fill_values[col] = float(column_mean) if count else 0.0
+                mean[position] = self.fill_values[col]
+                variance[position] = m2 / n_rows
+            else:
+                counts = self._category_counts[col]
+                vocabulary = list(CATEGORY_VOCABULARIES.get(col, sorted(counts)))
+                self.vocabularies[col] = vocabulary
+                code_counts = np.array([counts.get(value, 0) for value in vocabulary], dtype=np.float64)
+                unknown_count = sum(counts.values()) - code_counts.sum()
+                # Most frequent category, ties broken by vocabulary order as in `Series.mode`
+                fill_code = int(np.argmax(code_counts)) if vocabulary else 0
+                self.fill_values[col] = vocabulary[fill_code] if vocabulary else ""
+                if vocabulary:
+                    code_counts[fill_code] += self.n_rows_ - code_counts.sum() - unknown_count
+                if not self.scale_categorical:
+                    continue  # Zero mean and zero variance leave the codes unchanged
+                codes = np.append(np.arange(len(vocabulary), dtype=np.float64), self.unknown_code)
+                code_counts = np.append(code_counts, unknown_count)
+                mean[position] = (codes * code_counts).sum() / n_rows
+                variance[position] = (code_counts * (codes - mean[position]) ** 2).sum() / n_rows
+
+        if self._target_categories is not None:
+            self.target_vocabulary = list(
+                CATEGORY_VOCABULARIES.get(self.target_column, sorted(self._target_categories))
+            )
+
+        self._record_encoders_ = None  # Rebuilt from the new vocabularies on first use
+        self.mean_ = mean
+        self.scale_ = np.sqrt(variance)
+        self.scale_[self.scale_ == 0] = 1.0  # Constant columns are left unscaled, as in StandardScaler
+        logger.info(
+            f"Preprocessing pipeline fitted on {self.n_rows_} rows and {len(self.feature_columns)} features."
+        )
+        return self
+
+    @timed("preprocess_transform")
+    def transform(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Apply the learned preprocessing without refitting.
+
+        Missing categories are imputed with the learned mode of their column, and categories
+        outside the vocabulary are encoded as `unknown_code`.
+
+        Args:
+            data (pd.DataFrame): Data containing at least the fitted feature columns.
+
+        Returns:
+            pd.DataFrame: Scaled float32 features, plus the int8 target codes if the target
+            column is present in `data`.
+        """
+        if not self.is_fitted:
+            raise ValueError("Preprocessing pipeline is not fitted. Call 'fit' first.")
+        missing = [col for col in self.feature_columns if col not in data.columns]
+        if missing:
+            raise ValueError(f"Missing required columns: {missing}")
+
+        block = self._encode(data)
+        block -= self.mean_
+        block /= self.scale_
+        result = pd.DataFrame(block, columns=self.feature_columns, index=data.index, copy=False)
+
+        if self.target_column in data.columns:
+            target = data[self.target_column]
+            if self.target_vocabulary is not None:
+                target = category_codes(target, self.target_vocabulary, unknown_code=-1)
+            result[self.target_column] = target
+        return result
+
+    def fit_transform(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Fit the pipeline and transform the same data.
+
+        Args:
+            data (pd.DataFrame): Training data.
+
+        Returns:
+            pd.DataFrame: The processed DataFrame.
+        """
+        return self.fit(data).transform(data)
+
+    def encode_record(self, record: dict) -> tuple:
+        """
+        Encode one raw record as `_encode` would, without building a DataFrame.
+
+        Numeric fields must already be numbers and categorical fields are coded through their
+        vocabulary. Other values (e.g. numeric strings) are kept as they are, so two records
+        with the same encoding are always transformed identically.
+
+        Args:
+            record (dict): Raw field values, by feature column.
+
+        Returns:
+            tuple: Imputed numbers and category codes in `feature_columns` order, usable as a
+            cache key of the record.
+        """
+        if not self.is_fitted:
+            raise ValueError("Preprocessing pipeline is not fitted. Call 'fit' first.")
+        encoded = []
+        for col, codes, fill, unknown in self._record_encoders():
+            value = record.get(col)
+            if _is_missing(value):
+                encoded.append(fill)
+            elif codes is not None:
+                encoded.append(codes.get(str(value), unknown))
+            elif isinstance(value, (int, float)) and not isinstance(value, bool):
+                encoded.append(float(value))
+            else:
+                encoded.append((type(value).__name__, str(value)))
+        return tuple(encoded)
+
+    def transform_records(self, records: list) -> pd.DataFrame:
+        """
+        Apply the learned preprocessing to a few raw records without refitting.
+
+        The fast path of single-row predictions: every field is imputed or encoded with a dict
+        lookup into maps precomputed from the vocabularies, instead of building a DataFrame of
+        the records and encoding it column by column. The features are identical to those of
+        `transform` on the same records.
+
+        Args:
+            records (list): Dicts of raw field values, by feature column.
+
+        Returns:
+            pd.DataFrame: Scaled float32 features, one row per record.
+        """
+        if not self.is_fitted:
+            raise ValueError("Preprocessing pipeline is not fitted. Call 'fit' first.")
+        encoders = self._record_encoders()
+        block = np.empty((len(records), len(encoders)), dtype=np.float32)
+        for row, record in enumerate(records):
+            for position, (col, codes, fill, unknown) in enumerate(encoders):
+                value = record.get(col)
+                if _is_missing(value):
+                    block[row, position] = fill
+                elif codes is not None:
+                    block[row, position] = codes.get(str(value), unknown)
+                else:
+                    block[row, position] = _to_number(value, fill)
+        block -= self.mean_
+        block /= self.scale_
+        return pd.DataFrame(block, columns=self.feature_columns, copy=False)
+
+    def _record_encoders(self):
+        """
+        Per feature column: its name, a value-to-code dict (None for numeric columns), the
+        value of missing fields and the code of values outside the vocabulary.
+        """
+        encoders = getattr(self, "_record_encoders_", None)
+        if encoders is None:
+            # Pipelines saved before fixed vocabularies existed impute unknown categories with the mode
+            unknown_code = getattr(self, "unknown_code", None)
+            encoders = []
+            for col in self.feature_columns:
+                vocabulary = self.vocabularies.get(col)
+                if vocabulary is None:
+                    encoders.append((col, None, float(self.fill_values[col]), None))
+                    continue
+                fill_code = vocabulary.index(self.fill_values[col]) if vocabulary else 0
+                codes = {value: code for code, value in enumerate(vocabulary)}
+                encoders.append((col, codes, fill_code, fill_code if unknown_code is None else unknown_code))
+            self._record_encoders_ = encoders
+        return encoders
+
+    def _encode(self, data: pd.DataFrame) -> np.ndarray:
+        """
+        Impute missing values and encode categories into a numeric feature block.
+
+        Args:
+            data (pd.DataFrame): Data containing the fitted feature columns.
+
+        Returns:
+            np.ndarray: float32 array of shape (n_rows, n_features) in `feature_columns` order.
+        """
+        block = np.empty((len(data), len(self.feature_columns)), dtype=np.float32)
+        # Pipelines saved before fixed vocabularies existed impute unknown categories with the mode
+        unknown_code = getattr(self, "unknown_code", None)
+        numeric = np.array([col not in self.vocabularies for col in self.feature_columns], dtype=bool)
+        if numeric.any():
+            values = self._numeric_block(data)
+            fill = np.array([self.fill_values[col] for col in self.numeric_columns], dtype=np.float64)
+            np.copyto(values, np.broadcast_to(fill, values.shape), where=np.isnan(values))
+            block[:, numeric] = values
+            del values
+        for position in np.flatnonzero(~numeric):
+            col = self.feature_columns[position]
+            vocabulary = self.vocabularies[col]
+            fill_code = vocabulary.index(self.fill_values[col]) if vocabulary else 0
+            codes = category_codes(data[col], vocabulary, fill_code if unknown_code is None else unknown_code)
+            codes[data[col].isna().to_numpy()] = fill_code
+            block[:, position] = codes
+        return block
+
+    def _numeric_block(self, data: pd.DataFrame) -> np.ndarray:
+        """
+        Read the numeric feature columns into one float64 block, with NaN for missing or invalid values.
+        """
+        columns = data[self.numeric_columns]
+        if not all(is_numeric_dtype(dtype) for dtype in columns.dtypes):
+            columns = columns.apply(pd.to_numeric, errors="coerce")  # e.g. strings from JSON records
+        return columns.to_numpy(dtype=np.float64, na_value=np.nan)
@@ -0,0 +1,230 @@
+import hashlib
+import json
+import os
+import shutil
+import sys
+import threading
+import uuid
+from collections import OrderedDict
+from logging import getLogger
+import numpy as np
+import pandas as pd
+from joblib import dump, load
+from src.dataset_store import DatasetStore
+
+# Initialize a logger for this module
+logger = getLogger(__name__)
+
+# Source files whose content changes invalidate every cached entry
+_VERSIONED_SOURCES = ["config.py", "utils.py", "data_processing.py", "data_analysis.py"]
+
+
+def code_version(*extra):
+    """
+    Hash the source of the data pipeline modules together with extra configuration values.
+
+    Args:
+        *extra: Additional JSON-serializable values that affect cached results (e.g. settings).
+
+    Returns:
+        str: A short hexadecimal version tag.
+    """
+    digest = hashlib.sha256()
+    source_folder = os.path.dirname(os.path.abspath(__file__))
+    for name in _VERSIONED_SOURCES:
+        with open(os.path.join(source_folder, name), "rb") as f:
+            digest.update(f.read())
+    digest.update(json.dumps(extra, sort_keys=True, default=str).encode())
+    return digest.hexdigest()[:8]
+
+
+def _estimate_size(obj):
+    """
+    Estimate the in-memory size of a cached object in bytes.
+    """
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(deep=True).sum())
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes
+    if isinstance(obj, (list, tuple)):
+        return sum(_estimate_size(item) for item in obj)
+    return sys.getsizeof(obj)
+
+
+class DatasetCache:
+    """
+    Content-addressed cache for uploaded datasets and the results derived from them.
+
+    Entries are keyed by the dataset id (the SHA-256 hash of the uploaded file) plus a
+    code/config version, so uploading the same CSV twice reuses the parsed frame, the
+    preprocessing result and the rendered graph filenames, while a deploy only invalidates
+    the derived results and never the dataset ids themselves. Each entry is a directory of named artifacts on disk,
+    and recently used artifacts are also kept in memory. Both layers evict the least
+    recently used entries once their byte budget is exceeded.
+
+    Attributes:
+        cache_folder (str): Directory holding one sub-directory per entry.
+        memory_budget (int): Maximum bytes of artifacts kept in memory.
+        disk_budget (int): Maximum bytes of artifacts kept on disk.
+        version (str): Code/config version appended to every entry key.
+    """
+    def __init__(self, cache_folder, memory_budget=512 * 1024 ** 2, disk_budget=2 * 1024 ** 3, version=None):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_folder (str): Directory holding one sub-directory per entry.
+            memory_budget (int): Maximum bytes of artifacts kept in memory.
+            disk_budget (int): Maximum bytes of artifacts kept on disk.
+            version (str): Code/config version appended to every entry key (defaults to `code_version()`).
+        """
+        self.cache_folder = cache_folder
+        self.memory_budget = memory_budget
+        self.disk_budget = disk_budget
+        self.version = version or code_version()
+        self._memory = OrderedDict()  # (key, name) -> (object, size), least recently used first
+        self._memory_size = 0
+        self._lock = threading.Lock()
+        os.makedirs(cache_folder, exist_ok=True)
+
+    def entry_key(self, dataset_id):
+        """
+        Name of the entry holding the results derived from a dataset by the current code version.
+
+        Args:
+            dataset_id (str): Dataset id (see `DatasetStore.id_for_file`).
+
+        Returns:
+            str: The dataset id combined with the cache version, or None if the id is malformed.
+        """
+        if not DatasetStore.is_valid_id(dataset_id):
+            return None
+        return f"{dataset_id}-{self.version}"
+
+    def get(self, dataset_id, name):
+        """
+        Look up an artifact derived from a dataset, in memory first and then on disk.
+
+        Args:
+            dataset_id (str): Dataset id.
+            name (str): Artifact name (e.g. 'frame', 'graphs', 'preprocessed').
+
+        Returns:
+            The cached object, or None on a miss.
+        """
+        key = self.entry_key(dataset_id)
+        if key is None:
+            return None
+        with self._lock:
+            if (key, name) in self._memory:
+                self._memory.move_to_end((key, name))
+                self._touch(key)
+                return self._memory[(key, name)][0]
+
+        path = self._artifact_path(key, name)
+        if not os.path.exists(path):
+            return None
+        try:
+            obj = load(path)
+        except Exception as e:
+            logger.error(f"Error reading cache artifact {path}: {e}")
+            return None
+        with self._lock:
+            self._remember(key, name, obj)
+            self._touch(key)
+        return obj
+
+    def put(self, dataset_id, name, obj):
+        """
+        Store an artifact derived from a dataset on disk and in memory.
+
+        Args:
+            dataset_id (str): Dataset id.
+            name (str): Artifact name.
+            obj: Picklable object to cache.
+
+        Raises:
+            ValueError: If the dataset id is malformed.
+        """
+        key = self.entry_key(dataset_id)
+        if key is None:
+            raise ValueError(f"Invalid dataset id: {dataset_id}")
+        entry_folder = os.path.join(self.cache_folder, key)
+        os.makedirs(entry_folder, exist_ok=True)
+        path = self._artifact_path(key, name)
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        dump(obj, tmp_path)
+        os.replace(tmp_path, path)  # Concurrent readers never see a partial artifact
+        with self._lock:
+            self._remember(key, name, obj)
+            self._touch(key)
+            self._evict_disk()
+
+    def referenced_graphs(self):
+        """
+        Collect the graph filenames referenced by any cached entry.
+
+        Returns:
+            set: Filenames that `GraphGenerator.cleanup_graphs` must keep.
+        """
+        graphs = set()
+        for key in os.listdir(self.cache_folder):
+            path = self._artifact_path(key, "graphs")
+            if not os.path.exists(path):
+                continue
+            try:
+                cached = load(path)
+            except Exception as e:
+                logger.error(f"Error reading cache artifact {path}: {e}")
+                continue
+            graphs.update(graph for graph in cached or [] if graph)
+        return graphs
+
+    def _artifact_path(self, key, name):
+        return os.path.join(self.cache_folder, key, f"{name}.joblib")
+
+    def _touch(self, key):
+        """
+        Mark an entry as recently used for disk eviction.
+        """
+        try:
+            os.utime(os.path.join(self.cache_folder, key))
+        except FileNotFoundError:
+            pass
+
+    def _remember(self, key, name, obj):
+        """
+        Keep an artifact in memory and evict the least recently used ones beyond the budget.
+        """
+        size = _estimate_size(obj)
+        if (key, name) in self._memory:
+            self._memory_size -= self._memory.pop((key, name))[1]
+        if size > self.memory_budget:
+            return
+        self._memory[(key, name)] = (obj, size)
+        self._memory_size += size
+        while self._memory_size > self.memory_budget:
+            _, (_, evicted_size) = self._memory.popitem(last=False)
+            self._memory_size -= evicted_size
+
+    def _evict_disk(self):
+        """
+        Delete the least recently used entries until the disk usage fits the budget.
+        """
+        entries = []
+        total = 0
+        for key in os.listdir(self.cache_folder):
+            entry_folder = os.path.join(self.cache_folder, key)
+            if not os.path.isdir(entry_folder):
+                continue
+            size = sum(entry.stat().st_size for entry in os.scandir(entry_folder) if entry.is_file())
+            entries.append((os.stat(entry_folder).st_mtime, key, size))
+            total += size
+        for _, key, size in sorted(entries):
+            if total <= self.disk_budget:
+                break
+            shutil.rmtree(os.path.join(self.cache_folder, key), ignore_errors=True)
+            for cached_key in [cached for cached in self._memory if cached[0] == key]:
+                self._memory_size -= self._memory.pop(cached_key)[1]
+            total -= size
+            logger.info(f"Evicted cache entry: {key}")
@@ -0,0 +1,203 @@
+import csv
+import hashlib
+import json
+import os
+import re
+import shutil
+import uuid
+from logging import getLogger
+import pandas as pd
+
+# Initialize a logger for this module
+logger = getLogger(__name__)
+
+# Dataset ids are the first 32 hex digits of a content hash; ids issued before they became
+# independent of the code version carry an 8-digit version suffix and remain valid
+DATASET_ID_PATTERN = re.compile(r"[0-9a-f]{32}(?:-[0-9a-f]{8})?")
+
+
+class DatasetStore:
+    """
+    Uploaded datasets on disk, with their row counts and append lineage.
+
+    Each dataset is stored as `<dataset_id>.csv` in the upload folder next to `<dataset_id>.json`,
+    which records its number of rows and, for a dataset created by appending rows to another
+    one, the parent dataset and its row count. An appended file starts with every row of its
+    parent, so the rows added since any ancestor are the tail of the file.
+
+    Dataset ids only depend on the uploaded content (and the parent of appended rows), never
+    on the code version, so stored datasets and their lineage survive deploys. Results derived
+    from a dataset are versioned separately by `DatasetCache`.
+
+    Attributes:
+        upload_folder (str): Directory holding the datasets, shared by worker processes.
+    """
+    def __init__(self, upload_folder):
+        """
+        Initialize the store.
+
+        Args:
+            upload_folder (str): Directory holding the datasets.
+        """
+        self.upload_folder = upload_folder
+        os.makedirs(upload_folder, exist_ok=True)
+
+    @staticmethod
+    def id_for_file(file_path, parent=None):
+        """
+        Compute the dataset id of a file from its content.
+
+        Args:
+            file_path (str): Path of the uploaded file.
+            parent (str): Dataset the file's rows are appended to, if any; the same rows
+                appended to the same dataset always give the same id.
+
+        Returns:
+            str: The dataset id.
+        """
+        digest = hashlib.sha256()
+        if parent:
+            digest.update(f"append:{parent}\n".encode())
+        with open(file_path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+        return DatasetStore.id_for_digest(digest.hexdigest())
+
+    @staticmethod
+    def id_for_digest(hexdigest):
+        """
+        Compute the dataset id of content whose SHA-256 hex digest is already known (e.g.
+        hashed while it was uploaded); equal to `id_for_file` of that content.
+        """
+        return hexdigest[:32]
+
+    @staticmethod
+    def is_valid_id(dataset_id):
+        """
+        Check that a client-supplied dataset id is well formed and therefore safe to use in a path.
+        """
+        return bool(DATASET_ID_PATTERN.fullmatch(dataset_id or ""))
+
+    def csv_path(self, dataset_id):
+        """
+        Path of the CSV file of a dataset.
+        """
+        return os.path.join(self.upload_folder, f"{dataset_id}.csv")
+
+    def exists(self, dataset_id):
+        return self.is_valid_id(dataset_id) and os.path.exists(self.csv_path(dataset_id))
+
+    def info(self, dataset_id):
+        """
+        Describe a stored dataset.
+
+        Returns:
+            dict: Its `rows`, `parent` and `parent_rows`, or None for datasets uploaded before
+            row counts were recorded.
+        """
+        try:
+            with open(self._info_path(dataset_id)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def save(self, tmp_path, dataset_id):
+        """
+        Move an uploaded file into the store under its dataset id.
+
+        Returns:
+            str: Path of the stored CSV file.
+        """
+        path = self.csv_path(dataset_id)
+        os.replace(tmp_path, path)
+        return path
+
+    def record(self, dataset_id, rows, parent=None, parent_rows=None):
+        """
+        Write the description of a dataset, unless one already exists.
+
+        Args:
+            dataset_id (str): The dataset id.
+            rows (int): Number of rows of the dataset.
+            parent (str): Dataset the rows were appended to, if any.
+            parent_rows (int): Number of rows of the parent.
+        """
+        path = self._info_path(dataset_id)
+        if os.path.exists(path):
+            return
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"rows": int(rows), "parent": parent, "parent_rows": parent_rows}, f)
+        os.replace(tmp_path, path)
+
+    def append(self, base_id, delta_path, dataset_id, parent_rows, rows):
+        """
+        Store a new dataset made of every row of `base_id` followed by the rows of a delta file.
+
+        The base file is copied as is. The delta rows are copied verbatim when both files
+        have the same header, otherwise they are re-ordered to the base columns, with empty
+        values for base columns the delta lacks.
+
+        Args:
+            base_id (str): Dataset the rows are appended to.
+            delta_path (str): CSV file with the new rows (validated by the caller).
+            dataset_id (str): Id of the resulting dataset.
+            parent_rows (int): Number of rows of the base dataset.
+            rows (int): Number of rows of the resulting dataset.
+
+        Returns:
+            str: Path of the stored CSV file.
+        """
+        path = self.csv_path(dataset_id)
+        if not os.path.exists(path):
+            base_path = self.csv_path(base_id)
+            tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+            shutil.copyfile(base_path, tmp_path)
+            with open(base_path, newline="") as f:
+                base_header = next(csv.reader(f), [])
+            with open(tmp_path, "rb+") as f:
+                f.seek(0, os.SEEK_END)
+                if f.tell():
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b"\n":
+                        f.write(b"\n")
+            with open(delta_path, newline="") as delta, open(tmp_path, "a", newline="") as f:
+                if next(csv.reader([delta.readline()]), []) == base_header:
+                    shutil.copyfileobj(delta, f)
+                else:
+                    # Text columns keep their exact spelling, so re-parsing gives the same dtypes
+                    rows_text = pd.read_csv(delta_path, dtype=str, keep_default_na=False)
+                    rows_text.reindex(columns=base_header).to_csv(f, header=False, index=False)
+            os.replace(tmp_path, path)
+            logger.info(f"Appended {rows - parent_rows} rows to dataset {base_id} as {dataset_id}.")
+        self.record(dataset_id, rows, parent=base_id, parent_rows=parent_rows)
+        return path
+
+    def rows_before(self, dataset_id, ancestor_id):
+        """
+        Number of leading rows of a dataset that come from one of its ancestors.
+
+        Args:
+            dataset_id (str): The dataset.
+            ancestor_id (str): The dataset itself or one it was (transitively) appended to.
+
+        Returns:
+            int: Row count of the ancestor, or None if `ancestor_id` is not an ancestor or the
+            lineage is unknown.
+        """
+        if not ancestor_id:
+            return None
+        current = dataset_id
+        while current:
+            info = self.info(current)
+            if info is None:
+                return None
+            if current == ancestor_id:
+                return info["rows"]
+            if info["parent"] == ancestor_id:
+                return info["parent_rows"]
+            current = info["parent"]
+        return None
+
+    def _info_path(self, dataset_id):
+        return os.path.join(self.upload_folder, f"{dataset_id}.json")
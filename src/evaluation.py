@@ -0,0 +1,241 @@
+from html import escape
+from logging import getLogger
+import numpy as np
+from sklearn.metrics import (
+    accuracy_score, average_precision_score, classification_report, confusion_matrix, precision_recall_curve,
+    roc_auc_score, roc_curve
+)
+
+# Initialize a logger for this module
+logger = getLogger(__name__)
+
+# Charts rendered by `EvaluationReport.render_svg`
+CHARTS = ["confusion_matrix", "roc_curve", "pr_curve", "calibration"]
+
+# Most points kept per curve; longer curves are thinned evenly, keeping both ends
+MAX_CURVE_POINTS = 500
+
+# Size of the SVG charts and the margins around their plot area
+_WIDTH, _HEIGHT, _MARGIN = 420, 340, 50
+
+
+def _thin(*arrays, max_points=MAX_CURVE_POINTS):
+    """
+    Keep at most `max_points` evenly spaced points of aligned curve arrays.
+    """
+    n = len(arrays[0])
+    if n <= max_points:
+        return [np.asarray(array) for array in arrays]
+    index = np.unique(np.linspace(0, n - 1, max_points).round().astype(int))
+    return [np.asarray(array)[index] for array in arrays]
+
+
+class EvaluationReport:
+    """
+    Test-set evaluation of a binary classifier, computed once from its predicted probabilities.
+
+    The report holds everything the result pages need (confusion matrix, ROC and
+    precision-recall curve points, calibration bins and the per-class report), so it can be
+    saved with the model artifact and rendered later without running the model again.
+
+    Attributes:
+        y_true (np.ndarray): True test labels (int8).
+        proba (np.ndarray): Predicted probability of the positive class (float32).
+        threshold (float): Probability above which the positive class is predicted.
+        accuracy (float): Accuracy at `threshold`.
+        classification_report (dict): Per-class precision, recall and F1 at `threshold`.
+        confusion_matrix (np.ndarray): 2x2 counts, true labels as rows.
+        roc (dict): `fpr`, `tpr` and `thresholds` arrays, and the `auc`.
+        pr (dict): `precision`, `recall` and `thresholds` arrays, and the `average_precision`.
+        calibration (dict): Per probability bin: `edges`, `count`, `mean_predicted` and `fraction_positive`.
+    """
+    def __init__(self, y_true, proba, threshold=0.5, calibration_bins=10):
+        """
+        Evaluate predicted probabilities against the true labels.
+
+        Args:
+            y_true (array-like): True labels (0 or 1).
+            proba (array-like): Predicted probability of class 1.
+            threshold (float): Probability above which class 1 is predicted.
+            calibration_bins (int): Number of equal-width probability bins of the calibration curve.
+        """
+        self.y_true = np.asarray(y_true, dtype=np.int8)
+        self.proba = np.asarray(proba, dtype=np.float32)
+        self.threshold = threshold
+        y_pred = (self.proba > threshold).astype(np.int8)
+        both_classes = len(np.unique(self.y_true)) == 2
+
+        self.accuracy = float(accuracy_score(self.y_true, y_pred))
+        self.classification_report = classification_report(self.y_true, y_pred, output_dict=True, zero_division=0)
+        self.confusion_matrix = confusion_matrix(self.y_true, y_pred, labels=[0, 1])
+
+        fpr, tpr, roc_thresholds = roc_curve(self.y_true, self.proba) if both_classes else ([0, 1], [0, 1], [1, 0])
+        fpr, tpr, roc_thresholds = _thin(fpr, tpr, roc_thresholds)
+        self.roc = {
+            "fpr": fpr, "tpr": tpr, "thresholds": roc_thresholds,
+            "auc": float(roc_auc_score(self.y_true, self.proba)) if both_classes else None,
+        }
+
+        precision, recall, pr_thresholds = precision_recall_curve(self.y_true, self.proba)
+        # The last precision/recall pair has no threshold
+        precision, recall, pr_thresholds = _thin(precision, recall, np.append(pr_thresholds, 1.0))
+        self.pr = {
+            "precision": precision, "recall": recall, "thresholds": pr_thresholds,
+            "average_precision": float(average_precision_score(self.y_true, self.proba)) if both_classes else None,
+        }
+
+        edges = np.linspace(0.0, 1.0, calibration_bins + 1)
+        bins = np.clip(np.searchsorted(edges, self.proba, side="right") - 1, 0, calibration_bins - 1)
+        count = np.bincount(bins, minlength=calibration_bins)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean_predicted = np.bincount(bins, weights=self.proba, minlength=calibration_bins) / count
+            fraction_positive = np.bincount(bins, weights=self.y_true, minlength=calibration_bins) / count
+        self.calibration = {
+            "edges": edges, "count": count, "mean_predicted": mean_predicted, "fraction_positive": fraction_positive,
+        }
+
+    @property
+    def metrics(self):
+        """
+        dict: Summary metrics, in the format of `StrokePredictionModel.metrics`.
+        """
+        return {
+            "accuracy": self.accuracy,
+            "classification_report": self.classification_report,
+            "roc_auc": self.roc["auc"],
+            "average_precision": self.pr["average_precision"],
+        }
+
+    def to_dict(self):
+        """
+        Returns:
+            dict: JSON-serializable report, without the per-row probabilities.
+        """
+        return {
+            "rows": len(self.y_true),
+            "threshold": self.threshold,
+            **self.metrics,
+            "confusion_matrix": self.confusion_matrix.tolist(),
+            "roc_curve": _json_values(self.roc),
+            "pr_curve": _json_values(self.pr),
+            "calibration": _json_values(self.calibration),
+        }
+
+    def render_svg(self, chart):
+        """
+        Draw one chart of the report as a small standalone SVG document.
+
+        Args:
+            chart (str): One of `CHARTS`.
+
+        Returns:
+            str: The SVG markup.
+
+        Raises:
+            KeyError: If `chart` is unknown.
+        """
+        if chart == "confusion_matrix":
+            return self._svg_confusion_matrix()
+        if chart == "roc_curve":
+            auc = self.roc["auc"]
+            return _svg_line_chart(
+                f"ROC Curve (AUC = {auc:.2f})" if auc is not None else "ROC Curve",
+                "False Positive Rate", "True Positive Rate", self.roc["fpr"], self.roc["tpr"], diagonal=True,
+            )
+        if chart == "pr_curve":
+            average_precision = self.pr["average_precision"]
+            return _svg_line_chart(
+                f"Precision-Recall (AP = {average_precision:.2f})" if average_precision is not None
+                else "Precision-Recall", "Recall", "Precision", self.pr["recall"], self.pr["precision"],
+            )
+        if chart == "calibration":
+            observed = self.calibration["count"] > 0
+            return _svg_line_chart(
+                "Calibration", "Mean Predicted Probability", "Fraction of Positives",
+                self.calibration["mean_predicted"][observed], self.calibration["fraction_positive"][observed],
+                diagonal=True, markers=True,
+            )
+        raise KeyError(f"Unknown chart: {chart}. Choose one of: {', '.join(CHARTS)}.")
+
+    def _svg_confusion_matrix(self):
+        matrix = self.confusion_matrix
+        size = (_HEIGHT - 2 * _MARGIN) / 2
+        left = (_WIDTH - 2 * size) / 2
+        peak = max(int(matrix.max()), 1)
+        cells = []
+        for row in range(2):
+            for col in range(2):
+                value = int(matrix[row, col])
+                shade = int(235 - 180 * value / peak)  # Darker blue for larger counts
+                x, y = left + col * size, _MARGIN + row * size
+                cells.append(
+                    f'<rect x="{x:.1f}" y="{y:.1f}" width="{size:.1f}" height="{size:.1f}" '
+                    f'fill="rgb({shade},{min(shade + 15, 255)},255)" stroke="#fff"/>'
+                    f'<text x="{x + size / 2:.1f}" y="{y + size / 2:.1f}" text-anchor="middle" '
+                    f'dominant-baseline="middle" font-size="18" fill="{"#fff" if value > peak / 2 else "#000"}">'
+                    f'{value}</text>'
+                )
+        labels = "".join(
+            f'<text x="{left + (i + 0.5) * size:.1f}" y="{_HEIGHT - _MARGIN + 18}" text-anchor="middle" '
+            f'font-size="12">{i}</text>'
+            f'<text x="{left - 10:.1f}" y="{_MARGIN + (i + 0.5) * size:.1f}" text-anchor="end" '
+            f'dominant-baseline="middle" font-size="12">{i}</text>'
+            for i in range(2)
+        )
+        return _svg_document(
+            "Confusion Matrix", "Predicted", "True",
+            "".join(cells) + labels,
+        )
+
+
+def _json_values(values):
+    """
+    Convert the arrays of a dict to lists, with None for NaN (e.g. empty calibration bins).
+    """
+    return {
+        key: [None if item != item else item for item in value.tolist()] if isinstance(value, np.ndarray) else value
+        for key, value in values.items()
+    }
+
+
+def _svg_document(title, xlabel, ylabel, body):
+    """
+    Wrap chart elements in an SVG document with a title and axis labels.
+    """
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{_WIDTH}" height="{_HEIGHT}" '
+        f'viewBox="0 0 {_WIDTH} {_HEIGHT}" font-family="sans-serif">'
+        f'<rect width="100%" height="100%" fill="#fff"/>'
+        f'<text x="{_WIDTH / 2}" y="22" text-anchor="middle" font-size="15">{escape(title)}</text>'
+        f'<text x="{_WIDTH / 2}" y="{_HEIGHT - 8}" text-anchor="middle" font-size="12">{escape(xlabel)}</text>'
+        f'<text x="14" y="{_HEIGHT / 2}" text-anchor="middle" font-size="12" '
+        f'transform="rotate(-90 14 {_HEIGHT / 2})">{escape(ylabel)}</text>'
+        f'{body}</svg>'
+    )
+
+
+def _svg_line_chart(title, xlabel, ylabel, x, y, diagonal=False, markers=False):
+    """
+    Draw a curve on [0, 1] x [0, 1] axes.
+    """
+    width, height = _WIDTH - 2 * _MARGIN, _HEIGHT - 2 * _MARGIN
+
+    def point(px, py):
+        return f"{_MARGIN + px * width:.1f},{_MARGIN + (1 - py) * height:.1f}"
+
+    body = [f'<rect x="{_MARGIN}" y="{_MARGIN}" width="{width}" height="{height}" fill="none" stroke="#888"/>']
+    for tick in (0.0, 0.5, 1.0):
+        body.append(f'<text x="{_MARGIN + tick * width:.1f}" y="{_MARGIN + height + 16}" text-anchor="middle" '
+                    f'font-size="11">{tick:g}</text>')
+        body.append(f'<text x="{_MARGIN - 6}" y="{_MARGIN + (1 - tick) * height:.1f}" text-anchor="end" '
+                    f'dominant-baseline="middle" font-size="11">{tick:g}</text>')
+    if diagonal:
+        body.append(f'<line x1="{_MARGIN}" y1="{_MARGIN + height}" x2="{_MARGIN + width}" y2="{_MARGIN}" '
+                    f'stroke="#999" stroke-dasharray="4 4"/>')
+    points = " ".join(point(px, py) for px, py in zip(x, y))
+    body.append(f'<polyline points="{points}" fill="none" stroke="#1f4e9c" stroke-width="2"/>')
+    if markers:
+        for px, py in zip(x, y):
+            cx, cy = point(px, py).split(",")
+            body.append(f'<circle cx="{cx}" cy="{cy}" r="3" fill="#1f4e9c"/>')
+    return _svg_document(title, xlabel, ylabel, "".join(body))
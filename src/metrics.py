@@ -0,0 +1,318 @@
+import bisect
+import json
+import math
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from logging import getLogger
+
+# Initialize a logger for this module
+logger = getLogger(__name__)
+
+# Upper bounds in seconds of the duration histogram buckets, from single-row inference to training
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+                   120.0, 300.0, math.inf)
+
+
+class Counter:
+    """
+    Monotonically increasing value per combination of label values.
+
+    Attributes:
+        name (str): Metric name.
+        documentation (str): Help text of the metric.
+        labelnames (tuple): Names of the labels.
+    """
+    type = "counter"
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def inc(self, amount=1.0, **labels):
+        """
+        Increase the counter of the given label values.
+        """
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def snapshot(self):
+        with self._lock:
+            return [[list(key), value] for key, value in self._values.items()]
+
+    def reset(self):
+        self._values = {}
+        self._lock = threading.Lock()
+
+
+class Histogram(Counter):
+    """
+    Distribution of observed values (durations in seconds) per combination of label values.
+
+    Attributes:
+        buckets (tuple): Upper bounds of the buckets, ending with infinity.
+    """
+    type = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, **labels):
+        """
+        Record one observation for the given label values.
+        """
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._values.get(key) or ([0] * len(self.buckets), 0.0)
+            counts[index] += 1
+            self._values[key] = (counts, total + value)
+
+    @contextmanager
+    def time(self, **labels):
+        """
+        Observe the duration of the enclosed block.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def snapshot(self):
+        with self._lock:
+            return [[list(key), {"counts": list(counts), "sum": total}] for key, (counts, total) in self._values.items()]
+
+
+class MetricsRegistry:
+    """
+    Collection of the metrics of one process, exported in the Prometheus text format.
+
+    With several worker processes (gunicorn), each worker writes a JSON snapshot of its
+    metrics to a shared folder and `render` merges the snapshots of every worker, so any
+    worker answering a scrape reports the totals of the whole server.
+    """
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+        self._last_write = 0.0
+
+    def counter(self, name, documentation, labelnames=()):
+        """
+        Get or create a counter.
+        """
+        return self._register(Counter, name, documentation, labelnames)
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        """
+        Get or create a histogram.
+        """
+        return self._register(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def _register(self, cls, name, documentation, labelnames, **kwargs):
+        with self._lock:
+            if name not in self._metrics:
+                self._metrics[name] = cls(name, documentation, labelnames, **kwargs)
+            return self._metrics[name]
+
+    def reset(self):
+        """
+        Clear every value, e.g. in a child process that inherited the parent's metrics.
+        """
+        self._lock = threading.Lock()
+        self._last_write = 0.0
+        for metric in self._metrics.values():
+            metric.reset()
+
+    def snapshot(self):
+        """
+        Returns:
+            dict: JSON-serializable values of every metric, keyed by metric name.
+        """
+        return {
+            name: {
+                "type": metric.type,
+                "help": metric.documentation,
+                "labelnames": list(metric.labelnames),
+                "buckets": [str(bound) for bound in getattr(metric, "buckets", ())],
+                "values": metric.snapshot(),
+            }
+            for name, metric in list(self._metrics.items())
+        }
+
+    def write_snapshot(self, folder, min_interval=0.0):
+        """
+        Write this process's snapshot to `<folder>/<pid>.json`, at most once every `min_interval` seconds.
+
+        Args:
+            folder (str): Folder shared by the worker processes.
+            min_interval (float): Minimum number of seconds between two writes.
+        """
+        now = time.monotonic()
+        if now - self._last_write < min_interval:
+            return
+        self._last_write = now
+        os.makedirs(folder, exist_ok=True)
+        path = os.path.join(folder, f"{os.getpid()}.json")
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.snapshot(), f)
+        os.replace(tmp_path, path)  # Readers never see a partial snapshot
+
+    def render(self, folder=None):
+        """
+        Export the metrics in the Prometheus text exposition format.
+
+        Args:
+            folder (str): Shared snapshot folder; the snapshots of the other processes found
+                there are added to this process's live values.
+
+        Returns:
+            str: The exposition text.
+        """
+        snapshots = [self.snapshot()]
+        if folder and os.path.isdir(folder):
+            for file in os.listdir(folder):
+                if not file.endswith(".json") or file == f"{os.getpid()}.json":
+                    continue
+                try:
+                    with open(os.path.join(folder, file)) as f:
+                        snapshots.append(json.load(f))
+                except (OSError, ValueError) as e:
+                    logger.warning(f"Skipping unreadable metrics snapshot {file}: {e}")
+
+        lines = []
+        for name, merged in _merge(snapshots).items():
+            lines.append(f"# HELP {name} {merged['help']}")
+            lines.append(f"# TYPE {name} {merged['type']}")
+            for key, value in sorted(merged["values"].items()):
+                labels = dict(zip(merged["labelnames"], key))
+                if merged["type"] == "counter":
+                    lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+                    continue
+                cumulative = 0
+                for bound, count in zip(merged["buckets"], value["counts"]):
+                    cumulative += count
+                    le = "+Inf" if bound == "inf" else bound
+                    lines.append(f"{name}_bucket{_format_labels({**labels, 'le': le})} {cumulative}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(value['sum'])}")
+                lines.append(f"{name}_count{_format_labels(labels)} {cumulative}")
+        return "\n".join(lines) + "\n"
+
+
+def _merge(snapshots):
+    """
+    Add up the values of several snapshots with the same metric and label values.
+    """
+    merged = {}
+    for snapshot in snapshots:
+        for name, metric in snapshot.items():
+            target = merged.setdefault(name, {**metric, "values": {}})
+            for key, value in metric["values"]:
+                key = tuple(key)
+                if metric["type"] == "counter":
+                    target["values"][key] = target["values"].get(key, 0.0) + value
+                elif key in target["values"]:
+                    current = target["values"][key]
+                    current["counts"] = [a + b for a, b in zip(current["counts"], value["counts"])]
+                    current["sum"] += value["sum"]
+                else:
+                    target["values"][key] = {"counts": list(value["counts"]), "sum": value["sum"]}
+    return merged
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"') for value in labels.values())
+    return "{" + ",".join(f'{name}="{value}"' for name, value in zip(labels, escaped)) + "}"
+
+
+def _format_value(value):
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+def remove_stale_snapshots(folder):
+    """
+    Delete the snapshots of processes that are no longer running.
+
+    Args:
+        folder (str): Shared snapshot folder.
+    """
+    if not os.path.isdir(folder):
+        return
+    for file in os.listdir(folder):
+        pid = file.split(".")[0]
+        if not pid.isdigit() or int(pid) == os.getpid():
+            continue
+        try:
+            os.kill(int(pid), 0)
+        except ProcessLookupError:
+            try:
+                os.remove(os.path.join(folder, file))
+            except FileNotFoundError:
+                pass
+        except PermissionError:
+            pass  # The process exists but belongs to another user
+
+
+# Metrics of this process
+REGISTRY = MetricsRegistry()
+
+# A forked worker starts from empty metrics instead of re-reporting the parent's values
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=REGISTRY.reset)
+
+STAGE_DURATION = REGISTRY.histogram(
+    "stroke_stage_duration_seconds", "Duration of the data, model and graph pipeline stages.", ["stage"]
+)
+STAGE_ERRORS = REGISTRY.counter("stroke_stage_errors_total", "Pipeline stages that raised an exception.", ["stage"])
+
+# Whether each timed stage is also logged (with `stage` and `duration_ms` fields for JSON logs)
+_log_timings = False
+
+
+def configure(log_timings=False):
+    """
+    Configure the stage timers.
+
+    Args:
+        log_timings (bool): Log the duration of every timed stage.
+    """
+    global _log_timings
+    _log_timings = log_timings
+
+
+@contextmanager
+def timed(stage):
+    """
+    Record the duration of a pipeline stage in `stroke_stage_duration_seconds`.
+
+    Can be used as a context manager or as a function decorator. Failures are also counted
+    in `stroke_stage_errors_total`.
+
+    Args:
+        stage (str): Stage name, used as the `stage` label.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        STAGE_ERRORS.inc(stage=stage)
+        raise
+    finally:
+        duration = time.perf_counter() - start
+        STAGE_DURATION.observe(duration, stage=stage)
+        if _log_timings:
+            logger.info(f"Stage {stage} took {duration * 1000:.1f} ms",
+                        extra={"stage": stage, "duration_ms": round(duration * 1000, 3)})
@@ -0,0 +1,130 @@
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from logging import getLogger
+
+# Initialize a logger for this module
+logger = getLogger(__name__)
+
+
+class MicroBatcher:
+    """
+    Merge concurrent single-row prediction requests into one vectorized call.
+
+    Requests submitted within `window_ms` of the first queued request (up to
+    `max_batch_size` rows) are passed together to `predict_fn`, and every caller
+    receives its own result through a Future.
+
+    Attributes:
+        predict_fn (callable): Function mapping a list of records to a list of results.
+        window_ms (float): Time to wait for more requests after the first one arrives.
+        max_batch_size (int): Maximum number of records merged into one call.
+    """
+    def __init__(self, predict_fn, window_ms=2.0, max_batch_size=256):
+        """
+        Initialize the batcher. The worker thread is started on first use.
+
+        Args:
+            predict_fn (callable): Function mapping a list of records to a list of results
+                of the same length and order.
+            window_ms (float): Time to wait for more requests after the first one arrives.
+            max_batch_size (int): Maximum number of records merged into one call.
+        """
+        self.predict_fn = predict_fn
+        self.window_ms = window_ms
+        self.max_batch_size = max_batch_size
+        self._queue = queue.Queue()
+        self._worker = None
+        self._worker_pid = None
+        self._start_lock = threading.Lock()
+
+    def submit(self, record):
+        """
+        Queue a single record for prediction.
+
+        Args:
+            record (dict): Raw input fields for one patient.
+
+        Returns:
+            Future: Resolves to the result for this record.
+        """
+        self._ensure_worker()
+        future = Future()
+        self._queue.put((record, future))
+        return future
+
+    def predict(self, record, timeout=None):
+        """
+        Predict a single record, waiting for the batch it was merged into.
+
+        Args:
+            record (dict): Raw input fields for one patient.
+            timeout (float): Maximum number of seconds to wait for the result.
+
+        Returns:
+            The result produced by `predict_fn` for this record.
+        """
+        return self.submit(record).result(timeout=timeout)
+
+    def _ensure_worker(self):
+        """
+        Start the worker thread if it is not running in this process (e.g. after a fork).
+        """
+        if self._worker is not None and self._worker_pid == os.getpid() and self._worker.is_alive():
+            return
+        with self._start_lock:
+            if self._worker is None or self._worker_pid != os.getpid() or not self._worker.is_alive():
+                if self._worker_pid != os.getpid():
+                    self._queue = queue.Queue()  # Requests queued in the parent process belong to it
+                self._worker = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+                self._worker_pid = os.getpid()
+                self._worker.start()
+
+    def _collect_batch(self):
+        """
+        Block for the first request, then gather more until the window closes or the batch is full.
+
+        Returns:
+            list: Tuples of (record, future).
+        """
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.window_ms / 1000.0
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        """
+        Worker loop: collect batches and resolve each caller's future.
+
+        If a merged batch fails, its records are predicted again one by one, so a malformed
+        record only fails its own request.
+        """
+        while True:
+            batch = self._collect_batch()
+            records = [record for record, _ in batch]
+            try:
+                results = self.predict_fn(records)
+            except Exception as e:
+                if len(batch) == 1:
+                    logger.error(f"Error during micro-batched prediction: {e}")
+                    batch[0][1].set_exception(e)
+                    continue
+                logger.warning(f"Micro-batched prediction of {len(batch)} rows failed, retrying them one by one: {e}")
+                for record, future in batch:
+                    try:
+                        future.set_result(self.predict_fn([record])[0])
+                    except Exception as e:
+                        logger.error(f"Error during micro-batched prediction: {e}")
+                        future.set_exception(e)
+                continue
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
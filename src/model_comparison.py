@@ -0,0 +1,204 @@
+import multiprocessing
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
+from logging import getLogger
+import numpy as np
+import pandas as pd
+from sklearn.metrics import accuracy_score, roc_auc_score
+from sklearn.model_selection import StratifiedKFold
+from src.config import CATEGORY_VOCABULARIES
+from src.data_processing import PreprocessingPipeline, category_codes
+from src.metrics import timed
+from src.model_training import MODEL_TYPES, NATIVE_CATEGORICAL_MODEL_TYPES, categorical_mask
+
+# Initialize a logger for this module
+logger = getLogger(__name__)
+
+
+def fit_fold(model_type, fold, folder, matrix, columns, categorical):
+    """
+    Fit one model type on every fold but `fold` and evaluate it on `fold`.
+
+    Runs in a worker process. The features, labels and fold assignments are opened as
+    read-only memory maps, so only the file names travel to the worker.
+
+    Args:
+        model_type (str): One of `MODEL_TYPES`.
+        fold (int): Index of the held-out fold.
+        folder (str): Directory of the shared arrays.
+        matrix (str): Name of the feature matrices ('scaled' or 'native'), one per fold.
+        columns (list): Feature column names.
+        categorical (list): Boolean mask of the native categorical columns.
+
+    Returns:
+        dict: Accuracy, ROC AUC, fit and predict durations of the fold.
+    """
+    features = np.load(os.path.join(folder, f"{matrix}_{fold}.npy"), mmap_mode="r")
+    labels = np.load(os.path.join(folder, "labels.npy"), mmap_mode="r")
+    folds = np.load(os.path.join(folder, "folds.npy"), mmap_mode="r")
+    test = folds == fold
+    X_train = pd.DataFrame(features[~test], columns=columns, copy=False)
+    X_test = pd.DataFrame(features[test], columns=columns, copy=False)
+    y_train, y_test = labels[~test], labels[test]
+
+    estimator = MODEL_TYPES[model_type](categorical)
+    start = time.perf_counter()
+    estimator.fit(X_train, y_train)
+    fit_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    proba = estimator.predict_proba(X_test)[:, list(estimator.classes_).index(1)]
+    predict_seconds = time.perf_counter() - start
+    return {
+        "model_type": model_type,
+        "fold": fold,
+        "accuracy": float(accuracy_score(y_test, proba > 0.5)),
+        "roc_auc": float(roc_auc_score(y_test, proba)) if len(np.unique(y_test)) == 2 else None,
+        "fit_seconds": fit_seconds,
+        "predict_seconds": predict_seconds,
+        "test_rows": int(test.sum()),
+    }
+
+
+def _leaderboard(results, errors):
+    """
+    Summarize the fold results per model type, best mean ROC AUC (then accuracy) first.
+    """
+    rows = []
+    for model_type, folds in results.items():
+        aucs = [fold["roc_auc"] for fold in folds if fold["roc_auc"] is not None]
+        accuracies = [fold["accuracy"] for fold in folds]
+        test_rows = sum(fold["test_rows"] for fold in folds)
+        predict_seconds = sum(fold["predict_seconds"] for fold in folds)
+        rows.append({
+            "model_type": model_type,
+            "accuracy_mean": float(np.mean(accuracies)),
+            "accuracy_std": float(np.std(accuracies)),
+            "roc_auc_mean": float(np.mean(aucs)) if aucs else None,
+            "roc_auc_std": float(np.std(aucs)) if aucs else None,
+            "fit_seconds_mean": float(np.mean([fold["fit_seconds"] for fold in folds])),
+            "predict_seconds_mean": predict_seconds / len(folds),
+            "predict_rows_per_second": test_rows / predict_seconds if predict_seconds > 0 else None,
+        })
+    rows.sort(key=lambda row: (row["roc_auc_mean"] is None, -(row["roc_auc_mean"] or 0), -row["accuracy_mean"]))
+    rows += [{"model_type": model_type, "error": error} for model_type, error in errors.items()]
+    for rank, row in enumerate(rows, start=1):
+        row["rank"] = rank
+    return rows
+
+
+@timed("compare")
+def compare_models(data, model_types=None, n_splits=5, max_workers=None, work_folder=None,
+                   progress_callback=None):
+    """
+    Cross-validate several model types on the same folds and rank them.
+
+    The stratified fold of every row is drawn once. For each fold, the preprocessing pipeline
+    is fitted on the training rows only, so the held-out rows never leak into the imputation
+    and scaling statistics, and all rows are transformed once per encoding (scaled category
+    codes, and unscaled codes for `NATIVE_CATEGORICAL_MODEL_TYPES`). Every model type reuses
+    these per-fold matrices: they are saved to a temporary folder and memory-mapped by the
+    worker processes, which fit every (model type, fold) pair concurrently.
+
+    Args:
+        data (pd.DataFrame): Raw rows with the selected feature columns and 'Diagnosis'.
+        model_types (list): Model types to compare (defaults to every type in `MODEL_TYPES`).
+        n_splits (int): Number of cross-validation folds.
+        max_workers (int): Worker processes fitting folds concurrently (None or 1 fits them
+            one after the other in this process).
+        work_folder (str): Directory for the shared arrays (defaults to the system temporary directory).
+        progress_callback (callable): Called with keyword progress fields (phase and fit counters).
+            It may raise to abort the comparison.
+
+    Returns:
+        dict: Number of rows and folds, how the preprocessing was fitted ('per_fold'), and the
+            `leaderboard` list (one entry per model type with mean/std accuracy and ROC AUC,
+            mean fit and predict seconds per fold).
+
+    Raises:
+        ValueError: If a model type is unknown or a class has fewer rows than `n_splits`.
+    """
+    model_types = list(model_types or MODEL_TYPES)
+    unknown = [model_type for model_type in model_types if model_type not in MODEL_TYPES]
+    if unknown:
+        raise ValueError(f"Unsupported model types: {unknown}. Choose from: {', '.join(MODEL_TYPES)}.")
+    report = progress_callback or (lambda **fields: None)
+
+    with tempfile.TemporaryDirectory(dir=work_folder) as folder:
+        report(phase="preprocessing")
+        encodings = {
+            "scaled" if model_type not in NATIVE_CATEGORICAL_MODEL_TYPES else "native":
+                model_type not in NATIVE_CATEGORICAL_MODEL_TYPES
+            for model_type in model_types
+        }
+        # The target vocabulary is fixed, so the labels do not depend on any fitted statistics
+        labels = category_codes(data["Diagnosis"], CATEGORY_VOCABULARIES["Diagnosis"], unknown_code=-1)
+        folds = np.empty(len(labels), dtype=np.int8)
+        splitter = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=42)
+        for fold, (_, test_index) in enumerate(splitter.split(np.zeros(len(labels)), labels)):
+            folds[test_index] = fold
+        np.save(os.path.join(folder, "labels.npy"), labels)
+        np.save(os.path.join(folder, "folds.npy"), folds)
+
+        matrices = {}
+        for fold in range(n_splits):
+            train = data[folds != fold]
+            for matrix, scale_categorical in encodings.items():
+                preprocessor = PreprocessingPipeline(target_column="Diagnosis", scale_categorical=scale_categorical)
+                preprocessor.fit(train)
+                processed = preprocessor.transform(data)
+                np.save(os.path.join(folder, f"{matrix}_{fold}.npy"),
+                        processed[preprocessor.feature_columns].to_numpy(dtype=np.float32))
+                matrices[matrix] = (list(preprocessor.feature_columns), categorical_mask(preprocessor))
+            report(phase="preprocessing", folds_done=fold + 1, folds_total=n_splits)
+
+        tasks = []
+        for model_type in model_types:
+            matrix = "scaled" if model_type not in NATIVE_CATEGORICAL_MODEL_TYPES else "native"
+            columns, categorical = matrices[matrix]
+            tasks += [(model_type, fold, folder, matrix, columns, categorical) for fold in range(n_splits)]
+
+        results, errors = {model_type: [] for model_type in model_types}, {}
+        remaining = list(tasks)
+
+        def collect(task, run):
+            try:
+                results[task[0]].append(run())
+            except BrokenProcessPool:
+                raise
+            except Exception as e:
+                logger.error(f"Comparison of {task[0]} failed on fold {task[1]}: {e}")
+                errors[task[0]] = str(e)
+            remaining.remove(task)
+            report(phase="fitting", fits_done=len(tasks) - len(remaining), fits_total=len(tasks))
+
+        report(phase="fitting", fits_done=0, fits_total=len(tasks))
+        if max_workers and max_workers > 1:
+            try:
+                # 'spawn' workers never inherit the state of a threaded server
+                with ProcessPoolExecutor(max_workers=min(max_workers, len(tasks)),
+                                         mp_context=multiprocessing.get_context("spawn")) as pool:
+                    pending = {pool.submit(fit_fold, *task): task for task in tasks}
+                    try:
+                        while pending:
+                            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                            for future in done:
+                                collect(pending.pop(future), future.result)
+                    except BaseException:
+                        pool.shutdown(wait=True, cancel_futures=True)
+                        raise
+            except BrokenProcessPool as e:
+                logger.error(f"Comparison worker pool failed, fitting the remaining folds serially: {e}")
+        for task in list(remaining):
+            collect(task, lambda: fit_fold(*task))
+
+    for model_type in errors:
+        results.pop(model_type, None)
+    leaderboard = _leaderboard(results, errors)
+    logger.info("Model comparison leaderboard: " + ", ".join(
+        f"{row['rank']}. {row['model_type']}" + (f" (AUC {row['roc_auc_mean']:.3f})" if row.get("roc_auc_mean") else "")
+        for row in leaderboard
+    ))
+    return {"rows": len(labels), "folds": n_splits, "preprocessing": "per_fold", "leaderboard": leaderboard}
@@ -0,0 +1,208 @@
+import hashlib
+import os
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from logging import getLogger
+from src.metrics import REGISTRY
+from src.model_training import StrokePredictionModel
+
+# Initialize a logger for this module
+logger = getLogger(__name__)
+
+MODEL_LOADS = REGISTRY.counter(
+    "stroke_model_loads_total", "Models swapped into the registry, by source ('disk' or 'publish').", ["source"]
+)
+
+
+@dataclass(frozen=True)
+class LoadedModel:
+    """
+    An immutable snapshot of a model held by the registry.
+
+    Attributes:
+        model (StrokePredictionModel): The loaded model, including its preprocessing pipeline.
+        version (str): Short content hash of the artifact file.
+        loaded_at (datetime): UTC time at which the model was loaded or published.
+        path (str): Path of the artifact file.
+        mtime_ns (int): Modification time of the artifact when it was loaded.
+        size (int): Size in bytes of the artifact when it was loaded.
+    """
+    model: StrokePredictionModel
+    version: str
+    loaded_at: datetime
+    path: str
+    mtime_ns: int
+    size: int
+
+    def info(self):
+        """
+        Describe the loaded model.
+
+        Returns:
+            dict: JSON-serializable version, load information and artifact manifest.
+        """
+        return {
+            "version": self.version,
+            "loaded_at": self.loaded_at.isoformat(),
+            "path": self.path,
+            "estimator": type(self.model.model).__name__,
+            "manifest": self.model.manifest,
+        }
+
+
+class ModelRegistry:
+    """
+    Process-wide registry that keeps the trained model in memory.
+
+    The artifact is loaded once and reused by every request. Readers only read the
+    `_current` reference, which is swapped atomically when a new model is published or
+    the file on disk changes, so the hot path never takes a lock. The file's mtime and
+    size are checked at most once every `check_interval` seconds, and the content hash
+    decides whether a changed file really holds a new model.
+
+    Attributes:
+        model_path (str): Path of the model artifact to serve.
+        check_interval (float): Minimum number of seconds between two file checks.
+    """
+    def __init__(self, model_path, check_interval=1.0):
+        """
+        Initialize an empty registry for the given artifact path.
+
+        Args:
+            model_path (str): Path of the model artifact to serve.
+            check_interval (float): Minimum number of seconds between two file checks.
+        """
+        self.model_path = model_path
+        self.check_interval = check_interval
+        self._current = None
+        self._last_check = 0.0
+        self._reload_lock = threading.Lock()  # Serializes reloads only, never taken by readers of a loaded model
+
+    def get(self):
+        """
+        Return the current model, reloading it first if the artifact changed on disk.
+
+        Returns:
+            LoadedModel: The model snapshot to use for this request.
+
+        Raises:
+            FileNotFoundError: If no model has been trained yet.
+        """
+        current = self._current
+        now = time.monotonic()
+        if current is None or now - self._last_check >= self.check_interval:
+            self._last_check = now
+            current = self._refresh(current, wait=current is None)
+        if current is None:
+            raise FileNotFoundError(f"Model file not found at: {self.model_path}")
+        return current
+
+    def reload(self):
+        """
+        Check the artifact on disk immediately and load it if it changed.
+
+        Returns:
+            LoadedModel: The current model snapshot, or None if no artifact exists.
+        """
+        return self._refresh(self._current, wait=True)
+
+    def publish(self, model):
+        """
+        Swap in a freshly trained model that has already been saved to `model_path`.
+
+        This avoids unpickling the artifact again in the process that trained it.
+
+        Args:
+            model (StrokePredictionModel): The trained model that was saved to `model_path`.
+
+        Returns:
+            LoadedModel: The published model snapshot.
+        """
+        with self._reload_lock:
+            stat = os.stat(self.model_path)
+            loaded = LoadedModel(
+                model=model,
+                version=self._file_hash(),
+                loaded_at=datetime.now(timezone.utc),
+                path=self.model_path,
+                mtime_ns=stat.st_mtime_ns,
+                size=stat.st_size,
+            )
+            self._current = loaded
+        MODEL_LOADS.inc(source="publish")
+        logger.info(f"Published model version {loaded.version}.")
+        return loaded
+
+    def info(self):
+        """
+        Describe the currently loaded model.
+
+        Returns:
+            dict: Version and load information, or None if no model is loaded.
+        """
+        current = self._current
+        return current.info() if current is not None else None
+
+    def _refresh(self, current, wait):
+        """
+        Reload the artifact if its mtime or size differ from the loaded snapshot.
+
+        Args:
+            current (LoadedModel): Snapshot seen by the caller, possibly None.
+            wait (bool): Block until a concurrent reload finishes instead of serving `current`.
+
+        Returns:
+            LoadedModel: The snapshot to serve.
+        """
+        try:
+            stat = os.stat(self.model_path)
+        except FileNotFoundError:
+            return current
+        if current is not None and (stat.st_mtime_ns, stat.st_size) == (current.mtime_ns, current.size):
+            return current
+
+        if not self._reload_lock.acquire(blocking=wait):
+            return current  # Another thread is already reloading; keep serving the old model
+        try:
+            current = self._current
+            stat = os.stat(self.model_path)
+            if current is not None and (stat.st_mtime_ns, stat.st_size) == (current.mtime_ns, current.size):
+                return current
+
+            version = self._file_hash()
+            if current is not None and version == current.version:
+                model, loaded_at = current.model, current.loaded_at  # File was rewritten with identical content
+            else:
+                model = StrokePredictionModel(None)
+                model.load_model(self.model_path)
+                loaded_at = datetime.now(timezone.utc)
+                MODEL_LOADS.inc(source="disk")
+                logger.info(f"Loaded model version {version} from: {self.model_path}")
+
+            loaded = LoadedModel(
+                model=model,
+                version=version,
+                loaded_at=loaded_at,
+                path=self.model_path,
+                mtime_ns=stat.st_mtime_ns,
+                size=stat.st_size,
+            )
+            self._current = loaded
+            return loaded
+        finally:
+            self._reload_lock.release()
+
+    def _file_hash(self):
+        """
+        Compute a short SHA-256 content hash of the artifact file.
+
+        Returns:
+            str: The first 12 hexadecimal characters of the digest.
+        """
+        digest = hashlib.sha256()
+        with open(self.model_path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+        return digest.hexdigest()[:12]
@@ -1,17 +1,152 @@
+import json
 import os
+import tempfile
 import uuid
+from datetime import datetime, timezone
 from logging import getLogger
-from sklearn.model_selection import train_test_split, GridSearchCV
-from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
+import numpy as np
+import pandas as pd
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401 (enables the halving search classes)
+from sklearn.model_selection import (
+    train_test_split, check_cv, GridSearchCV, RandomizedSearchCV, HalvingGridSearchCV, HalvingRandomSearchCV
+)
+from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier, HistGradientBoostingClassifier
+from sklearn.kernel_approximation import Nystroem
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.naive_bayes import GaussianNB
+from sklearn.pipeline import make_pipeline
 from sklearn.svm import SVC
-from sklearn.metrics import confusion_matrix, roc_curve, auc, classification_report, accuracy_score
-from joblib import dump, load
-import matplotlib.pyplot as plt
-import seaborn as sns
+from sklearn.metrics import classification_report
+from joblib import dump, load, effective_n_jobs
+import sklearn
+from src.data_processing import PreprocessingPipeline
+from src.compiled_trees import compile_estimator, MAX_COMPILED_ROWS
+from src.evaluation import CHARTS, EvaluationReport
+from src.metrics import timed
 
 # Initialize a logger for this module
 logger = getLogger(__name__)
 
+
+class _ProgressSearchMixin:
+    """
+    Report hyperparameter search progress between groups of candidates.
+
+    Candidates are evaluated in groups of `n_jobs` (every fold of a group still runs in
+    parallel), and `progress_callback` is called after each group. The callback may raise
+    to stop the search early, e.g. when a training job is cancelled.
+    """
+    progress_callback = None
+
+    def _run_search(self, evaluate_candidates, *, callback_ctx=None):
+        # Newer scikit-learn versions pass a callback context to `_run_search`
+        extra = {"callback_ctx": callback_ctx} if callback_ctx is not None else {}
+        callback = self.progress_callback
+        if callback is None:
+            return super()._run_search(evaluate_candidates, **extra)
+
+        counters = {"candidates_done": 0, "candidates_total": 0, "fits_done": 0}
+        group_size = max(1, effective_n_jobs(self.n_jobs))
+
+        def tracked_evaluate(candidate_params, cv=None, more_results=None, **kwargs):
+            # Per-call callback contexts cannot be split across groups, so they are not forwarded
+            candidate_params = list(candidate_params)
+            folds = getattr(self, "n_splits_", None) or check_cv(self.cv, classifier=True).get_n_splits()
+            counters["candidates_total"] += len(candidate_params)
+            callback(folds=folds, **counters)
+            results = None
+            for start in range(0, len(candidate_params), group_size):
+                stop = start + group_size
+                group_results = None
+                if more_results is not None:
+                    group_results = {key: values[start:stop] for key, values in more_results.items()}
+                results = evaluate_candidates(candidate_params[start:stop], cv, group_results)
+                counters["candidates_done"] += len(candidate_params[start:stop])
+                counters["fits_done"] += len(candidate_params[start:stop]) * folds
+                callback(folds=folds, **counters)
+            return results
+
+        return super()._run_search(tracked_evaluate, **extra)
+
+
+class _GridSearchCV(_ProgressSearchMixin, GridSearchCV):
+    pass
+
+
+class _RandomizedSearchCV(_ProgressSearchMixin, RandomizedSearchCV):
+    pass
+
+
+class _HalvingGridSearchCV(_ProgressSearchMixin, HalvingGridSearchCV):
+    pass
+
+
+class _HalvingRandomSearchCV(_ProgressSearchMixin, HalvingRandomSearchCV):
+    pass
+
+
+# Hyperparameter search strategies available in train_model
+SEARCH_STRATEGIES = {
+    "grid": _GridSearchCV,
+    "random": _RandomizedSearchCV,
+    "halving_grid": _HalvingGridSearchCV,
+    "halving_random": _HalvingRandomSearchCV,
+}
+
+# Version of the artifact layout written by `save_model`
+ARTIFACT_FORMAT_VERSION = 2
+
+# Model types available in train_model. Each factory receives the boolean mask of
+# categorical feature columns, used by estimators with native categorical support.
+MODEL_TYPES = {
+    "RandomForest": lambda categorical: RandomForestClassifier(random_state=42),
+    "SVM": lambda categorical: SVC(probability=True, random_state=42),
+    # Approximate RBF kernel: linear in the number of rows, with probabilities from the logistic loss
+    "SVMApprox": lambda categorical: make_pipeline(
+        Nystroem(n_components=300, random_state=42), LogisticRegression(max_iter=1000)
+    ),
+    "GradientBoosting": lambda categorical: GradientBoostingClassifier(random_state=42),
+    "HistGradientBoosting": lambda categorical: HistGradientBoostingClassifier(
+        categorical_features=categorical if any(categorical) else None, early_stopping=True, random_state=42
+    ),
+    "LogisticRegression": lambda categorical: LogisticRegression(max_iter=1000),
+    "SGD": lambda categorical: SGDClassifier(loss="log_loss", random_state=42),
+    "NaiveBayes": lambda categorical: GaussianNB(),
+}
+
+# Model types whose categorical features are passed as unscaled category codes
+NATIVE_CATEGORICAL_MODEL_TYPES = {"HistGradientBoosting"}
+
+# Model types trainable out of core by `train_streaming`. Estimators with `partial_fit` learn
+# chunk by chunk; the others are fitted once on a memory-mapped copy of the encoded features.
+STREAMING_MODEL_TYPES = ["SGD", "NaiveBayes", "HistGradientBoosting"]
+
+# Tree ensembles that keep their fitted trees and grow new ones on new rows (`warm_start=True`),
+# with the parameter counting their trees. Other estimators continue with `partial_fit`.
+WARM_START_PARAMS = {
+    RandomForestClassifier: "n_estimators",
+    GradientBoostingClassifier: "n_estimators",
+    HistGradientBoostingClassifier: "max_iter",
+}
+
+def categorical_mask(preprocessor):
+    """
+    Boolean mask of the feature columns passed to the estimators as native categories.
+
+    Args:
+        preprocessor (PreprocessingPipeline): Fitted pipeline producing the features.
+
+    Returns:
+        list: One flag per feature column; all False when the category codes are scaled.
+    """
+    # Ordinal columns keep their order as plain numeric codes
+    ordinal = getattr(preprocessor, "ordinal_columns", [])
+    return [
+        col in preprocessor.vocabularies and col not in ordinal and not preprocessor.scale_categorical
+        for col in preprocessor.feature_columns
+    ]
+
+
 class StrokePredictionModel:
     """
     A class for building, training, and evaluating machine learning models for stroke prediction.
@@ -22,13 +157,21 @@ class StrokePredictionModel:
         features (pd.DataFrame): Independent variables extracted from the dataset.
         labels (pd.Series): Target variable (Diagnosis) extracted from the dataset.
         model: Trained machine learning model.
+        compiled (CompiledForest): NumPy-only copy of a trained tree ensemble, used for small
+            prediction batches when the estimator is supported.
+        preprocessor (PreprocessingPipeline): Fitted preprocessing saved alongside the model.
+        metrics (dict): Evaluation metrics of the last training run.
+        evaluation (EvaluationReport): Test-set evaluation of the last training run, saved with
+            the artifact so its charts can be rendered without running the model.
+        manifest (dict): Description of the saved or loaded artifact (features, metrics, data hash).
     """
-    def __init__(self, data=None):
+    def __init__(self, data=None, preprocessor=None):
         """
         Initialize the StrokePredictionModel with data and pre-process features and labels.
 
         Args:
             data (pd.DataFrame): Pre-processed dataset containing features and target variable.
+            preprocessor (PreprocessingPipeline): Pipeline that produced `data`, persisted with the model.
         """
         self.data = data
         if data is not None:
@@ -38,14 +181,34 @@ class StrokePredictionModel:
             self.features = None
             self.labels = None
         self.model = None
+        self.compiled = None
+        self.preprocessor = preprocessor
+        self.metrics = None
+        self.evaluation = None
+        self.manifest = None
 
-    def train_model(self, model_type="RandomForest", params=None):
+    @timed("train")
+    def train_model(self, model_type="RandomForest", params=None, search="grid", n_jobs=None, search_options=None,
+                    progress_callback=None):
         """
         Train a machine learning model using the specified algorithm and hyperparameters.
 
         Args:
-            model_type (str): Type of model to train. Options: 'RandomForest', 'SVM', 'GradientBoosting'.
-            params (dict): Hyperparameter grid for fine-tuning using GridSearchCV.
+            model_type (str): Type of model to train, one of `MODEL_TYPES`: 'RandomForest', 'SVM',
+                'SVMApprox', 'GradientBoosting', 'HistGradientBoosting', 'LogisticRegression', 'SGD'
+                or 'NaiveBayes'. 'HistGradientBoosting' expects a preprocessor created with
+                `scale_categorical=False` so that it can use the category codes natively.
+            params (dict): Hyperparameter grid (or distributions) for fine-tuning. For 'SVMApprox'
+                prefix the names with the step, e.g. 'nystroem__gamma' or 'logisticregression__C'.
+            search (str): Search strategy used when `params` is given. Options: 'grid', 'random',
+                'halving_grid', 'halving_random'.
+            n_jobs (int): Number of worker processes evaluating CV folds and candidates
+                (-1 uses all cores, None uses a single core).
+            search_options (dict): Extra arguments for the search, e.g. `cv`, `n_iter` for
+                randomized search, or `factor`, `min_resources`, `max_resources` and
+                `resource` as budget controls for successive halving.
+            progress_callback (callable): Called with keyword progress fields (phase, candidate
+                and fit counters) while training. It may raise to abort training.
 
         Returns:
             tuple: Test features (X_test) and test labels (y_test).
@@ -53,30 +216,257 @@ class StrokePredictionModel:
         X_train, X_test, y_train, y_test = train_test_split(self.features, self.labels, test_size=0.2, random_state=42)
 
         # Select model type
-        if model_type == "RandomForest":
-            self.model = RandomForestClassifier(random_state=42)
-        elif model_type == "SVM":
-            self.model = SVC(probability=True, random_state=42)
-        elif model_type == "GradientBoosting":
-            self.model = GradientBoostingClassifier(random_state=42)
-        else:
-            raise ValueError("Unsupported model type. Choose 'RandomForest', 'SVM', or 'GradientBoosting'.")
+        self.model = self._build_estimator(model_type)
+
+        report = progress_callback or (lambda **fields: None)
 
         # Hyperparameter tuning
         if params:
-            self.model = GridSearchCV(self.model, params, cv=5)
+            self.model = self._build_search(self.model, params, search, n_jobs, search_options)
+            self.model.progress_callback = progress_callback
 
         # Train the model
-        self.model.fit(X_train, y_train)
-        y_pred = self.model.predict(X_test)
+        report(phase="searching" if params else "fitting")
+        try:
+            self.model.fit(X_train, y_train)
+        finally:
+            if params:
+                self.model.progress_callback = None  # Keep the fitted search picklable
+        report(phase="evaluating")
+        self._evaluate(X_test, y_test)
+        if params:
+            self.metrics["best_params"] = self.model.best_params_
+        self.compiled = compile_estimator(self.model)
+
+        return X_test, y_test
+
+    @timed("train_streaming")
+    def train_streaming(self, chunks, model_type="SGD", epochs=1, test_size=0.2, work_folder=None,
+                        progress_callback=None):
+        """
+        Train a model without loading the whole dataset into memory.
+
+        The first pass over the chunks counts the rows, draws the test split and, unless a
+        fitted preprocessor was given, accumulates the preprocessing statistics. The second
+        pass encodes each chunk and either feeds it to the estimator's `partial_fit` (repeated
+        for every epoch) or writes it to a memory-mapped array that the estimator is fitted on.
+
+        Args:
+            chunks (callable): Called without arguments for every pass; returns an iterable of
+                raw DataFrame chunks including the 'Diagnosis' column.
+            model_type (str): One of `STREAMING_MODEL_TYPES`: 'SGD', 'NaiveBayes' or 'HistGradientBoosting'.
+            epochs (int): Number of passes over the training rows for `partial_fit` estimators.
+            test_size (float): Fraction of rows held out for evaluation.
+            work_folder (str): Directory for the temporary memory-mapped arrays (defaults to the
+                system temporary directory).
+            progress_callback (callable): Called with keyword progress fields (phase, epoch and
+                row counters) while training. It may raise to abort training.
+
+        Returns:
+            tuple: Test features (X_test) and test labels (y_test).
+        """
+        if model_type not in STREAMING_MODEL_TYPES:
+            raise ValueError(f"Unsupported streaming model type. Choose one of: {', '.join(STREAMING_MODEL_TYPES)}.")
+        report = progress_callback or (lambda **fields: None)
+        preprocessor = self.preprocessor
+        fit_preprocessor = preprocessor is None or not preprocessor.is_fitted
+        if fit_preprocessor:
+            preprocessor = PreprocessingPipeline(
+                target_column="Diagnosis", scale_categorical=model_type not in NATIVE_CATEGORICAL_MODEL_TYPES
+            )
+
+        # First pass: preprocessing statistics and the test split
+        report(phase="scanning")
+        rng = np.random.default_rng(42)
+        test_masks = []
+        for chunk in chunks():
+            if fit_preprocessor:
+                preprocessor.partial_fit(chunk)
+            test_masks.append(rng.random(len(chunk)) < test_size)
+            report(phase="scanning", rows_scanned=sum(len(mask) for mask in test_masks))
+        if fit_preprocessor:
+            preprocessor.finalize()
+        self.preprocessor = preprocessor
+        n_rows = sum(len(mask) for mask in test_masks)
+        n_test = int(sum(mask.sum() for mask in test_masks))
+        n_features = len(preprocessor.feature_columns)
+
+        self.model = self._build_estimator(model_type)
+        incremental = hasattr(self.model, "partial_fit")
+        X_test = np.empty((n_test, n_features), dtype=np.float32)
+        y_test = np.empty(n_test, dtype=np.int8)
+        y_train = None if incremental else np.empty(n_rows - n_test, dtype=np.int8)
+
+        with tempfile.TemporaryDirectory(dir=work_folder) as folder:
+            X_train = None
+            if not incremental:
+                X_train = np.memmap(os.path.join(folder, "features.dat"), dtype=np.float32, mode="w+",
+                                    shape=(n_rows - n_test, n_features))
+
+            # Second pass (repeated per epoch for incremental estimators): encode and learn
+            for epoch in range(epochs if incremental else 1):
+                train_offset = test_offset = rows_done = 0
+                for chunk, test_mask in zip(chunks(), test_masks):
+                    processed = preprocessor.transform(chunk)
+                    features = processed[preprocessor.feature_columns].to_numpy(dtype=np.float32)
+                    labels = processed["Diagnosis"].to_numpy(dtype=np.int8)
+                    if epoch == 0:
+                        X_test[test_offset:test_offset + test_mask.sum()] = features[test_mask]
+                        y_test[test_offset:test_offset + test_mask.sum()] = labels[test_mask]
+                        test_offset += test_mask.sum()
+                    train_rows = (~test_mask).sum()
+                    if incremental:
+                        train_features = pd.DataFrame(features[~test_mask], columns=preprocessor.feature_columns)
+                        self.model.partial_fit(train_features, labels[~test_mask], classes=[0, 1])
+                    else:
+                        X_train[train_offset:train_offset + train_rows] = features[~test_mask]
+                        y_train[train_offset:train_offset + train_rows] = labels[~test_mask]
+                    train_offset += train_rows
+                    rows_done += len(chunk)
+                    report(phase="streaming", epoch=epoch + 1, epochs=epochs, rows_done=rows_done, rows_total=n_rows)
+
+            if not incremental:
+                X_train.flush()
+                report(phase="fitting")
+                # Wrapping the memory map without copying keeps the feature names on the estimator
+                self.model.fit(pd.DataFrame(X_train, columns=preprocessor.feature_columns, copy=False), y_train)
+                del X_train
+
+        X_test = pd.DataFrame(X_test, columns=preprocessor.feature_columns)
+        y_test = pd.Series(y_test, name="Diagnosis")
+
+        report(phase="evaluating")
+        self._evaluate(X_test, y_test, f"streamed {n_rows} rows")
+        self.compiled = compile_estimator(self.model)
+        return X_test, y_test
+
+    def _evaluate(self, X_test, y_test, note=None):
+        """
+        Evaluate the trained model on the test set with a single prediction pass.
+
+        The positive-class probabilities are computed once and summarized in an
+        `EvaluationReport` (kept in `evaluation` and saved with the artifact), from which
+        `metrics` and the prediction graphs are derived.
+
+        Args:
+            X_test (pd.DataFrame): Test features.
+            y_test (pd.Series): True test labels.
+            note (str): Detail appended to the logged accuracy.
+        """
+        proba = self.model.predict_proba(X_test)[:, list(self.model.classes_).index(1)]
+        self.evaluation = EvaluationReport(y_test, proba)
+        self.metrics = self.evaluation.metrics
+        logger.info(f"Model Accuracy: {self.evaluation.accuracy * 100:.2f}%" + (f" ({note})" if note else ""))
+        logger.info("\n" + classification_report(self.evaluation.y_true, self.evaluation.proba > 0.5, zero_division=0))
+
+    @property
+    def supports_incremental(self):
+        """bool: Whether the fitted estimator can continue training on new rows with `train_incremental`."""
+        estimator = getattr(self.model, "best_estimator_", self.model)
+        return estimator is not None and (
+            isinstance(estimator, tuple(WARM_START_PARAMS)) or hasattr(estimator, "partial_fit")
+        )
+
+    @timed("train_incremental")
+    def train_incremental(self, new_data, n_estimators=20, epochs=1, test_size=0.2, progress_callback=None):
+        """
+        Continue training the fitted model on new rows only, instead of retraining from scratch.
+
+        The new rows are encoded with the model's own preprocessing pipeline, unchanged, so the
+        features keep the scale the model was trained on. Tree ensembles keep their fitted trees
+        and add `n_estimators` trees (or boosting iterations) fitted on the new rows; estimators
+        with `partial_fit` make `epochs` passes over them. Part of the new rows is held out for
+        evaluation.
+
+        Args:
+            new_data (pd.DataFrame): Raw new rows including the 'Diagnosis' column.
+            n_estimators (int): Trees or boosting iterations added to tree ensembles.
+            epochs (int): Number of passes over the new rows for `partial_fit` estimators.
+            test_size (float): Fraction of the new rows held out for evaluation.
+            progress_callback (callable): Called with keyword progress fields (phase, epoch)
+                while training. It may raise to abort training.
+
+        Returns:
+            tuple: Test features (X_test) and test labels (y_test).
+
+        Raises:
+            ValueError: If no model is loaded or it cannot be trained incrementally.
+        """
+        if self.model is None or self.preprocessor is None:
+            raise ValueError("No model loaded. Use 'load_model' to load a saved model.")
+        if not self.supports_incremental:
+            estimator_name = type(getattr(self.model, "best_estimator_", self.model)).__name__
+            raise ValueError(f"{estimator_name} cannot be trained incrementally. Retrain it from scratch.")
+        report = progress_callback or (lambda **fields: None)
+        self.model = getattr(self.model, "best_estimator_", self.model)
 
-        # Log model performance metrics
-        accuracy = accuracy_score(y_test, y_pred)
-        logger.info(f"Model Accuracy: {accuracy * 100:.2f}%")
-        logger.info("\n" + classification_report(y_test, y_pred))
+        processed = self.preprocessor.transform(new_data)
+        features = processed[self.preprocessor.feature_columns]
+        labels = processed["Diagnosis"].astype(int)
+        X_train, X_test, y_train, y_test = train_test_split(features, labels, test_size=test_size, random_state=42)
+
+        report(phase="fitting")
+        param = next((name for cls, name in WARM_START_PARAMS.items() if isinstance(self.model, cls)), None)
+        if param is not None:
+            # Early stopping may have ended boosting before max_iter; count from the iterations actually fitted
+            fitted = getattr(self.model, "n_iter_", None) if param == "max_iter" else None
+            self.model.set_params(warm_start=True, **{param: (fitted or getattr(self.model, param)) + n_estimators})
+            self.model.fit(X_train, y_train)
+        else:
+            for epoch in range(epochs):
+                self.model.partial_fit(X_train, y_train)
+                report(phase="fitting", epoch=epoch + 1, epochs=epochs)
 
+        report(phase="evaluating")
+        self._evaluate(X_test, y_test, f"continued on {len(new_data)} new rows")
+        self.metrics["incremental"] = {
+            "new_rows": len(new_data), param or "epochs": getattr(self.model, param) if param else epochs
+        }
+        self.compiled = compile_estimator(self.model)
         return X_test, y_test
-    
+
+    def _build_estimator(self, model_type):
+        """
+        Create an unfitted estimator of the given type.
+
+        Args:
+            model_type (str): One of `MODEL_TYPES`.
+
+        Returns:
+            The unfitted estimator.
+        """
+        if model_type not in MODEL_TYPES:
+            raise ValueError(f"Unsupported model type. Choose one of: {', '.join(MODEL_TYPES)}.")
+        categorical = categorical_mask(self.preprocessor) if self.preprocessor is not None else []
+        return MODEL_TYPES[model_type](categorical)
+
+    @staticmethod
+    def _build_search(estimator, params, search="grid", n_jobs=None, search_options=None):
+        """
+        Wrap an estimator in the requested hyperparameter search.
+
+        Args:
+            estimator: The unfitted estimator to tune.
+            params (dict): Hyperparameter grid or distributions.
+            search (str): Search strategy, one of `SEARCH_STRATEGIES`.
+            n_jobs (int): Number of worker processes for the search.
+            search_options (dict): Extra keyword arguments for the search class.
+
+        Returns:
+            The unfitted search object.
+        """
+        if search not in SEARCH_STRATEGIES:
+            raise ValueError(f"Unsupported search strategy. Choose one of: {', '.join(SEARCH_STRATEGIES)}.")
+        options = {"cv": 5, "n_jobs": n_jobs}
+        if search != "grid":
+            options["random_state"] = 42
+        options.update(search_options or {})
+        search_class = SEARCH_STRATEGIES[search]
+        param_argument = "param_grid" if search in ("grid", "halving_grid") else "param_distributions"
+        logger.info(f"Hyperparameter search: {search} with n_jobs={options['n_jobs']}.")
+        return search_class(estimator, **{param_argument: params}, **options)
+
+    @timed("predict")
     def predict(self, new_data):
         """
         Make predictions using the trained model.
@@ -89,83 +479,194 @@ class StrokePredictionModel:
         """
         if self.model is None:
             raise ValueError("No model loaded. Use 'load_model' to load a saved model.")
+        if self.compiled is not None and len(new_data) <= MAX_COMPILED_ROWS:
+            return self.compiled.predict(new_data)
         return self.model.predict(new_data)
-    
-    def save_model(self, model_path="models/model.joblib"):
+
+    @timed("predict")
+    def predict_proba(self, new_data):
+        """
+        Predict class probabilities using the trained model.
+
+        Args:
+            new_data (pd.DataFrame): Pre-processed data for which probabilities are required.
+
+        Returns:
+            np.ndarray: Array of shape (n_samples, n_classes) with class probabilities.
+        """
+        if self.model is None:
+            raise ValueError("No model loaded. Use 'load_model' to load a saved model.")
+        if self.compiled is not None and len(new_data) <= MAX_COMPILED_ROWS:
+            return self.compiled.predict_proba(new_data)
+        return self.model.predict_proba(new_data)
+
+    def preprocess(self, raw_data):
+        """
+        Transform raw input rows with the fitted preprocessing pipeline (no refitting).
+
+        Args:
+            raw_data (pd.DataFrame): Raw rows containing the selected feature columns.
+
+        Returns:
+            pd.DataFrame: Features ready to be passed to `predict` or `predict_proba`.
+        """
+        if self.preprocessor is None:
+            raise ValueError("Model has no fitted preprocessing pipeline. Retrain the model.")
+        return self.preprocessor.transform(raw_data)
+
+    def preprocess_records(self, records):
         """
-        Save the trained model to the specified file path.
+        Transform a few raw records with the fitted preprocessing pipeline (no refitting),
+        through its record-level fast path.
+
+        Args:
+            records (list): Dicts containing the selected feature fields.
+
+        Returns:
+            pd.DataFrame: Features ready to be passed to `predict` or `predict_proba`.
+        """
+        if self.preprocessor is None:
+            raise ValueError("Model has no fitted preprocessing pipeline. Retrain the model.")
+        return self.preprocessor.transform_records(records)
+
+    @timed("model_save")
+    def save_model(self, model_path="models/model.joblib", data_hash=None, compress=0):
+        """
+        Save the trained model and its preprocessing pipeline as a single compact artifact.
+
+        Only the fitted estimator is stored (the best estimator of a hyperparameter search,
+        without its CV results, which also replaces the search in memory), together with the
+        preprocessing pipeline, the compiled tree arrays and a manifest. The manifest is also written next to the artifact as JSON.
+        Uncompressed artifacts can be loaded with `mmap_mode='r'`, so worker processes share
+        the page-cache copy of the NumPy arrays instead of each holding their own.
 
         Args:
             model_path (str): Path where the model will be saved.
+            data_hash (str): Content hash of the training dataset, recorded in the manifest.
+            compress (int): joblib compression level (0 keeps the artifact memory-mappable).
         """
         os.makedirs(os.path.dirname(model_path), exist_ok=True)
+        self.manifest = self._build_manifest(data_hash)
+        # Keep the same estimator in memory as in the artifact, dropping the search state
+        self.model = getattr(self.model, "best_estimator_", self.model)
+        artifact = {
+            "format_version": ARTIFACT_FORMAT_VERSION,
+            "model": self.model,
+            "preprocessor": self.preprocessor,
+            "compiled": self.compiled,
+            "evaluation": self.evaluation,
+            "manifest": self.manifest,
+        }
+        manifest_path = f"{os.path.splitext(model_path)[0]}.manifest.json"
         try:
-            dump(self.model, model_path)
+            # Write to a temporary file first so readers never see a partially written artifact
+            tmp_path = f"{model_path}.{uuid.uuid4().hex}.tmp"
+            dump(artifact, tmp_path, compress=compress)
+            os.replace(tmp_path, model_path)
+            tmp_path = f"{manifest_path}.{uuid.uuid4().hex}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(self.manifest, f, indent=2, default=str)
+            os.replace(tmp_path, manifest_path)
             logger.info(f"Model saved at: {model_path}")
         except Exception as e:
             logger.error(f"Error saving model: {e}")
             raise
 
-    def load_model(self, model_path="models/model.joblib"):
+    def _build_manifest(self, data_hash=None):
         """
-        Load a trained model from the specified file path.
+        Describe the trained model for the artifact manifest.
+
+        Args:
+            data_hash (str): Content hash of the training dataset.
+
+        Returns:
+            dict: JSON-serializable description of the features, estimator and metrics.
+        """
+        estimator = getattr(self.model, "best_estimator_", self.model)
+        preprocessor = self.preprocessor
+        features = list(preprocessor.feature_columns) if preprocessor is not None else []
+        return {
+            "format_version": ARTIFACT_FORMAT_VERSION,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "estimator": type(estimator).__name__,
+            "sklearn_version": sklearn.__version__,
+            "features": features,
+            "feature_dtypes": {
+                col: ("ordinal" if col in getattr(preprocessor, "ordinal_columns", []) else "category")
+                if col in preprocessor.vocabularies else "float32"
+                for col in features
+            },
+            "vocabularies": dict(preprocessor.vocabularies) if preprocessor is not None else {},
+            "unknown_code": getattr(preprocessor, "unknown_code", None),
+            "target_vocabulary": preprocessor.target_vocabulary if preprocessor is not None else None,
+            "metrics": self.metrics,
+            "training_data_hash": data_hash,
+            "compiled": self.compiled is not None,
+        }
+
+    @timed("model_load")
+    def load_model(self, model_path="models/model.joblib", mmap_mode="r"):
+        """
+        Load a trained model (and its preprocessing pipeline) from the specified file path.
 
         Args:
             model_path (str): Path to the saved model file.
+            mmap_mode (str): Memory-map the NumPy arrays of uncompressed artifacts ('r' shares
+                them read-only between processes, None loads them into memory).
+
+        Raises:
+            FileNotFoundError: If the file does not exist.
+            ValueError: If the artifact was written with a newer `ARTIFACT_FORMAT_VERSION`.
         """
         if not os.path.exists(model_path):
             raise FileNotFoundError(f"Model file not found at: {model_path}")
         try:
-            self.model = load(model_path)
+            artifact = load(model_path, mmap_mode=mmap_mode)
+            if isinstance(artifact, dict):
+                format_version = artifact.get("format_version", 1)
+                if not isinstance(format_version, int) or not 1 <= format_version <= ARTIFACT_FORMAT_VERSION:
+                    raise ValueError(
+                        f"Unsupported model artifact format version {format_version!r} in {model_path}: this "
+                        f"version reads formats 1 to {ARTIFACT_FORMAT_VERSION}. Upgrade the application or "
+                        "retrain the model."
+                    )
+                self.model = artifact["model"]
+                self.preprocessor = artifact.get("preprocessor")
+                self.compiled = artifact.get("compiled")
+                self.evaluation = artifact.get("evaluation")
+                self.manifest = artifact.get("manifest")
+                self.metrics = (self.manifest or {}).get("metrics")
+            else:  # Legacy artifact containing only the estimator
+                self.model = artifact
+                self.preprocessor = None
+            if self.compiled is None:
+                self.compiled = compile_estimator(self.model)
             logger.info(f"Model loaded from: {model_path}")
         except Exception as e:
             logger.error(f"Error loading model: {e}")
             raise
 
-    def generate_prediction_graphs(self, X_test, y_test, static_folder):
+    @timed("prediction_graphs")
+    def generate_prediction_graphs(self, static_folder):
         """
-        Generate visualizations (confusion matrix and ROC curve) for the model predictions.
+        Save the charts of the evaluation report (confusion matrix, ROC and precision-recall
+        curves, calibration) as SVG files. Nothing is predicted: the charts are drawn from
+        the report computed during training.
 
         Args:
-            X_test (pd.DataFrame): Test features.
-            y_test (pd.Series): True labels for the test set.
             static_folder (str): Directory to save the generated graphs.
 
         Returns:
-            dict: Filenames of the generated graphs.
+            dict: Filenames of the generated graphs, by chart name.
         """
-        if self.model is None:
+        if self.evaluation is None:
             raise ValueError("Model not trained or loaded.")
-        
-        y_pred = self.model.predict(X_test)
-        y_pred_proba = self.model.predict_proba(X_test)[:, 1]
-
-        # Confusion Matrix
-        cm = confusion_matrix(y_test, y_pred)
-        plt.figure(figsize=(8, 6))
-        sns.heatmap(cm, annot=True, fmt="d", cmap="Blues")
-        plt.title("Confusion Matrix")
-        plt.xlabel("Predicted")
-        plt.ylabel("True")
-        cm_filename = f"cm_{uuid.uuid4().hex}.png"
-        cm_path = os.path.join(static_folder, cm_filename)
-        plt.savefig(cm_path)
-        plt.close()
-
-        # ROC Curve
-        fpr, tpr, _ = roc_curve(y_test, y_pred_proba)
-        roc_auc = auc(fpr, tpr)
-        plt.figure(figsize=(8, 6))
-        plt.plot(fpr, tpr, color="blue", label=f"AUC = {roc_auc:.2f}")
-        plt.plot([0, 1], [0, 1], color="gray", linestyle="--")
-        plt.title("ROC Curve")
-        plt.xlabel("False Positive Rate")
-        plt.ylabel("True Positive Rate")
-        plt.legend(loc="lower right")
-        roc_filename = f"roc_{uuid.uuid4().hex}.png"
-        roc_path = os.path.join(static_folder, roc_filename)
-        plt.savefig(roc_path)
-        plt.close()
-
-        logger.info(f"Generated graphs: {cm_path}, {roc_path}")
-        return {"confusion_matrix": cm_filename, "roc_curve": roc_filename}
+        os.makedirs(static_folder, exist_ok=True)
+        graphs = {}
+        for chart in CHARTS:
+            filename = f"{chart}_{uuid.uuid4().hex}.svg"
+            with open(os.path.join(static_folder, filename), "w") as f:
+                f.write(self.evaluation.render_svg(chart))
+            graphs[chart] = filename
+        logger.info(f"Generated graphs: {', '.join(graphs.values())}")
+        return graphs
@@ -0,0 +1,128 @@
+import threading
+import time
+from collections import OrderedDict
+from src.metrics import REGISTRY
+
+PREDICTION_CACHE_REQUESTS = REGISTRY.counter(
+    "stroke_prediction_cache_requests_total", "Prediction cache lookups, by result ('hit' or 'miss').", ["result"]
+)
+
+
+class PredictionCache:
+    """
+    Bounded LRU cache of prediction results with a time to live.
+
+    Entries are keyed by the encoded feature vector of a record (see
+    `PreprocessingPipeline.encode_record`) and belong to one model version. The first
+    lookup or insert with another version drops every entry, so results of a replaced
+    model are never served, whether it was published by this process or reloaded from disk.
+
+    Attributes:
+        max_entries (int): Maximum number of cached results (0 disables the cache).
+        ttl (float): Seconds a result stays valid (None keeps it until evicted, 0 disables the cache).
+        version (str): Model version of the cached results.
+        hits (int): Lookups answered from the cache in this process.
+        misses (int): Lookups that were not.
+    """
+    def __init__(self, max_entries=10000, ttl=300.0):
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_entries (int): Maximum number of cached results (0 disables the cache).
+            ttl (float): Seconds a result stays valid (None keeps it until evicted, 0 disables the cache).
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.version = None
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return self.max_entries > 0 and (self.ttl is None or self.ttl > 0)
+
+    def get_many(self, version, keys):
+        """
+        Look up the results of several records.
+
+        Args:
+            version (str): Version of the model that would score the records.
+            keys (list): Encoded feature vectors of the records.
+
+        Returns:
+            list: The cached result of each key, or None where it is missing or expired.
+        """
+        now = time.monotonic()
+        results = []
+        with self._lock:
+            self._switch_version(version)
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is not None and (entry[0] is None or entry[0] > now):
+                    self._entries.move_to_end(key)
+                    results.append(entry[1])
+                else:
+                    if entry is not None:
+                        del self._entries[key]
+                    results.append(None)
+            hits = sum(result is not None for result in results)
+            self.hits += hits
+            self.misses += len(keys) - hits
+        if hits:
+            PREDICTION_CACHE_REQUESTS.inc(hits, result="hit")
+        if len(keys) - hits:
+            PREDICTION_CACHE_REQUESTS.inc(len(keys) - hits, result="miss")
+        return results
+
+    def put_many(self, version, items):
+        """
+        Store results, evicting the least recently used ones beyond `max_entries`.
+
+        Args:
+            version (str): Version of the model that produced the results.
+            items (list): (key, result) pairs.
+        """
+        if not self.enabled:
+            return
+        expires = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._switch_version(version)
+            for key, result in items:
+                self._entries[key] = (expires, result)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """
+        Drop every cached result.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """
+        Returns:
+            dict: Hit and miss counters, hit ratio, size and limits of the cache in this process.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "model_version": self.version,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else None,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl": self.ttl,
+            }
+
+    def _switch_version(self, version):
+        # Called with the lock held
+        if version != self.version:
+            self._entries.clear()
+            self.version = version
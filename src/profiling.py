@@ -0,0 +1,191 @@
+import cProfile
+import io
+import json
+import os
+import pstats
+import re
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from logging import getLogger
+
+# Initialize a logger for this module
+logger = getLogger(__name__)
+
+# Names of stored profiles: UTC timestamp plus a random suffix
+_PROFILE_NAME = re.compile(r"\d{8}T\d{6}-[0-9a-f]{12}")
+
+
+# Status reported instead of a profile id when profiling was requested but could not start
+PROFILER_BUSY = "not profiled: another profile active"
+
+# cProfile allows one active profiler per process (Python 3.12+), so profiles never overlap
+_profiler_lock = threading.Lock()
+
+
+def start_profiler():
+    """
+    Start a cProfile profiler for the calling thread, unless another one is running.
+
+    Returns:
+        cProfile.Profile: The running profiler (stopped with `stop_profiler` or
+        `ProfileStore.save`), or None if another profiler is already active.
+    """
+    if not _profiler_lock.acquire(blocking=False):
+        return None
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError as e:  # Another profiling tool, outside of this module
+        _profiler_lock.release()
+        logger.warning(f"Profiling skipped: {e}")
+        return None
+    return profiler
+
+
+def stop_profiler(profiler):
+    """
+    Stop a profiler started by `start_profiler`, allowing the next one to start.
+
+    Args:
+        profiler (cProfile.Profile): The running profiler.
+    """
+    try:
+        profiler.disable()
+    finally:
+        _profiler_lock.release()
+
+
+class ProfileStore:
+    """
+    Size-capped folder of cProfile results.
+
+    Each profile is stored as `<name>.prof` (loadable with `pstats` or snakeviz) next to
+    `<name>.json` describing the profiled request. Once the folder exceeds `max_bytes`,
+    the oldest profiles are deleted.
+
+    Attributes:
+        folder (str): Directory holding the profiles, shared by worker processes.
+        max_bytes (int): Maximum total size of the stored profiles.
+    """
+    def __init__(self, folder, max_bytes=200 * 1024 ** 2):
+        """
+        Initialize the store.
+
+        Args:
+            folder (str): Directory holding the profiles.
+            max_bytes (int): Maximum total size of the stored profiles.
+        """
+        self.folder = folder
+        self.max_bytes = max_bytes
+        os.makedirs(folder, exist_ok=True)
+
+    def save(self, profiler, metadata):
+        """
+        Stop a profiler and store its results.
+
+        Args:
+            profiler (cProfile.Profile): The profiler to stop.
+            metadata (dict): JSON-serializable description of the profiled work.
+
+        Returns:
+            str: Name of the stored profile.
+        """
+        stop_profiler(profiler)
+        name = f"{datetime.now(timezone.utc):%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:12]}"
+        path = self._path(name, ".prof")
+        profiler.dump_stats(f"{path}.tmp")
+        os.replace(f"{path}.tmp", path)
+        metadata = {"name": name, "created_at": time.time(), "pid": os.getpid(), **metadata,
+                    "size": os.path.getsize(path)}
+        with open(f"{self._path(name, '.json')}.tmp", "w") as f:
+            json.dump(metadata, f)
+        os.replace(f"{self._path(name, '.json')}.tmp", self._path(name, ".json"))
+        logger.info(f"Profile {name} saved for {metadata.get('method', '')} {metadata.get('path', '')}".rstrip())
+        self._prune()
+        return name
+
+    def list(self):
+        """
+        Describe the stored profiles, newest first.
+
+        Returns:
+            list: Metadata dict of each profile.
+        """
+        profiles = []
+        for file in os.listdir(self.folder):
+            if not file.endswith(".json") or not self.is_valid_name(file[:-5]):
+                continue
+            try:
+                with open(os.path.join(self.folder, file)) as f:
+                    profiles.append(json.load(f))
+            except (OSError, ValueError):
+                continue  # Deleted by a concurrent prune or still being written
+        return sorted(profiles, key=lambda profile: profile["created_at"], reverse=True)
+
+    def path(self, name):
+        """
+        Path of a stored profile.
+
+        Args:
+            name (str): Profile name, as returned by `save` or `list`.
+
+        Returns:
+            str: Path of the .prof file, or None if the name is invalid or unknown.
+        """
+        if not self.is_valid_name(name):
+            return None
+        path = self._path(name, ".prof")
+        return path if os.path.exists(path) else None
+
+    def report(self, name, sort="cumulative", limit=40):
+        """
+        Render the most expensive functions of a stored profile as text.
+
+        Args:
+            name (str): Profile name.
+            sort (str): pstats sort key (e.g. 'cumulative', 'tottime', 'ncalls').
+            limit (int): Number of functions listed.
+
+        Returns:
+            str: The pstats report, or None if the profile does not exist.
+
+        Raises:
+            KeyError: If `sort` is not a valid pstats sort key.
+        """
+        path = self.path(name)
+        if path is None:
+            return None
+        output = io.StringIO()
+        pstats.Stats(path, stream=output).sort_stats(sort).print_stats(limit)
+        return output.getvalue()
+
+    @staticmethod
+    def is_valid_name(name):
+        return bool(_PROFILE_NAME.fullmatch(name or ""))
+
+    def _path(self, name, extension):
+        return os.path.join(self.folder, f"{name}{extension}")
+
+    def _prune(self):
+        """
+        Delete the oldest profiles until the folder fits in `max_bytes`.
+        """
+        profiles, total = {}, 0
+        for entry in os.scandir(self.folder):
+            name, extension = os.path.splitext(entry.name)
+            if extension in (".prof", ".json") and self.is_valid_name(name):
+                size = entry.stat().st_size
+                profiles[name] = profiles.get(name, 0) + size
+                total += size
+        for name in sorted(profiles):  # Names start with the creation time
+            if total <= self.max_bytes:
+                break
+            for extension in (".prof", ".json"):
+                try:
+                    os.remove(self._path(name, extension))
+                except FileNotFoundError:
+                    pass
+            total -= profiles[name]
+            logger.info(f"Removed old profile: {name}")
@@ -0,0 +1,302 @@
+import json
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from logging import getLogger
+
+# Initialize a logger for this module
+logger = getLogger(__name__)
+
+
+# Minimum number of seconds between two writes of a job's progress to the state folder
+PROGRESS_SAVE_INTERVAL = 0.5
+
+
+def _state_path(state_folder, job_id):
+    return os.path.join(state_folder, f"{job_id}.json")
+
+
+def _cancel_path(state_folder, job_id):
+    return os.path.join(state_folder, f"{job_id}.cancel")
+
+
+class TrainingCancelled(Exception):
+    """Raised inside a training job when its cancellation has been requested."""
+
+
+class TrainingJob:
+    """
+    State of one background training job.
+
+    Attributes:
+        job_id (str): Unique identifier of the job.
+        status (str): One of 'queued', 'running', 'succeeded', 'failed' or 'cancelled'.
+        progress (dict): Latest progress fields (phase, candidate and fit counters).
+        result (dict): Outcome of a successful job (model version, metrics, graphs).
+        error (str): Error message of a failed job.
+    """
+    def __init__(self, description=None, state_folder=None):
+        """
+        Initialize a queued job.
+
+        Args:
+            description (dict): JSON-serializable summary of the submitted training request.
+            state_folder (str): Directory where the job state is shared with other processes.
+        """
+        self.job_id = uuid.uuid4().hex
+        self.state_folder = state_folder
+        self.description = description or {}
+        self.status = "queued"
+        self.progress = {"phase": "queued"}
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self._cancel_event = threading.Event()
+        self._lock = threading.Lock()
+        self._last_saved = 0.0
+
+    @property
+    def is_finished(self):
+        """bool: Whether the job reached a final status."""
+        return self.status in ("succeeded", "failed", "cancelled")
+
+    def update_progress(self, **fields):
+        """
+        Record progress fields reported by the training code.
+
+        Raises:
+            TrainingCancelled: If cancellation was requested, to stop the training early.
+        """
+        with self._lock:
+            self.progress.update(fields)
+        if time.monotonic() - self._last_saved >= PROGRESS_SAVE_INTERVAL:
+            self.save()
+        self.check_cancelled()
+
+    def check_cancelled(self):
+        """
+        Raises:
+            TrainingCancelled: If cancellation was requested, in this or another process.
+        """
+        if not self._cancel_event.is_set() and self.state_folder is not None \
+                and os.path.exists(_cancel_path(self.state_folder, self.job_id)):
+            self._cancel_event.set()
+        if self._cancel_event.is_set():
+            raise TrainingCancelled(f"Training job {self.job_id} was cancelled.")
+
+    def cancel(self):
+        """
+        Request cancellation. A running job stops at its next progress report.
+
+        Returns:
+            bool: False if the job had already finished.
+        """
+        if self.is_finished:
+            return False
+        self._cancel_event.set()
+        with self._lock:
+            if self.status == "queued":
+                self.status = "cancelled"
+                self.finished_at = time.time()
+        self.save()
+        return True
+
+    def to_dict(self):
+        """
+        Describe the job for the status API.
+
+        Returns:
+            dict: JSON-serializable job state, including the elapsed time in seconds.
+        """
+        with self._lock:
+            end = self.finished_at or time.time()
+            return {
+                "job_id": self.job_id,
+                "status": self.status,
+                "description": self.description,
+                "progress": dict(self.progress),
+                "elapsed_seconds": round(end - self.started_at, 3) if self.started_at else 0.0,
+                "cancel_requested": self._cancel_event.is_set(),
+                "result": self.result,
+                "error": self.error,
+            }
+
+    def save(self):
+        """
+        Write the job state to the shared state folder, if any, for status queries from other processes.
+        """
+        if self.state_folder is None:
+            return
+        self._last_saved = time.monotonic()
+        path = _state_path(self.state_folder, self.job_id)
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(self.to_dict(), f, default=str)
+            os.replace(tmp_path, path)  # Readers never see a partially written state file
+        except OSError as e:
+            logger.error(f"Error saving state of training job {self.job_id}: {e}")
+
+    def _run(self, target, kwargs):
+        """
+        Execute the job's target and record its outcome.
+        """
+        try:
+            self.check_cancelled()  # Cancellation may have been requested by another process
+        except TrainingCancelled:
+            self.cancel()
+        with self._lock:
+            if self.status == "cancelled":
+                return
+            self.status = "running"
+            self.started_at = time.time()
+        self.save()
+        try:
+            result = target(self, **kwargs)
+            status, error = "succeeded", None
+        except TrainingCancelled:
+            result, status, error = None, "cancelled", None
+            logger.info(f"Training job {self.job_id} cancelled.")
+        except Exception as e:
+            result, status, error = None, "failed", str(e)
+            logger.error(f"Training job {self.job_id} failed: {e}")
+        with self._lock:
+            self.result, self.status, self.error = result, status, error
+            self.progress["phase"] = status
+            self.finished_at = time.time()
+        self.save()
+
+
+class TrainingJobManager:
+    """
+    Run training jobs on a background executor and keep their state for the status API.
+
+    When a `state_folder` is given, every job's state is also written there, so any worker
+    process of a multi-process server can report the status of a job or request its
+    cancellation, whichever process runs it.
+
+    Attributes:
+        max_workers (int): Number of jobs that may run at the same time in this process.
+        max_finished_jobs (int): Number of finished jobs retained for status queries.
+        state_folder (str): Directory holding the shared job states, or None.
+    """
+    def __init__(self, max_workers=1, max_finished_jobs=100, state_folder=None):
+        """
+        Initialize the manager. The executor is created on first submission.
+
+        Args:
+            max_workers (int): Number of jobs that may run at the same time in this process.
+            max_finished_jobs (int): Number of finished jobs retained for status queries.
+            state_folder (str): Directory holding the shared job states (None keeps them in memory only).
+        """
+        self.max_workers = max_workers
+        self.max_finished_jobs = max_finished_jobs
+        self.state_folder = state_folder
+        self._jobs = OrderedDict()
+        self._executor = None
+        self._executor_pid = None
+        self._lock = threading.Lock()
+        if state_folder is not None:
+            os.makedirs(state_folder, exist_ok=True)
+
+    def submit(self, target, description=None, **kwargs):
+        """
+        Queue a training job.
+
+        Args:
+            target (callable): Function called as `target(job, **kwargs)` in the background.
+                Its return value becomes the job result.
+            description (dict): JSON-serializable summary of the training request.
+
+        Returns:
+            TrainingJob: The queued job.
+        """
+        job = TrainingJob(description, state_folder=self.state_folder)
+        job.save()
+        with self._lock:
+            if self._executor is None or self._executor_pid != os.getpid():
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="training-job")
+                self._executor_pid = os.getpid()
+            self._jobs[job.job_id] = job
+            self._prune()
+            self._executor.submit(job._run, target, kwargs)
+        logger.info(f"Training job {job.job_id} submitted.")
+        return job
+
+    def get(self, job_id):
+        """
+        Args:
+            job_id (str): Identifier of the job.
+
+        Returns:
+            TrainingJob: The job, or None if it is unknown to this process.
+        """
+        return self._jobs.get(job_id)
+
+    def status(self, job_id):
+        """
+        Describe a job run by this or, through the state folder, any other process.
+
+        Args:
+            job_id (str): Identifier of the job.
+
+        Returns:
+            dict: The job state as returned by `TrainingJob.to_dict`, or None if the job is unknown.
+        """
+        job = self._jobs.get(job_id)
+        if job is not None:
+            return job.to_dict()
+        if self.state_folder is None or not _is_job_id(job_id):
+            return None
+        try:
+            with open(_state_path(self.state_folder, job_id)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def cancel(self, job_id):
+        """
+        Request cancellation of a job run by this or any other process.
+
+        Args:
+            job_id (str): Identifier of the job.
+
+        Returns:
+            dict: The job state after the request, or None if the job is unknown.
+        """
+        job = self._jobs.get(job_id)
+        if job is not None:
+            job.cancel()
+            return job.to_dict()
+        state = self.status(job_id)
+        if state is None:
+            return None
+        if state["status"] in ("queued", "running"):
+            # The process running the job checks for this marker at its next progress report
+            open(_cancel_path(self.state_folder, job_id), "w").close()
+            state["cancel_requested"] = True
+        return state
+
+    def _prune(self):
+        """
+        Forget the oldest finished jobs beyond `max_finished_jobs`.
+        """
+        finished = [job_id for job_id, job in self._jobs.items() if job.is_finished]
+        for job_id in finished[:max(0, len(finished) - self.max_finished_jobs)]:
+            del self._jobs[job_id]
+            if self.state_folder is not None:
+                for path in (_state_path(self.state_folder, job_id), _cancel_path(self.state_folder, job_id)):
+                    if os.path.exists(path):
+                        os.remove(path)
+
+
+def _is_job_id(job_id):
+    """
+    Whether a client-supplied id has the form of a job id (and is safe to use in a path).
+    """
+    return len(job_id) == 32 and all(char in "0123456789abcdef" for char in job_id)
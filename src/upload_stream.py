@@ -0,0 +1,244 @@
+import csv
+import hashlib
+import io
+import os
+import queue
+import threading
+import uuid
+from logging import getLogger
+import pandas as pd
+from werkzeug.exceptions import BadRequest
+from src.config import DATASET_COLUMNS, SELECTED_COLUMNS
+from src.data_processing import PreprocessingPipeline
+from src.metrics import timed
+from src.utils import concat_frames, dataset_dtypes
+
+# Initialize a logger for this module
+logger = getLogger(__name__)
+
+# Longest accepted header line; a file without a newline by then is not a CSV dataset
+MAX_HEADER_BYTES = 64 * 1024
+
+
+class UploadRejected(BadRequest):
+    """
+    The uploaded file is not a valid dataset. Raised while the upload is still being received.
+    """
+
+
+class _QueueReader(io.RawIOBase):
+    """
+    Read-only file object over byte blocks put in a queue; None marks the end of the data.
+    """
+    def __init__(self, blocks):
+        self._blocks = blocks
+        self._buffer = b""
+        self._done = False
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        while not self._buffer and not self._done:
+            block = self._blocks.get()
+            if block is None:
+                self._done = True
+            else:
+                self._buffer = block
+        size = min(len(buffer), len(self._buffer))
+        buffer[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return size
+
+
+class UploadResult:
+    """
+    An upload stored on disk and parsed while it was received.
+
+    Attributes:
+        path (str): Temporary file holding the uploaded bytes.
+        digest (str): SHA-256 hex digest of the uploaded bytes.
+        data (pd.DataFrame): The `DATASET_COLUMNS` of the file, as returned by `load_csv`.
+        pipelines (dict): Fitted `PreprocessingPipeline` per cache name ('pipeline' with scaled
+            category codes, 'pipeline_native' without), or empty if they could not be fitted.
+    """
+    def __init__(self, path, digest, data, pipelines):
+        self.path = path
+        self.digest = digest
+        self.data = data
+        self.pipelines = pipelines
+
+
+class StreamingUpload(io.RawIOBase):
+    """
+    Writable file object receiving an uploaded CSV file block by block.
+
+    Each block is written to a temporary file, added to the content hash and handed to a
+    parser thread. The header is checked as soon as its line is complete, so a file missing
+    required columns is rejected within its first kilobytes, and the parser thread reads the
+    rows in chunks with the dtypes of `load_csv` while accumulating the preprocessing
+    statistics. Parsing and preprocessing therefore overlap with the transfer, and malformed
+    rows stop the upload as soon as they are reached.
+
+    Attributes:
+        path (str): Temporary file holding the received bytes.
+        chunk_size (int): Rows parsed per chunk.
+    """
+    def __init__(self, folder, chunk_size=50000, max_pending_blocks=16):
+        """
+        Start receiving an upload.
+
+        Args:
+            folder (str): Directory of the temporary file.
+            chunk_size (int): Rows parsed per chunk.
+            max_pending_blocks (int): Received blocks waiting for the parser before writes block.
+        """
+        super().__init__()
+        self.path = os.path.join(folder, f"upload_{uuid.uuid4().hex}.tmp")
+        self.chunk_size = chunk_size
+        self._file = open(self.path, "w+b")
+        self._digest = hashlib.sha256()
+        self._header = b""
+        self._blocks = queue.Queue(maxsize=max_pending_blocks)
+        self._error = None
+        self._chunks = []
+        self._pipelines = {
+            "pipeline": PreprocessingPipeline(target_column="Diagnosis"),
+            "pipeline_native": PreprocessingPipeline(target_column="Diagnosis", scale_categorical=False),
+        }
+        self._parser = None
+        self._finished = False
+
+    def writable(self):
+        return True
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def write(self, data):
+        """
+        Receive the next block of the upload.
+
+        Raises:
+            UploadRejected: If the header lacks required columns or the parser failed.
+        """
+        if self._error is not None:
+            self._reject(self._error)
+        size = len(data)
+        self._file.write(data)
+        self._digest.update(data)
+        if self._parser is None:
+            self._header += data
+            if b"\n" not in self._header:
+                if len(self._header) > MAX_HEADER_BYTES:
+                    self._reject("The file has no CSV header line.")
+                return size
+            self._check_header(self._header.split(b"\n", 1)[0])
+            self._parser = threading.Thread(target=self._parse, name="upload-parser", daemon=True)
+            self._parser.start()
+            data, self._header = self._header, b""
+        self._blocks.put(bytes(data))
+        return size
+
+    def read(self, size=-1):
+        return self._file.read(size)
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        return self._file.seek(offset, whence)
+
+    def tell(self):
+        return self._file.tell()
+
+    def _check_header(self, line):
+        try:
+            header = next(csv.reader([line.decode("utf-8-sig").rstrip("\r")]), [])
+        except UnicodeDecodeError:
+            self._reject("The file is not UTF-8 encoded text.")
+        missing = [col for col in DATASET_COLUMNS if col not in header]
+        if missing:
+            self._reject(f"Missing required columns: {missing}")
+
+    @timed("upload_parse")
+    def _parse(self):
+        """
+        Parser thread: read the received bytes in chunks of rows and accumulate the statistics.
+        """
+        reader = io.BufferedReader(_QueueReader(self._blocks), buffer_size=1024 * 1024)
+        columns = list(DATASET_COLUMNS)
+        try:
+            with pd.read_csv(reader, usecols=columns, dtype=dataset_dtypes(columns), chunksize=self.chunk_size,
+                             encoding="utf-8-sig") as chunks:
+                for chunk in chunks:
+                    chunk = chunk[columns]
+                    self._chunks.append(chunk)
+                    for name, pipeline in list(self._pipelines.items()):
+                        try:
+                            pipeline.partial_fit(chunk[SELECTED_COLUMNS + ["Diagnosis"]])
+                        except ValueError as e:
+                            # Not a reason to reject the upload; training reports it
+                            logger.warning(f"Preprocessing statistics skipped for the upload: {e}")
+                            del self._pipelines[name]
+        except Exception as e:
+            self._error = f"Invalid dataset: {e}"
+            while reader.read(1024 * 1024):  # Keep consuming so the receiving thread never blocks
+                pass
+
+    def finish(self):
+        """
+        Wait for the parser to read the last block and return the parsed upload.
+
+        Returns:
+            UploadResult: The stored file, its hash, the parsed frame and preprocessing pipelines.
+
+        Raises:
+            UploadRejected: If the file is empty or could not be parsed.
+        """
+        if not self._finished:
+            self._finished = True
+            if self._parser is None:
+                if not self._header:
+                    self._reject("The file is empty.")
+                self._check_header(self._header)  # A header line without a trailing newline
+                self._reject("The file has no rows.")
+            self._blocks.put(None)
+            self._parser.join()
+            self._file.close()
+        if self._error is not None:
+            self._reject(self._error)
+        data = concat_frames(self._chunks) if self._chunks else None
+        if data is None:
+            self._reject("The file has no rows.")
+        pipelines = {name: pipeline.finalize() for name, pipeline in self._pipelines.items()}
+        return UploadResult(self.path, self._digest.hexdigest(), data, pipelines)
+
+    def close(self):
+        """
+        Close the upload. One that was never finished, e.g. because the client disconnected
+        before the end of the file, is aborted so its parser thread exits and its file is deleted.
+        """
+        if not getattr(self, "_finished", True):
+            self.abort()
+        super().close()
+
+    def abort(self):
+        """
+        Stop receiving the upload and delete its temporary file.
+        """
+        if self._parser is not None and not self._finished:
+            self._error = self._error or "Upload aborted."
+            self._blocks.put(None)
+            self._parser.join()
+        self._finished = True
+        self._file.close()
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    def _reject(self, message):
+        logger.warning(f"Upload rejected: {message}")
+        self.abort()
+        raise UploadRejected(message)
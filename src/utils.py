@@ -1,11 +1,18 @@
 import os
+import importlib.util
+import json
 import pandas as pd
 import matplotlib
 import logging
+from src.config import DATASET_COLUMNS, COLUMN_DTYPES
+from src.metrics import timed
 
 # Configure matplotlib to use the 'Agg' backend for non-GUI environments
 matplotlib.use('Agg')
 
+# The pyarrow CSV reader is multi-threaded and is also required to write Parquet files
+PYARROW_AVAILABLE = importlib.util.find_spec("pyarrow") is not None
+
 
 def setup_directories(upload_folder, static_folder):
     """
@@ -19,38 +26,163 @@ def setup_directories(upload_folder, static_folder):
     os.makedirs(static_folder, exist_ok=True)
 
 
-def load_csv(file_path) -> pd.DataFrame:
+def dataset_dtypes(columns):
+    """
+    Build the dtype mapping used to parse the given dataset columns.
+
+    Args:
+        columns (list): Column names to read.
+
+    Returns:
+        dict: Compact dtypes from `COLUMN_DTYPES` for the columns that define one.
+    """
+    return {col: COLUMN_DTYPES[col] for col in columns if col in COLUMN_DTYPES}
+
+
+@timed("parse")
+def load_csv(file_path, columns=None, parquet_path=None) -> pd.DataFrame:
     """
-    Load a CSV file into a pandas DataFrame.
+    Load the needed columns of a CSV file into a pandas DataFrame with compact dtypes.
+
+    Only `columns` are parsed, using the dtypes from `COLUMN_DTYPES` (categories, Int8 flags
+    and float32 measurements) and the pyarrow engine when it is installed. When `parquet_path`
+    is given, the parsed columns are also written to Parquet once, and later calls read the
+    Parquet file instead of the CSV as long as it is newer than the CSV.
 
     Args:
         file_path (str): The path to the CSV file to be loaded.
+        columns (list): Columns to read (defaults to `DATASET_COLUMNS`).
+        parquet_path (str): Optional path of a Parquet copy of the file.
 
     Returns:
-        pd.DataFrame: The loaded DataFrame containing the CSV data.
+        pd.DataFrame: The loaded DataFrame containing the requested columns.
+
+    Raises:
+        ValueError: If any of the requested columns is missing from the file.
     """
-    return pd.read_csv(file_path)
+    columns = list(columns or DATASET_COLUMNS)
+    if (parquet_path and PYARROW_AVAILABLE and os.path.exists(parquet_path)
+            and os.path.getmtime(parquet_path) >= os.path.getmtime(file_path)):
+        return pd.read_parquet(parquet_path, columns=columns)
+
+    header = pd.read_csv(file_path, nrows=0).columns
+    missing = [col for col in columns if col not in header]
+    if missing:
+        raise ValueError(f"Missing required columns: {missing}")
 
+    data = pd.read_csv(
+        file_path,
+        usecols=columns,
+        dtype=dataset_dtypes(columns),
+        engine="pyarrow" if PYARROW_AVAILABLE else "c",
+    )[columns]
 
-def setup_logging():
+    if parquet_path:
+        write_parquet(data, parquet_path)
+    return data
+
+
+def write_parquet(data, parquet_path):
+    """
+    Write the Parquet copy of a parsed dataset read by `load_csv`, if pyarrow is installed.
+
+    Args:
+        data (pd.DataFrame): The parsed columns.
+        parquet_path (str): Path of the Parquet copy.
+    """
+    if not PYARROW_AVAILABLE:
+        return
+    tmp_path = f"{parquet_path}.tmp"
+    data.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, parquet_path)  # Readers never see a partially written file
+
+
+def load_csv_chunks(file_path, chunk_size, columns=None):
+    """
+    Read the needed columns of a CSV file in chunks of rows, with the same dtypes as `load_csv`.
+
+    Args:
+        file_path (str): The path to the CSV file to be read.
+        chunk_size (int): Maximum number of rows per chunk.
+        columns (list): Columns to read (defaults to `DATASET_COLUMNS`).
+
+    Yields:
+        pd.DataFrame: Consecutive chunks of the file.
+    """
+    columns = list(columns or DATASET_COLUMNS)
+    with pd.read_csv(file_path, usecols=columns, dtype=dataset_dtypes(columns), chunksize=chunk_size) as reader:
+        for chunk in reader:
+            yield chunk[columns]
+
+
+def concat_frames(frames):
+    """
+    Concatenate frames loaded by `load_csv`, keeping the compact dtypes.
+
+    `pd.concat` turns categorical columns whose categories differ into plain objects, so
+    those columns are rebuilt from the union of the categories.
+
+    Args:
+        frames (list): DataFrames with the same columns.
+
+    Returns:
+        pd.DataFrame: The rows of every frame, in order.
+    """
+    data = pd.concat(frames, ignore_index=True)
+    for col in frames[0].columns:
+        if isinstance(frames[0][col].dtype, pd.CategoricalDtype) and not isinstance(data[col].dtype,
+                                                                                    pd.CategoricalDtype):
+            parts = [frame[col].astype("category") for frame in frames]
+            data[col] = pd.api.types.union_categoricals(parts, sort_categories=True)
+    return data
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Format log records as one JSON object per line.
+
+    Fields passed through `extra` (e.g. the `stage` and `duration_ms` of the stage timers)
+    are included next to the time, level, logger name and message.
+    """
+    _RESERVED = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+    def format(self, record):
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        entry.update({key: value for key, value in vars(record).items() if key not in self._RESERVED})
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+def setup_logging(json_format=False):
     """
     Configure global logging settings.
 
     - Sets the log level to INFO.
-    - Formats log messages with timestamps and log levels.
+    - Formats log messages with timestamps and log levels, or as JSON lines.
     - Ensures only a single handler is attached to prevent duplicate logs.
 
+    Args:
+        json_format (bool): Switch the root handlers to structured JSON output.
+
     Adds:
         - Console output for logs.
     """
     logger = logging.getLogger()
+    # Define the log format
+    formatter = JsonFormatter() if json_format else logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
     if not logger.hasHandlers():  # Avoid adding multiple handlers to the logger
         logger.setLevel(logging.INFO)
 
-        # Define the log format
-        formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-
         # Configure console handler
         console_handler = logging.StreamHandler()
         console_handler.setFormatter(formatter)
         logger.addHandler(console_handler)
+    elif json_format:
+        for handler in logger.handlers:
+            handler.setFormatter(formatter)
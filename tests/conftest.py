@@ -0,0 +1,53 @@
+import pandas as pd
+import pytest
+from main import create_app
+from src.config import SELECTED_COLUMNS
+from src.data_processing import PreprocessingPipeline
+from src.model_training import StrokePredictionModel
+
+# Sample dataset shipped with the repository
+SAMPLE_CSV = "app/uploads/seniors_stroke_prediction.csv"
+
+
+@pytest.fixture(scope="session")
+def sample_data():
+    """
+    The first rows of the sample dataset, as read by `load_csv`.
+    """
+    return pd.read_csv(SAMPLE_CSV, nrows=400)
+
+
+@pytest.fixture
+def app(tmp_path):
+    """
+    Application writing every folder under a temporary directory, without a model.
+    """
+    return create_app({
+        "UPLOAD_FOLDER": str(tmp_path / "uploads"),
+        "STATIC_FOLDER": str(tmp_path / "static"),
+        "MODEL_PATH": str(tmp_path / "models" / "model.joblib"),
+        "CACHE_FOLDER": str(tmp_path / "cache"),
+        "JOBS_FOLDER": str(tmp_path / "jobs"),
+        "METRICS_FOLDER": None,
+        "PROFILE_FOLDER": str(tmp_path / "profiles"),
+        "MODEL_PRELOAD": False,
+        "GRAPH_POOL_WARMUP": False,
+    })
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def trained_app(app, sample_data):
+    """
+    Application serving a small logistic regression trained on the sample rows.
+    """
+    data = sample_data[SELECTED_COLUMNS + ["Diagnosis"]]
+    preprocessor = PreprocessingPipeline(target_column="Diagnosis")
+    model = StrokePredictionModel(preprocessor.fit_transform(data), preprocessor=preprocessor)
+    model.train_model(model_type="LogisticRegression")
+    model.save_model(app.config["MODEL_PATH"])
+    return app
@@ -0,0 +1,23 @@
+import io
+
+
+def test_batch_prediction_scores_csv(trained_app, sample_data):
+    body = sample_data.head(20).to_csv(index=False).encode()
+    response = trained_app.test_client().post("/predict/batch", data=body, content_type="text/csv")
+    assert response.status_code == 200
+    assert len(response.data.decode().strip().splitlines()) == 21
+
+
+def test_batch_prediction_rejects_csv_missing_columns(trained_app, sample_data):
+    body = sample_data.head(20).drop(columns=["Age", "Gender"]).to_csv(index=False).encode()
+    response = trained_app.test_client().post(
+        "/predict/batch", data={"file": (io.BytesIO(body), "patients.csv")}, content_type="multipart/form-data"
+    )
+    assert response.status_code == 400
+    assert "Missing required columns" in response.get_json()["error"]
+
+
+def test_batch_prediction_rejects_malformed_csv(trained_app):
+    body = b'Age,Gender\n"unterminated,Male\n'
+    response = trained_app.test_client().post("/predict/batch", data=body, content_type="text/csv")
+    assert response.status_code == 400
@@ -0,0 +1,29 @@
+from benchmarks.run import compare
+
+
+def result(min_ms, spread_ms=0.0, peak_rss_mb=100.0):
+    return {"stage": "ingest", "model_type": None, "rows": 1000, "min_ms": min_ms, "p50_ms": min_ms,
+            "spread_ms": spread_ms, "peak_rss_mb": peak_rss_mb}
+
+
+def test_slowdown_beyond_threshold_and_spread_is_a_regression():
+    assert len(compare([result(15.0, spread_ms=1.0)], [result(10.0, spread_ms=1.0)], 0.2)) == 1
+
+
+def test_slowdown_within_the_measured_spread_is_not_a_regression():
+    assert compare([result(1.5, spread_ms=0.8)], [result(1.0, spread_ms=0.2)], 0.2) == []
+
+
+def test_slowdown_within_the_threshold_is_not_a_regression():
+    assert compare([result(11.0)], [result(10.0)], 0.2) == []
+
+
+def test_memory_growth_ignores_the_timing_spread():
+    regressions = compare([result(10.0, spread_ms=50.0, peak_rss_mb=200.0)], [result(10.0)], 0.2)
+    assert len(regressions) == 1 and "peak_rss_mb" in regressions[0]
+
+
+def test_baseline_without_best_time_is_compared_on_p50():
+    baseline = result(10.0)
+    del baseline["min_ms"], baseline["spread_ms"]
+    assert len(compare([result(20.0)], [baseline], 0.2)) == 1
@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import ExtraTreesClassifier, RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.tree import DecisionTreeClassifier
+from src.compiled_trees import MAX_COMPILED_ROWS, CompiledForest, compile_estimator
+from src.model_training import StrokePredictionModel
+
+ESTIMATORS = {
+    "random_forest": lambda: RandomForestClassifier(n_estimators=30, random_state=0),
+    "extra_trees": lambda: ExtraTreesClassifier(n_estimators=30, random_state=0),
+    "decision_tree": lambda: DecisionTreeClassifier(random_state=0),
+    "shallow_forest": lambda: RandomForestClassifier(n_estimators=10, max_depth=3, random_state=0),
+}
+
+
+def make_data(rows, features=6, seed=0, missing=0.0):
+    """
+    Synthetic features with a noisy binary target, with a fraction of missing values.
+    """
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame(rng.normal(size=(rows, features)), columns=[f"feature_{i}" for i in range(features)])
+    y = (X.iloc[:, :3].sum(axis=1) + rng.normal(scale=1.5, size=rows) > 0).astype(int)
+    if missing:
+        X = X.mask(rng.random(X.shape) < missing)
+    return X, y
+
+
+@pytest.mark.parametrize("name", ESTIMATORS)
+def test_outputs_match_sklearn_exactly(name):
+    X, y = make_data(2000)
+    estimator = ESTIMATORS[name]().fit(X, y)
+    compiled = CompiledForest.from_estimator(estimator)
+    X_new, _ = make_data(500, seed=1)
+    assert np.array_equal(compiled.predict_proba(X_new), estimator.predict_proba(X_new))
+    assert np.array_equal(compiled.predict(X_new), estimator.predict(X_new))
+
+
+@pytest.mark.parametrize("name", ["random_forest", "extra_trees", "decision_tree"])
+def test_missing_values_follow_the_learned_branch(name):
+    X, y = make_data(2000, missing=0.1)
+    estimator = ESTIMATORS[name]().fit(X, y)
+    compiled = CompiledForest.from_estimator(estimator)
+    X_new, _ = make_data(500, seed=1, missing=0.2)
+    assert np.array_equal(compiled.predict_proba(X_new), estimator.predict_proba(X_new))
+    assert np.array_equal(compiled.predict(X_new), estimator.predict(X_new))
+
+
+def test_dataframe_columns_are_matched_by_name():
+    X, y = make_data(1000)
+    estimator = ESTIMATORS["random_forest"]().fit(X, y)
+    compiled = CompiledForest.from_estimator(estimator)
+    X_new, _ = make_data(200, seed=1)
+    reordered = X_new[list(reversed(X_new.columns))]
+    assert np.array_equal(compiled.predict_proba(reordered), estimator.predict_proba(X_new))
+
+
+def test_unsupported_estimators_are_not_compiled():
+    X, y = make_data(200)
+    assert compile_estimator(DecisionTreeClassifier(random_state=0).fit(X, y)) is not None
+    assert compile_estimator(LogisticRegression().fit(X, y)) is None
+
+
+class _SpyForest:
+    """
+    Compiled forest recording the batch sizes it is asked to score.
+    """
+    def __init__(self, compiled):
+        self.compiled = compiled
+        self.calls = []
+
+    def predict_proba(self, X):
+        self.calls.append(len(X))
+        return self.compiled.predict_proba(X)
+
+    def predict(self, X):
+        self.calls.append(len(X))
+        return self.compiled.predict(X)
+
+
+def test_large_batches_fall_back_to_sklearn():
+    X, y = make_data(1000)
+    model = StrokePredictionModel()
+    model.model = ESTIMATORS["random_forest"]().fit(X, y)
+    model.compiled = spy = _SpyForest(CompiledForest.from_estimator(model.model))
+    X_new, _ = make_data(MAX_COMPILED_ROWS + 1, seed=1)
+
+    small = X_new.iloc[:MAX_COMPILED_ROWS]
+    assert np.array_equal(model.predict_proba(small), model.model.predict_proba(small))
+    assert np.array_equal(model.predict(small), model.model.predict(small))
+    assert spy.calls == [MAX_COMPILED_ROWS, MAX_COMPILED_ROWS]
+
+    assert np.array_equal(model.predict_proba(X_new), model.model.predict_proba(X_new))
+    assert np.array_equal(model.predict(X_new), model.model.predict(X_new))
+    assert spy.calls == [MAX_COMPILED_ROWS, MAX_COMPILED_ROWS]
@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.config import CATEGORY_VOCABULARIES, SELECTED_COLUMNS, UNKNOWN_CODE
+from src.data_processing import PreprocessingPipeline, category_codes
+
+VOCABULARY = CATEGORY_VOCABULARIES["Physical Activity"]
+
+
+@pytest.mark.parametrize("dtype", [object, "string", "category"])
+def test_category_codes_follow_the_vocabulary(dtype):
+    column = pd.Series(["High", "Low", None, "Extreme", "Moderate", "Low"], dtype=dtype)
+    codes = category_codes(column, VOCABULARY)
+    assert codes.dtype == np.int8
+    np.testing.assert_array_equal(codes, [2, 0, UNKNOWN_CODE, UNKNOWN_CODE, 1, 0])
+
+
+def test_category_codes_do_not_depend_on_the_categories_present():
+    # A categorical column whose categories are a subset, in another order, of the vocabulary
+    column = pd.Series(pd.Categorical(["Moderate", "High"], categories=["High", "Moderate"]))
+    np.testing.assert_array_equal(category_codes(column, VOCABULARY), [1, 2])
+
+
+def test_large_vocabularies_use_wider_codes():
+    vocabulary = [str(value) for value in range(200)]
+    codes = category_codes(pd.Series(["150", "7", "x"]), vocabulary)
+    assert codes.dtype == np.int32
+    np.testing.assert_array_equal(codes, [150, 7, UNKNOWN_CODE])
+
+
+@pytest.fixture(scope="module")
+def pipeline(sample_data):
+    return PreprocessingPipeline(target_column="Diagnosis").fit(sample_data[SELECTED_COLUMNS + ["Diagnosis"]])
+
+
+def code_of(pipeline, data, col):
+    return pipeline._encode(data)[:, pipeline.feature_columns.index(col)]
+
+
+def test_codes_are_the_same_at_train_and_predict_time(pipeline, sample_data):
+    train = sample_data[SELECTED_COLUMNS]
+    # A prediction batch holding only some of the values, in another order
+    batch = train[train["Physical Activity"] != "Low"].iloc[::-1]
+    train_codes = pd.Series(code_of(pipeline, train, "Physical Activity"), index=train.index)
+    np.testing.assert_array_equal(code_of(pipeline, batch, "Physical Activity"), train_codes.loc[batch.index])
+    np.testing.assert_array_equal(
+        code_of(pipeline, batch, "Physical Activity"),
+        [VOCABULARY.index(value) for value in batch["Physical Activity"]],
+    )
+
+
+def test_unseen_values_get_the_unknown_code_and_missing_ones_the_fill_code(pipeline, sample_data):
+    rows = sample_data[SELECTED_COLUMNS].iloc[:3].copy()
+    rows["Physical Activity"] = ["Extreme", None, "High"]
+    codes = code_of(pipeline, rows, "Physical Activity")
+    fill_code = VOCABULARY.index(pipeline.fill_values["Physical Activity"])
+    np.testing.assert_array_equal(codes, [UNKNOWN_CODE, fill_code, VOCABULARY.index("High")])
+    assert pipeline.unknown_code == UNKNOWN_CODE
+
+
+def test_categorical_and_string_inputs_encode_identically(pipeline, sample_data):
+    rows = sample_data[SELECTED_COLUMNS].iloc[:50].copy()
+    rows.loc[rows.index[:2], "Physical Activity"] = [None, "Extreme"]
+    categorical = rows.copy()
+    for col in pipeline.vocabularies:
+        categorical[col] = categorical[col].astype("category")
+    strings = rows.astype({col: "string" for col in pipeline.vocabularies})
+    expected = pipeline._encode(rows.astype({col: object for col in pipeline.vocabularies}))
+    np.testing.assert_array_equal(pipeline._encode(categorical), expected)
+    np.testing.assert_array_equal(pipeline._encode(strings), expected)
+    pd.testing.assert_frame_equal(pipeline.transform(categorical), pipeline.transform(strings))
@@ -0,0 +1,43 @@
+import time
+import pytest
+from src import data_analysis
+from src.data_analysis import GRAPH_NAMES, GraphGenerator, use_pool, warm_pool
+
+
+@pytest.fixture
+def fresh_pool(monkeypatch):
+    monkeypatch.setattr(data_analysis, "_pool", None)
+    yield
+    if data_analysis._pool is not None:
+        data_analysis._pool.shutdown(wait=True, cancel_futures=True)
+
+
+def test_single_core_renders_serially(monkeypatch):
+    monkeypatch.setattr(data_analysis.os, "cpu_count", lambda: 1)
+    assert not use_pool(6)
+    assert not warm_pool(6)
+
+
+def test_fewer_graphs_than_workers_render_serially(monkeypatch):
+    monkeypatch.setattr(data_analysis.os, "cpu_count", lambda: 8)
+    assert use_pool(6, graphs=len(GRAPH_NAMES))
+    assert not use_pool(6, graphs=3)
+    assert not use_pool(1)
+    assert not use_pool(None)
+
+
+def test_serial_rendering_never_starts_the_pool(monkeypatch, sample_data, tmp_path, fresh_pool):
+    monkeypatch.setattr(data_analysis.os, "cpu_count", lambda: 1)
+    monkeypatch.setattr(data_analysis, "_get_pool", lambda max_workers: pytest.fail("pool started"))
+    graphs = GraphGenerator(sample_data, str(tmp_path), max_workers=6).generate_all_graphs()
+    assert len(graphs) == len(GRAPH_NAMES)
+    assert all((tmp_path / graph).exists() for graph in graphs)
+
+
+def test_warm_pool_starts_every_worker(monkeypatch, fresh_pool):
+    monkeypatch.setattr(data_analysis.os, "cpu_count", lambda: 8)
+    assert warm_pool(2)
+    deadline = time.monotonic() + 60
+    while len(data_analysis._pool._processes) < 2 and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert len(data_analysis._pool._processes) == 2
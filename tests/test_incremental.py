@@ -0,0 +1,104 @@
+import io
+import numpy as np
+import pytest
+from main import services
+from src.config import SELECTED_COLUMNS
+from src.data_processing import PreprocessingPipeline
+from src.model_training import StrokePredictionModel
+from tests.test_profiling import upload
+
+
+def append(client, data, dataset_id):
+    body = data.to_csv(index=False).encode()
+    response = client.post("/upload", data={"file": (io.BytesIO(body), "new.csv"), "append_to": dataset_id},
+                           content_type="multipart/form-data", headers={"Accept": "application/json"})
+    assert response.status_code == 200, response.get_data(as_text=True)
+    return response.get_json()
+
+
+def fitted_model(data, model_type):
+    data = data[SELECTED_COLUMNS + ["Diagnosis"]]
+    preprocessor = PreprocessingPipeline(target_column="Diagnosis")
+    model = StrokePredictionModel(preprocessor.fit_transform(data), preprocessor=preprocessor)
+    model.train_model(model_type=model_type)
+    return model
+
+
+def test_append_stores_the_merged_rows(app, client, sample_data):
+    base_id = upload(client, sample_data.iloc[:300])
+    appended = append(client, sample_data.iloc[300:], base_id)
+    assert appended["rows"] == len(sample_data)
+    assert appended["appended_to"] == base_id
+    with app.app_context():
+        store = services().dataset_store
+        assert store.info(appended["dataset_id"]) == {"rows": 400, "parent": base_id, "parent_rows": 300}
+        assert store.rows_before(appended["dataset_id"], base_id) == 300
+
+
+def test_append_survives_a_code_version_change(app, client, sample_data):
+    base_id = upload(client, sample_data.iloc[:300])
+    with app.app_context():
+        services().dataset_cache.version = "deadbeef"  # As after a deploy changing the pipeline code
+    appended = append(client, sample_data.iloc[300:], base_id)
+    assert appended["rows"] == len(sample_data)
+    assert "deadbeef" not in appended["dataset_id"]
+
+
+def test_partial_fit_matches_a_full_fit(sample_data):
+    data = sample_data[SELECTED_COLUMNS + ["Diagnosis"]]
+    full = PreprocessingPipeline(target_column="Diagnosis").fit(data)
+    continued = PreprocessingPipeline(target_column="Diagnosis").fit(data.iloc[:300])
+    continued.partial_fit(data.iloc[300:]).finalize()
+
+    np.testing.assert_allclose(continued.mean_, full.mean_)
+    np.testing.assert_allclose(continued.scale_, full.scale_)
+    assert continued.vocabularies == full.vocabularies
+    assert continued.fill_values.keys() == full.fill_values.keys()
+    for col, value in full.fill_values.items():
+        if isinstance(value, float):
+            assert continued.fill_values[col] == pytest.approx(value)
+        else:
+            assert continued.fill_values[col] == value
+
+
+def test_train_incremental_grows_a_random_forest(sample_data):
+    model = fitted_model(sample_data.iloc[:300], "RandomForest")
+    trees = model.model.n_estimators
+    model.train_incremental(sample_data.iloc[300:], n_estimators=5)
+    assert model.model.n_estimators == trees + 5
+    assert len(model.model.estimators_) == trees + 5
+    assert model.metrics["incremental"] == {"new_rows": 100, "n_estimators": trees + 5}
+
+
+def test_train_incremental_continues_sgd_with_partial_fit(sample_data, monkeypatch):
+    model = fitted_model(sample_data.iloc[:300], "SGD")
+    coef = model.model.coef_.copy()
+    calls = []
+    partial_fit = model.model.partial_fit
+    monkeypatch.setattr(model.model, "partial_fit", lambda X, y: calls.append(len(X)) or partial_fit(X, y))
+    model.train_incremental(sample_data.iloc[300:], epochs=2)
+    assert calls == [80, 80]
+    assert not np.array_equal(model.model.coef_, coef)
+    assert model.metrics["incremental"] == {"new_rows": 100, "epochs": 2}
+
+
+def test_warm_start_rejects_a_model_without_incremental_training(trained_app, sample_data):
+    client = trained_app.test_client()
+    dataset_id = upload(client, sample_data)
+    response = client.post("/train", data={"dataset_id": dataset_id, "warm_start": "1"},
+                           headers={"Accept": "application/json"})
+    assert response.status_code == 400
+    assert "cannot be trained incrementally" in response.get_data(as_text=True)
+
+
+def test_train_incremental_counts_boosting_iterations_from_n_iter(sample_data):
+    data = sample_data.iloc[:300][SELECTED_COLUMNS + ["Diagnosis"]]
+    preprocessor = PreprocessingPipeline(target_column="Diagnosis", scale_categorical=False)
+    model = StrokePredictionModel(preprocessor.fit_transform(data), preprocessor=preprocessor)
+    model.train_model(model_type="HistGradientBoosting")
+    model.model.set_params(early_stopping=False)  # Every added iteration is kept
+    fitted = model.model.n_iter_
+    assert fitted < model.model.max_iter  # Stopped early, so max_iter overstates the fitted iterations
+    model.train_incremental(sample_data.iloc[300:], n_estimators=5)
+    assert model.model.max_iter == fitted + 5
+    assert model.model.n_iter_ == fitted + 5
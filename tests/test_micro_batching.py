@@ -0,0 +1,34 @@
+import pytest
+from src.micro_batching import MicroBatcher
+
+
+def make_batcher():
+    """
+    Batcher doubling the 'value' of every record, recording the size of each call.
+    A record without a value fails the whole call.
+    """
+    calls = []
+
+    def score(records):
+        calls.append(len(records))
+        return [record["value"] * 2 for record in records]
+
+    # A long window so that records submitted together are merged into one batch
+    return MicroBatcher(score, window_ms=200, max_batch_size=16), calls
+
+
+def test_concurrent_records_are_merged():
+    batcher, calls = make_batcher()
+    futures = [batcher.submit({"value": i}) for i in range(5)]
+    assert [future.result(timeout=5) for future in futures] == [0, 2, 4, 6, 8]
+    assert calls == [5]
+
+
+def test_a_bad_record_only_fails_its_own_request():
+    batcher, calls = make_batcher()
+    futures = [batcher.submit(record) for record in ({"value": 1}, {"bad": True}, {"value": 3})]
+    assert futures[0].result(timeout=5) == 2
+    with pytest.raises(KeyError):
+        futures[1].result(timeout=5)
+    assert futures[2].result(timeout=5) == 6
+    assert calls == [3, 1, 1, 1]  # The merged batch, then each record on its own
@@ -0,0 +1,64 @@
+import json
+import numpy as np
+import pytest
+from joblib import dump, load
+from src.config import SELECTED_COLUMNS
+from src.data_processing import PreprocessingPipeline
+from src.model_training import ARTIFACT_FORMAT_VERSION, StrokePredictionModel
+
+
+@pytest.fixture(scope="module")
+def forest(sample_data):
+    data = sample_data[SELECTED_COLUMNS + ["Diagnosis"]]
+    preprocessor = PreprocessingPipeline(target_column="Diagnosis")
+    model = StrokePredictionModel(preprocessor.fit_transform(data), preprocessor=preprocessor)
+    model.train_model(model_type="RandomForest")
+    return model
+
+
+def test_round_trip_keeps_manifest_and_predictions(forest, sample_data, tmp_path):
+    path = str(tmp_path / "model.joblib")
+    forest.save_model(path, data_hash="0123456789abcdef0123456789abcdef")
+
+    manifest = forest.manifest
+    assert manifest["format_version"] == ARTIFACT_FORMAT_VERSION
+    assert manifest["estimator"] == "RandomForestClassifier"
+    assert manifest["features"] == list(forest.preprocessor.feature_columns)
+    assert manifest["vocabularies"] == forest.preprocessor.vocabularies
+    assert manifest["training_data_hash"] == "0123456789abcdef0123456789abcdef"
+    assert manifest["compiled"] is True
+    with open(tmp_path / "model.manifest.json") as f:
+        assert json.load(f) == json.loads(json.dumps(manifest, default=str))
+
+    loaded = StrokePredictionModel()
+    loaded.load_model(path, mmap_mode="r")
+    assert loaded.manifest == manifest
+    assert loaded.metrics == forest.metrics
+    # The compiled tree arrays are shared read-only memory maps of the artifact
+    for name in ("roots", "feature", "threshold", "left", "right", "value"):
+        array = getattr(loaded.compiled, name)
+        assert isinstance(array, np.memmap), name
+        assert not array.flags.writeable
+
+    rows = sample_data[SELECTED_COLUMNS].iloc[:50]
+    np.testing.assert_array_equal(
+        loaded.predict_proba(loaded.preprocess(rows)), forest.predict_proba(forest.preprocess(rows))
+    )
+
+
+def test_load_in_memory_gives_plain_arrays(forest, tmp_path):
+    path = str(tmp_path / "model.joblib")
+    forest.save_model(path)
+    loaded = StrokePredictionModel()
+    loaded.load_model(path, mmap_mode=None)
+    assert not isinstance(loaded.compiled.threshold, np.memmap)
+
+
+def test_unknown_format_version_is_rejected(forest, tmp_path):
+    path = str(tmp_path / "model.joblib")
+    forest.save_model(path)
+    artifact = load(path)
+    artifact["format_version"] = ARTIFACT_FORMAT_VERSION + 1
+    dump(artifact, path)
+    with pytest.raises(ValueError, match=f"Unsupported model artifact format version {ARTIFACT_FORMAT_VERSION + 1}"):
+        StrokePredictionModel().load_model(path)
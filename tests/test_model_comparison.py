@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+from src import model_comparison
+from src.config import CATEGORY_VOCABULARIES, SELECTED_COLUMNS
+from src.data_processing import PreprocessingPipeline
+from src.model_comparison import compare_models
+
+MODEL_TYPES = ["LogisticRegression", "NaiveBayes", "HistGradientBoosting"]
+
+
+@pytest.fixture
+def data(sample_data):
+    return sample_data[SELECTED_COLUMNS + ["Diagnosis"]]
+
+
+def test_leaderboard_has_one_ranked_entry_per_model_type(data, tmp_path):
+    result = compare_models(data, model_types=MODEL_TYPES, n_splits=3, work_folder=str(tmp_path))
+    assert result["rows"] == len(data)
+    assert result["folds"] == 3
+    assert result["preprocessing"] == "per_fold"
+    leaderboard = result["leaderboard"]
+    assert sorted(row["model_type"] for row in leaderboard) == sorted(MODEL_TYPES)
+    assert [row["rank"] for row in leaderboard] == [1, 2, 3]
+    for row in leaderboard:
+        assert 0 <= row["accuracy_mean"] <= 1
+        assert row["fit_seconds_mean"] > 0
+    assert list(tmp_path.iterdir()) == []  # The shared arrays are removed
+
+
+def test_folds_and_preprocessing_are_shared_and_fitted_on_training_rows(data, monkeypatch):
+    fits = []
+    fit = PreprocessingPipeline.fit
+    monkeypatch.setattr(PreprocessingPipeline, "fit", lambda self, rows: fits.append(len(rows)) or fit(self, rows))
+    seen = {}
+    fit_fold = model_comparison.fit_fold
+
+    def recording_fit_fold(model_type, fold, folder, matrix, columns, categorical):
+        folds = np.load(f"{folder}/folds.npy")
+        features = np.load(f"{folder}/{matrix}_{fold}.npy")
+        train = features[folds != fold]
+        numeric = [position for position, col in enumerate(columns) if col not in CATEGORY_VOCABULARIES]
+        assert numeric
+        # Scaling statistics come from the training rows only: they are centered, the test rows are not
+        np.testing.assert_allclose(train[:, numeric].mean(axis=0), 0, atol=1e-4)
+        seen[(model_type, fold)] = (matrix, np.flatnonzero(folds == fold))
+        return fit_fold(model_type, fold, folder, matrix, columns, categorical)
+
+    monkeypatch.setattr(model_comparison, "fit_fold", recording_fit_fold)
+    compare_models(data, model_types=MODEL_TYPES, n_splits=3)
+
+    # One pipeline per fold and encoding ('scaled' and 'native'), none on all rows
+    assert len(fits) == 3 * 2
+    assert all(rows < len(data) for rows in fits)
+    assert len(seen) == len(MODEL_TYPES) * 3
+    for fold in range(3):
+        test_rows = [seen[(model_type, fold)][1] for model_type in MODEL_TYPES]
+        assert all(np.array_equal(rows, test_rows[0]) for rows in test_rows)
+    assert seen[("HistGradientBoosting", 0)][0] == "native"
+    assert seen[("LogisticRegression", 0)][0] == seen[("NaiveBayes", 0)][0] == "scaled"
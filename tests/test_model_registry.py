@@ -0,0 +1,107 @@
+import os
+import threading
+import time
+import pytest
+from src import model_registry
+from src.config import SELECTED_COLUMNS
+from src.data_processing import PreprocessingPipeline
+from src.model_registry import ModelRegistry
+from src.model_training import StrokePredictionModel
+
+
+def trained_model(data, model_type):
+    data = data[SELECTED_COLUMNS + ["Diagnosis"]]
+    preprocessor = PreprocessingPipeline(target_column="Diagnosis")
+    model = StrokePredictionModel(preprocessor.fit_transform(data), preprocessor=preprocessor)
+    model.train_model(model_type=model_type)
+    return model
+
+
+@pytest.fixture
+def model_path(tmp_path):
+    return str(tmp_path / "model.joblib")
+
+
+def test_get_without_a_model_raises(model_path):
+    with pytest.raises(FileNotFoundError):
+        ModelRegistry(model_path).get()
+
+
+def test_publish_serves_the_new_version(model_path, sample_data):
+    registry = ModelRegistry(model_path, check_interval=0)
+    trained_model(sample_data, "LogisticRegression").save_model(model_path)
+    first = registry.get()
+
+    second_model = trained_model(sample_data, "SGD")
+    second_model.save_model(model_path)
+    published = registry.publish(second_model)
+    assert published.version != first.version
+    current = registry.get()
+    assert current.version == published.version
+    assert current.model is second_model  # Not unpickled again
+
+
+def test_reload_only_swaps_when_the_content_changed(model_path, sample_data):
+    registry = ModelRegistry(model_path, check_interval=0)
+    trained_model(sample_data, "LogisticRegression").save_model(model_path)
+    first = registry.get()
+
+    stat = os.stat(model_path)
+    os.utime(model_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))  # Touched, same content
+    touched = registry.get()
+    assert touched.version == first.version
+    assert touched.model is first.model
+    assert touched.mtime_ns != first.mtime_ns  # Not hashed again until the next change
+
+    trained_model(sample_data, "SGD").save_model(model_path)
+    changed = registry.get()
+    assert changed.version != first.version
+    assert changed.model is not first.model
+    assert type(changed.model.model).__name__ == "SGDClassifier"
+
+
+def test_concurrent_gets_never_see_a_half_loaded_model(model_path, sample_data, monkeypatch):
+    registry = ModelRegistry(model_path, check_interval=0)
+    trained_model(sample_data, "LogisticRegression").save_model(model_path)
+    first = registry.get()
+
+    load_model = StrokePredictionModel.load_model
+    loading = threading.Event()
+
+    def slow_load_model(self, *args, **kwargs):
+        loading.set()
+        time.sleep(0.3)  # Readers keep calling get() while the new artifact is being loaded
+        return load_model(self, *args, **kwargs)
+
+    monkeypatch.setattr(model_registry.StrokePredictionModel, "load_model", slow_load_model)
+    trained_model(sample_data, "SGD").save_model(model_path)
+
+    seen, errors = [], []
+    stop = threading.Event()
+
+    def read():
+        while not stop.is_set():
+            try:
+                loaded = registry.get()
+                assert loaded.model.model is not None and loaded.model.preprocessor is not None
+                seen.append(loaded)
+            except Exception as e:  # Any failure here is a reader seeing an inconsistent model
+                errors.append(e)
+
+    readers = [threading.Thread(target=read) for _ in range(4)]
+    for reader in readers:
+        reader.start()
+    assert loading.wait(10)
+    deadline = time.monotonic() + 10
+    while registry.get().version == first.version and time.monotonic() < deadline:
+        time.sleep(0.01)
+    stop.set()
+    for reader in readers:
+        reader.join()
+
+    assert errors == []
+    versions = {loaded.version for loaded in seen}
+    assert first.version in versions  # Served while the new artifact was loading
+    for loaded in seen:
+        expected = "LogisticRegression" if loaded.version == first.version else "SGDClassifier"
+        assert type(loaded.model.model).__name__ == expected
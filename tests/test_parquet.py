@@ -0,0 +1,21 @@
+import logging
+import main
+from main import create_app
+
+
+def test_startup_warns_when_parquet_copies_need_pyarrow(tmp_path, monkeypatch, caplog):
+    monkeypatch.setattr(main, "PYARROW_AVAILABLE", False)
+    with caplog.at_level(logging.WARNING, logger="main"):
+        create_app({
+            "UPLOAD_FOLDER": str(tmp_path / "uploads"),
+            "STATIC_FOLDER": str(tmp_path / "static"),
+            "CACHE_FOLDER": str(tmp_path / "cache"),
+            "JOBS_FOLDER": str(tmp_path / "jobs"),
+            "MODEL_PATH": str(tmp_path / "models" / "model.joblib"),
+            "PROFILE_FOLDER": str(tmp_path / "profiles"),
+            "METRICS_FOLDER": None,
+            "MODEL_PRELOAD": False,
+            "GRAPH_POOL_WARMUP": False,
+            "UPLOAD_PARQUET": True,
+        })
+    assert sum("pyarrow is not installed" in record.getMessage() for record in caplog.records) == 1
@@ -0,0 +1,36 @@
+import time
+from src.prediction_cache import PredictionCache
+
+
+def test_results_expire_after_the_ttl():
+    cache = PredictionCache(max_entries=10, ttl=0.05)
+    cache.put_many("v1", [((1.0,), {"prediction": 1})])
+    assert cache.get_many("v1", [(1.0,)]) == [{"prediction": 1}]
+    time.sleep(0.06)
+    assert cache.get_many("v1", [(1.0,)]) == [None]
+
+
+def test_zero_ttl_disables_the_cache():
+    cache = PredictionCache(max_entries=10, ttl=0)
+    assert not cache.enabled
+    cache.put_many("v1", [((1.0,), {"prediction": 1})])
+    assert cache.get_many("v1", [(1.0,)]) == [None]
+    assert cache.stats()["size"] == 0
+
+
+def test_none_ttl_keeps_results_until_evicted():
+    cache = PredictionCache(max_entries=2, ttl=None)
+    cache.put_many("v1", [((1.0,), "a"), ((2.0,), "b")])
+    assert cache.get_many("v1", [(1.0,)]) == ["a"]  # Now the most recently used
+    cache.put_many("v1", [((3.0,), "c")])
+    assert cache.get_many("v1", [(1.0,), (2.0,), (3.0,)]) == ["a", None, "c"]
+
+
+def test_new_model_version_drops_cached_results():
+    cache = PredictionCache(max_entries=10, ttl=60)
+    cache.put_many("v1", [((1.0,), "a")])
+    assert cache.get_many("v2", [(1.0,)]) == [None]
+    assert cache.stats() == {
+        "enabled": True, "model_version": "v2", "hits": 0, "misses": 1, "hit_ratio": 0.0, "size": 0,
+        "max_entries": 10, "ttl": 60,
+    }
@@ -0,0 +1,83 @@
+import io
+import time
+import pytest
+from src.profiling import PROFILER_BUSY, start_profiler, stop_profiler
+
+
+@pytest.fixture
+def profiled_client(app):
+    app.config["PROFILE_ENABLED"] = True
+    return app.test_client()
+
+
+def wait_for_job(client, job_id, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        state = client.get(f"/train/{job_id}").get_json()
+        if state["status"] in ("succeeded", "failed", "cancelled"):
+            return state
+        time.sleep(0.1)
+    raise TimeoutError(f"Training job {job_id} did not finish.")
+
+
+def upload(client, data):
+    body = io.BytesIO(data.to_csv(index=False).encode())
+    response = client.post("/upload", data={"file": (body, "patients.csv")}, content_type="multipart/form-data",
+                           headers={"Accept": "application/json"})
+    assert response.status_code == 200
+    return response.get_json()["dataset_id"]
+
+
+def test_profiled_train_profiles_the_job(profiled_client, sample_data):
+    dataset_id = upload(profiled_client, sample_data)
+    response = profiled_client.post("/train", data={"dataset_id": dataset_id, "model_type": "LogisticRegression"},
+                                    headers={"Accept": "application/json", "X-Profile": "1"})
+    assert response.status_code == 202
+    assert "X-Profile-Id" not in response.headers
+    state = wait_for_job(profiled_client, response.get_json()["job_id"])
+    assert state["status"] == "succeeded"
+    assert "profile_id" in state["result"]
+    assert "profile_status" not in state["result"]
+
+
+def test_profiled_request_reports_an_active_profile(profiled_client):
+    profiler = start_profiler()
+    assert profiler is not None
+    try:
+        assert start_profiler() is None
+        response = profiled_client.get("/predict/cache", headers={"X-Profile": "1"})
+    finally:
+        stop_profiler(profiler)
+    assert response.headers["X-Profile-Status"] == PROFILER_BUSY
+    assert "X-Profile-Id" not in response.headers
+
+    response = profiled_client.get("/predict/cache", headers={"X-Profile": "1"})
+    assert "X-Profile-Id" in response.headers
+
+
+def test_profiled_train_reports_an_active_profile(profiled_client, sample_data):
+    dataset_id = upload(profiled_client, sample_data)
+    profiler = start_profiler()
+    try:
+        response = profiled_client.post("/train", data={"dataset_id": dataset_id, "model_type": "LogisticRegression"},
+                                        headers={"Accept": "application/json", "X-Profile": "1"})
+        state = wait_for_job(profiled_client, response.get_json()["job_id"])
+    finally:
+        stop_profiler(profiler)
+    assert state["status"] == "succeeded"
+    assert state["result"]["profile_status"] == PROFILER_BUSY
+
+
+def test_profiler_is_released_when_after_request_hooks_are_skipped(app):
+    app.config["PROFILE_ENABLED"] = True
+    app.config["PROPAGATE_EXCEPTIONS"] = True  # The error escapes before the after-request hooks run
+
+    @app.route("/boom")
+    def boom():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        app.test_client().get("/boom", headers={"X-Profile": "1"})
+    profiler = start_profiler()
+    assert profiler is not None
+    stop_profiler(profiler)
@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.batch_prediction import MAX_RECORD_PATH_ROWS, score_records
+from src.config import SELECTED_COLUMNS
+from src.data_processing import PreprocessingPipeline
+from src.model_training import StrokePredictionModel
+
+
+@pytest.fixture(scope="module", params=[True, False], ids=["scaled", "native"])
+def pipeline(request, sample_data):
+    return PreprocessingPipeline(target_column="Diagnosis", scale_categorical=request.param).fit(
+        sample_data[SELECTED_COLUMNS + ["Diagnosis"]]
+    )
+
+
+def records_of(data):
+    return data[SELECTED_COLUMNS].astype(object).where(data[SELECTED_COLUMNS].notna(), None).to_dict("records")
+
+
+def test_one_row_is_transformed_without_refitting(pipeline, sample_data, monkeypatch):
+    mean, scale = pipeline.mean_.copy(), pipeline.scale_.copy()
+    monkeypatch.setattr(pipeline, "partial_fit", lambda *args: pytest.fail("refitted"))
+    monkeypatch.setattr(pipeline, "_encode", lambda *args: pytest.fail("vectorized path used"))
+    record = records_of(sample_data.iloc[[0]])[0]
+    features = pipeline.transform_records([record])
+    assert features.shape == (1, len(pipeline.feature_columns))
+    assert features.dtypes.eq(np.float32).all()
+    np.testing.assert_array_equal(pipeline.mean_, mean)
+    np.testing.assert_array_equal(pipeline.scale_, scale)
+
+
+def test_record_path_matches_the_batch_transform(pipeline, sample_data):
+    rows = sample_data[SELECTED_COLUMNS].iloc[:40]
+    records = records_of(rows)
+    batch = pipeline.transform(pd.DataFrame.from_records(records, columns=SELECTED_COLUMNS))
+    np.testing.assert_array_equal(pipeline.transform_records(records).to_numpy(), batch.to_numpy())
+
+
+def test_record_path_matches_the_batch_transform_on_odd_values(pipeline, sample_data):
+    numeric = next(col for col in SELECTED_COLUMNS if col not in pipeline.vocabularies)
+    categorical = next(col for col in SELECTED_COLUMNS if col in pipeline.vocabularies)
+    records = records_of(sample_data.iloc[:5])
+    records[0][categorical] = "unseen value"
+    records[1][categorical] = None
+    records[2][numeric] = None
+    records[3][numeric] = float("nan")
+    records[4][numeric] = "not a number"
+    batch = pipeline.transform(pd.DataFrame.from_records(records, columns=SELECTED_COLUMNS))
+    np.testing.assert_array_equal(pipeline.transform_records(records).to_numpy(), batch.to_numpy())
+
+
+def test_refit_rebuilds_the_record_encoders(sample_data):
+    data = sample_data[SELECTED_COLUMNS + ["Diagnosis"]]
+    pipeline = PreprocessingPipeline(target_column="Diagnosis").fit(data.iloc[:100])
+    records = records_of(sample_data.iloc[:10])
+    pipeline.transform_records(records)
+    pipeline.fit(data)
+    np.testing.assert_array_equal(
+        pipeline.transform_records(records).to_numpy(),
+        pipeline.transform(pd.DataFrame.from_records(records, columns=SELECTED_COLUMNS)).to_numpy(),
+    )
+
+
+def test_score_records_is_the_same_on_both_paths(sample_data):
+    data = sample_data[SELECTED_COLUMNS + ["Diagnosis"]]
+    preprocessor = PreprocessingPipeline(target_column="Diagnosis")
+    model = StrokePredictionModel(preprocessor.fit_transform(data), preprocessor=preprocessor)
+    model.train_model(model_type="RandomForest")
+    records = records_of(sample_data.iloc[:MAX_RECORD_PATH_ROWS + 1])
+    vectorized = score_records(model, records)  # More records than the record path takes
+    assert [score_records(model, [record])[0] for record in records] == vectorized
@@ -0,0 +1,108 @@
+import threading
+import time
+import pytest
+from src.training_jobs import TrainingJobManager
+from tests.test_profiling import upload, wait_for_job
+
+
+def wait_for_status(manager, job_id, statuses, timeout=10):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        state = manager.status(job_id)
+        if state["status"] in statuses:
+            return state
+        time.sleep(0.01)
+    raise TimeoutError(f"Job {job_id} never reached {statuses}.")
+
+
+@pytest.fixture
+def manager(tmp_path):
+    return TrainingJobManager(max_workers=1, state_folder=str(tmp_path / "jobs"))
+
+
+def test_job_goes_from_queued_to_running_to_succeeded(manager):
+    started, release = threading.Event(), threading.Event()
+
+    def target(job, value):
+        started.set()
+        release.wait(10)
+        job.update_progress(phase="fitting")
+        return {"value": value}
+
+    blocker = manager.submit(target, value=0)  # Keeps the single worker busy
+    job = manager.submit(target, value=1)
+    assert manager.status(job.job_id)["status"] == "queued"
+    started.wait(10)
+    assert manager.status(blocker.job_id)["status"] == "running"
+    release.set()
+    state = wait_for_status(manager, job.job_id, ("succeeded",))
+    assert state["result"] == {"value": 1}
+    assert state["progress"]["phase"] == "succeeded"
+    assert state["error"] is None
+
+
+def test_failed_job_records_the_error(manager):
+    def target(job):
+        raise RuntimeError("boom")
+
+    job = manager.submit(target)
+    state = wait_for_status(manager, job.job_id, ("succeeded", "failed"))
+    assert state["status"] == "failed"
+    assert state["error"] == "boom"
+    assert state["result"] is None
+
+
+def test_cancel_marker_from_another_process_stops_a_running_job(manager, tmp_path):
+    started = threading.Event()
+
+    def target(job):
+        started.set()
+        while True:
+            job.update_progress(phase="fitting")
+            time.sleep(0.01)
+
+    job = manager.submit(target)
+    started.wait(10)
+    # A second manager on the same folder only knows the job through its state file
+    other = TrainingJobManager(state_folder=manager.state_folder)
+    state = other.cancel(job.job_id)
+    assert state["cancel_requested"] is True
+    assert wait_for_status(other, job.job_id, ("cancelled", "failed", "succeeded"))["status"] == "cancelled"
+
+
+def test_cancelled_queued_job_never_runs(manager):
+    release = threading.Event()
+    ran = []
+    manager.submit(lambda job: release.wait(10))
+    job = manager.submit(lambda job: ran.append(job.job_id))
+    assert manager.cancel(job.job_id)["status"] == "cancelled"
+    release.set()
+    time.sleep(0.1)
+    assert ran == []
+    assert manager.status(job.job_id)["status"] == "cancelled"
+
+
+def test_unknown_job_id(manager, client):
+    assert manager.status("0" * 32) is None
+    assert manager.cancel("../../etc/passwd") is None
+    assert client.get(f"/train/{'0' * 32}").status_code == 404
+    assert client.post(f"/train/{'0' * 32}/cancel").status_code == 404
+
+
+def test_train_accepts_json_params(client, sample_data):
+    dataset_id = upload(client, sample_data)
+    response = client.post("/train", data={"dataset_id": dataset_id, "model_type": "LogisticRegression",
+                                           "params": '{"C": [0.1, 1.0]}', "search_options": '{"cv": 2}'},
+                           headers={"Accept": "application/json"})
+    assert response.status_code == 202
+    state = wait_for_job(client, response.get_json()["job_id"])
+    assert state["status"] == "succeeded", state["error"]
+
+
+@pytest.mark.parametrize("params", ["__import__('os').getcwd()", "[1, 2]", "{'C': [0.1"])
+def test_train_rejects_params_that_are_not_a_dict_literal(client, sample_data, params):
+    dataset_id = upload(client, sample_data)
+    response = client.post("/train", data={"dataset_id": dataset_id, "params": params},
+                           headers={"Accept": "application/json"})
+    assert response.status_code == 400
+    assert "Invalid 'params'" in response.get_data(as_text=True)
@@ -0,0 +1,73 @@
+import os
+import threading
+import time
+import pytest
+from src.upload_stream import StreamingUpload, UploadRejected
+
+
+def csv_bytes(data):
+    return data.to_csv(index=False).encode()
+
+
+def parser_threads():
+    return [thread for thread in threading.enumerate() if thread.name == "upload-parser"]
+
+
+def wait_for_no_parser(timeout=10):
+    deadline = time.monotonic() + timeout
+    while parser_threads() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return not parser_threads()
+
+
+def test_upload_is_parsed_while_received(sample_data, tmp_path):
+    body = csv_bytes(sample_data)
+    upload = StreamingUpload(str(tmp_path), chunk_size=100)
+    for start in range(0, len(body), 4096):
+        upload.write(body[start:start + 4096])
+    result = upload.finish()
+    assert len(result.data) == len(sample_data)
+    assert set(result.pipelines) == {"pipeline", "pipeline_native"}
+    with open(result.path, "rb") as f:
+        assert f.read() == body
+
+
+def test_bad_header_is_rejected_before_the_body(sample_data, tmp_path):
+    body = csv_bytes(sample_data.drop(columns=["Age"]))
+    upload = StreamingUpload(str(tmp_path))
+    header_end = body.index(b"\n") + 1
+    with pytest.raises(UploadRejected, match="Missing required columns"):
+        upload.write(body[:header_end + 100])  # Only the first block of a much larger file
+    assert not os.path.exists(upload.path)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_malformed_row_rejects_the_upload_mid_stream(sample_data, tmp_path):
+    good = csv_bytes(sample_data)
+    header, rows = good.split(b"\n", 1)
+    bad_row = b"not-a-number," * (header.count(b",")) + b"x\n"
+    upload = StreamingUpload(str(tmp_path), chunk_size=50, max_pending_blocks=2)
+    upload.write(header + b"\n" + rows + bad_row)
+
+    # Later blocks are refused as soon as the parser reached the bad row, before the file ends
+    deadline = time.monotonic() + 10
+    with pytest.raises(UploadRejected, match="Invalid dataset"):
+        while time.monotonic() < deadline:
+            upload.write(rows)
+            time.sleep(0.01)
+    assert list(tmp_path.iterdir()) == []
+    assert wait_for_no_parser()
+
+
+def test_client_disconnect_stops_the_parser_and_removes_the_file(client, app, sample_data):
+    boundary = "boundary"
+    head = (f"--{boundary}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"patients.csv\"\r\n"
+            "Content-Type: text/csv\r\n\r\n").encode()
+    body = head + csv_bytes(sample_data)  # Cut off before the end of the file and the closing boundary
+    response = client.post(
+        "/upload", data=body, content_type=f"multipart/form-data; boundary={boundary}",
+        environ_overrides={"CONTENT_LENGTH": str(len(body) + 100000)},
+    )
+    assert response.status_code == 400
+    assert wait_for_no_parser()
+    assert [name for name in os.listdir(app.config["UPLOAD_FOLDER"]) if name.endswith(".tmp")] == []
@@ -0,0 +1,11 @@
+"""
+WSGI entry point for production servers.
+
+Run with gunicorn, which reads gunicorn.conf.py from the working directory:
+
+    gunicorn wsgi:app
+"""
+from main import create_app
+
+# The app is created in the gunicorn master; each worker starts its own graph processes (see post_fork)
+app = create_app({"GRAPH_POOL_WARMUP": False})